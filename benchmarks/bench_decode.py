@@ -0,0 +1,56 @@
+"""Measure JSON decode time for recorded Yahoo payloads with each installed decoder.
+
+Usage:
+    python benchmarks/bench_decode.py [--fixtures DIR] [--iterations N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from api.decoding import available_decoders  # noqa: E402
+
+DEFAULT_FIXTURES = ROOT / 'tests' / 'fixtures'
+
+
+def bench_decode(fixtures_dir: Path, iterations: int) -> dict:
+    """Return ``{fixture: {decoder: mean seconds per decode}}`` for every ``*.json`` fixture."""
+    results = {}
+    decoders = available_decoders()
+    for path in sorted(fixtures_dir.glob('*.json')):
+        body = path.read_bytes()
+        timings = {}
+        for name, decode in decoders.items():
+            decode(body)  # warm up
+            start = time.perf_counter()
+            for _ in range(iterations):
+                decode(body)
+            timings[name] = (time.perf_counter() - start) / iterations
+        results[path.name] = {'bytes': len(body), 'decoders': timings}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args(argv)
+    
+    results = bench_decode(args.fixtures, args.iterations)
+    if not results:
+        print(f"No *.json fixtures found in {args.fixtures}")
+        return
+    
+    for fixture, data in results.items():
+        timings = data['decoders']
+        baseline = timings['json']
+        print(f"{fixture} ({data['bytes']:,} bytes)")
+        for name, seconds in sorted(timings.items(), key=lambda item: item[1]):
+            print(f"   {name:<8} {seconds * 1e6:>10.1f} µs   {baseline / seconds:>5.2f}x vs json")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Synthetic Yahoo-shaped payloads for benchmarks, sized like a large league."""
+import random
+from typing import Iterable
+
+
+def team_key(league_key: str, index: int) -> str:
+    return f"{league_key}.t.{index + 1}"
+
+
+def teams_payload(league_key: str, num_teams: int = 20) -> dict:
+    teams = {str(i): {'team': [[
+        {'team_key': team_key(league_key, i)},
+        {'team_id': str(i + 1)},
+        {'name': f"Team {i + 1:02d}"},
+        {'url': f"https://football.fantasysports.yahoo.com/f1/1/{i + 1}"},
+        {'team_logos': [{'team_logo': {'size': 'large', 'url': f"https://s.yimg.com/logo{i}.png"}}]},
+        {'waiver_priority': i + 1},
+        {'number_of_moves': str(i * 3)},
+        {'number_of_trades': str(i % 4)},
+        {'managers': [{'manager': {'manager_id': str(i + 1), 'nickname': f"Owner {i + 1:02d}",
+                                   'guid': f"GUID{i + 1:04d}"}}]},
+    ]]} for i in range(num_teams)}
+    teams['count'] = num_teams
+    return {'fantasy_content': {'league': [{'league_key': league_key}, {'teams': teams}]}}
+
+
+def scoreboard_payload(league_key: str, weeks: Iterable[int], num_teams: int = 20, seed: int = 0) -> dict:
+    """Multi-week scoreboard with every team paired off each week."""
+    weeks = list(weeks)
+    rng = random.Random(f"{league_key}:{seed}")
+    matchups = {}
+    for week in weeks:
+        for pair in range(0, num_teams, 2):
+            teams = {}
+            for slot in range(2):
+                index = pair + slot
+                teams[str(slot)] = {'team': [
+                    [{'team_key': team_key(league_key, index)}, {'team_id': str(index + 1)},
+                     {'name': f"Team {index + 1:02d}"}],
+                    {'team_points': {'coverage_type': 'week', 'week': str(week),
+                                     'total': f"{rng.uniform(60, 180):.2f}"},
+                     'team_projected_points': {'coverage_type': 'week', 'week': str(week),
+                                               'total': f"{rng.uniform(90, 130):.2f}"}},
+                ]}
+            teams['count'] = 2
+            matchups[str(len(matchups))] = {'matchup': {
+                'week': str(week), 'status': 'postevent', 'is_playoffs': '0', '0': {'teams': teams}
+            }}
+    matchups['count'] = len(matchups)
+    return {'fantasy_content': {'league': [
+        {'league_key': league_key, 'current_week': '17', 'is_finished': '1'},
+        {'scoreboard': {'0': {'matchups': matchups}, 'week': str(weeks[0]) if weeks else '1'}},
+    ]}}
+
+
+def roster_payload(team_key_: str, num_players: int = 16) -> dict:
+    positions = ['QB', 'WR', 'WR', 'RB', 'RB', 'TE', 'W/R/T', 'K', 'DEF'] + ['BN'] * 7
+    players = {str(i): {'player': [
+        [{'player_key': f"449.p.{1000 + i}"}, {'player_id': str(1000 + i)},
+         {'name': {'full': f"Player {i}", 'first': 'Player', 'last': str(i)}},
+         {'status': 'Q' if i % 7 == 0 else ''}, {'editorial_team_abbr': 'BUF'},
+         {'display_position': positions[i % len(positions)].replace('BN', 'WR')}],
+        {'selected_position': [{'coverage_type': 'week', 'week': '1'},
+                               {'position': positions[i % len(positions)]}]},
+    ]} for i in range(num_players)}
+    players['count'] = num_players
+    return {'fantasy_content': {'team': [
+        [{'team_key': team_key_}, {'name': 'Team'}],
+        {'roster': {'coverage_type': 'week', 'week': '1', '0': {'players': players}}},
+    ]}}
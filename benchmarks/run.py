@@ -0,0 +1,291 @@
+"""End-to-end and hot-path benchmarks for the treasurer, reported as JSON.
+
+Covers:
+    parse.*        parsing throughput of get_weekly_scores / get_all_teams_info /
+                   get_team_roster on large payloads (no network)
+    prize_table    print_prize_table on a 20-team x 17-week ScoreMatrix
+    multi_year     multi_year_treasurer over 5 seasons against a replay server
+                   with injected latency (see src/api/replay.py)
+    startup.*      interpreter start plus importing the app / running cli.py --help
+
+Usage:
+    python benchmarks/run.py [--quick] [--only NAME ...] [--output results.json]
+    python benchmarks/run.py --compare baseline.json [--threshold 1.25]
+
+``--compare`` exits with status 1 if any benchmark's median is slower than the
+baseline's by more than ``--threshold``.
+"""
+import argparse
+import asyncio
+import builtins
+import contextlib
+import inspect
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / 'src'
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+import payloads  # noqa: E402
+from agent.agent import FantasyFootballTreasurer  # noqa: E402
+from api.decoding import available_decoders  # noqa: E402
+from api.replay import ReplayServer  # noqa: E402
+from api.yahoo_client import YahooFantasyClient  # noqa: E402
+from main import multi_year_treasurer, print_prize_table  # noqa: E402
+from models.score_matrix import ScoreMatrix  # noqa: E402
+
+FIXTURES = ROOT / 'tests' / 'fixtures'
+SEASONS = range(2020, 2025)
+NUM_TEAMS = 20
+NUM_WEEKS = 17
+
+
+def summarize(samples: List[float], **extra) -> dict:
+    """Timing statistics in seconds for one benchmark."""
+    return {
+        'unit': 's',
+        'runs': len(samples),
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        **extra
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int, number: int = 1) -> List[float]:
+    """Seconds per call of ``fn``, one sample per ``number`` calls."""
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+class StaticClient:
+    """Client stand-in that returns prebuilt payloads, so only parsing is timed."""
+
+    def __init__(self, teams: dict, roster: dict, scoreboard: dict):
+        self._teams, self._roster, self._scoreboard = teams, roster, scoreboard
+
+    async def get_all_teams(self, league_key):
+        return self._teams
+
+    async def get_team_roster(self, team_key):
+        return self._roster
+
+    async def get_matchups(self, league_key, week):
+        return self._scoreboard
+
+
+def bench_parsers(repeat: int, number: int) -> Dict[str, dict]:
+    league_key = '449.l.1'
+    recorded = FIXTURES / 'scoreboard_week1.json'
+    scoreboard = (json.loads(recorded.read_bytes()) if recorded.exists()
+                  else payloads.scoreboard_payload(league_key, [1], NUM_TEAMS))
+    client = StaticClient(
+        payloads.teams_payload(league_key, NUM_TEAMS),
+        payloads.roster_payload(f"{league_key}.t.1", 25),
+        scoreboard
+    )
+    agent = FantasyFootballTreasurer(client)
+    loop = asyncio.new_event_loop()
+    # Call the undecorated methods so memoization doesn't turn this into a cache benchmark
+    get_weekly_scores = inspect.unwrap(FantasyFootballTreasurer.get_weekly_scores)
+    get_all_teams_info = inspect.unwrap(FantasyFootballTreasurer.get_all_teams_info)
+    get_team_roster = inspect.unwrap(FantasyFootballTreasurer.get_team_roster)
+    cases = {
+        'parse.get_weekly_scores': lambda: get_weekly_scores(agent, league_key, 1),
+        'parse.get_all_teams_info': lambda: get_all_teams_info(agent, league_key),
+        'parse.get_team_roster': lambda: get_team_roster(agent, f"{league_key}.t.1"),
+    }
+    season = payloads.scoreboard_payload(league_key, range(1, NUM_WEEKS + 1), NUM_TEAMS)
+    results = {}
+    try:
+        for name, make_call in cases.items():
+            items = len(loop.run_until_complete(make_call()))
+            samples = measure(lambda: loop.run_until_complete(make_call()), repeat, number)
+            results[name] = summarize(samples, items=items, items_per_second=items / statistics.median(samples))
+        samples = measure(lambda: agent._split_scoreboard(season, None), repeat, max(1, number // 10))
+        results['parse.season_scoreboard'] = summarize(
+            samples, items=NUM_TEAMS * NUM_WEEKS,
+            items_per_second=NUM_TEAMS * NUM_WEEKS / statistics.median(samples)
+        )
+    finally:
+        loop.close()
+    return results
+
+
+def bench_prize_table(repeat: int, number: int) -> Dict[str, dict]:
+    rng = np.random.default_rng(0)
+    teams = [f"449.l.1.t.{i + 1}" for i in range(NUM_TEAMS)]
+    matrix = ScoreMatrix(teams, range(1, NUM_WEEKS + 1), rng.uniform(60, 180, (NUM_TEAMS, NUM_WEEKS)),
+                         [f"Team {i + 1:02d}" for i in range(NUM_TEAMS)])
+    prizes = {'pos1_prize': 20.0, 'pos2_prize': 10.0, 'pos3_prize': 5.0, 'num_weeks': NUM_WEEKS}
+
+    def render():
+        with contextlib.redirect_stdout(io.StringIO()):
+            print_prize_table(matrix, prizes)
+
+    return {'prize_table': summarize(measure(render, repeat, number), teams=NUM_TEAMS, weeks=NUM_WEEKS)}
+
+
+async def _synthetic_yahoo() -> web.AppRunner:
+    """A stand-in Yahoo API that builds league payloads on demand (used once, for recording)."""
+    async def handle(request: web.Request) -> web.Response:
+        path = request.path
+        league_key = path.split('/')[2]
+        if path.endswith('/teams'):
+            return web.json_response(payloads.teams_payload(league_key, NUM_TEAMS))
+        if ';week=' in path:
+            weeks = [int(week) for week in path.split(';week=')[1].split(',')]
+            return web.json_response(payloads.scoreboard_payload(league_key, weeks, NUM_TEAMS))
+        return web.json_response({'error': {'description': 'not found'}}, status=404)
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    return runner
+
+
+async def _run_multi_year(base_url: str, leagues: List[dict], record_dir: Optional[str] = None) -> float:
+    answers = iter([str(SEASONS[0]), str(SEASONS[-1]), 'Bench', '20', '10', '5', str(NUM_WEEKS)])
+    real_input = builtins.input
+    builtins.input = lambda prompt='': next(answers)
+    try:
+        async with YahooFantasyClient('token', base_url=base_url, requests_per_second=None,
+                                      record_dir=record_dir) as client:
+            agent = FantasyFootballTreasurer(client)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                await multi_year_treasurer(agent, leagues)
+            return time.perf_counter() - start
+    finally:
+        builtins.input = real_input
+
+
+def bench_multi_year(repeat: int, latency: float) -> Dict[str, dict]:
+    leagues = [{'league_key': f"{400 + i}.l.1", 'league_id': '1', 'name': 'Bench League', 'season': season}
+               for i, season in enumerate(SEASONS)]
+
+    async def run() -> dict:
+        with tempfile.TemporaryDirectory() as fixtures:
+            synthetic = await _synthetic_yahoo()
+            try:
+                await _run_multi_year(f"http://127.0.0.1:{synthetic.addresses[0][1]}", leagues, fixtures)
+            finally:
+                await synthetic.cleanup()
+
+            samples = []
+            async with ReplayServer(fixtures, latency=latency, jitter=latency / 2, seed=1) as server:
+                for _ in range(repeat):
+                    samples.append(await _run_multi_year(server.url, leagues))
+            return summarize(samples, seasons=len(leagues), latency=latency,
+                             requests_per_run=server.requests / repeat, max_in_flight=server.max_in_flight)
+
+    return {'multi_year': asyncio.run(run())}
+
+
+def bench_startup(repeat: int) -> Dict[str, dict]:
+    commands = {
+        'startup.python': [sys.executable, '-c', 'pass'],
+        'startup.import_main': [sys.executable, '-c', 'import main'],
+        'startup.cli_help': [sys.executable, str(SRC / 'cli.py'), '--help'],
+    }
+    results = {}
+    for name, command in commands.items():
+        def launch():
+            subprocess.run(command, cwd=SRC, check=True, stdout=subprocess.DEVNULL)
+        results[name] = summarize(measure(launch, repeat))
+    return results
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'json_decoder': next(iter(available_decoders())),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Names of benchmarks whose median regressed by more than ``threshold``x."""
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        ratio = current['median'] / previous['median']
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f"{name:<28} {previous['median'] * 1e3:>10.3f} ms -> {current['median'] * 1e3:>10.3f} ms"
+              f"  ({ratio:.2f}x){flag}", file=sys.stderr)
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+BENCHMARKS = ['parse', 'prize_table', 'multi_year', 'startup']
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help="fewer repetitions (smoke test)")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument('--latency', type=float, default=0.1, help="replay latency per request for multi_year")
+    parser.add_argument('--output', type=Path, default=None, help="write JSON here instead of stdout")
+    parser.add_argument('--compare', type=Path, default=None, help="baseline JSON from an earlier run")
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    repeat, number = (3, 20) if args.quick else (15, 200)
+    benchmarks = {}
+    if 'parse' in args.only:
+        benchmarks.update(bench_parsers(repeat, number))
+    if 'prize_table' in args.only:
+        benchmarks.update(bench_prize_table(repeat, number))
+    if 'multi_year' in args.only:
+        benchmarks.update(bench_multi_year(2 if args.quick else 5, args.latency))
+    if 'startup' in args.only:
+        benchmarks.update(bench_startup(3 if args.quick else 10))
+
+    results = {'environment': environment(), 'benchmarks': benchmarks}
+    report = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(report + '\n')
+    else:
+        print(report)
+
+    if args.compare:
+        return 1 if compare(results, json.loads(args.compare.read_text()), args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,82 @@
-from typing import Optional, List, Dict
+import asyncio
+from typing import Optional, List, Dict, Iterable, Awaitable, Sequence, TypeVar, AsyncIterator, Tuple, Union
+from api.errors import YahooAPIError
+from api.metrics import Metrics, instrumented
+from api.normalize import child, content, first_manager, flatten, iter_collection
 from api.yahoo_client import YahooFantasyClient
-from models.stats import WeeklyScore, TopScorer
+from agent.memo import LRUCache, memoized, memo_key
+from agent.owners import OwnerIndex
+from agent.streams import merge_streams
+from agent.sync import SyncStore
+from models.events import SeasonTopScorers, WeekScored, WeekTopScorers
+from models.score_matrix import ScoreMatrix
+from models.stats import WeeklyScore, TopScorer, TeamStanding, LeagueEarnings
+from models.team import TeamInfo
+from models.player import RosterPlayer
 import json
 
+T = TypeVar('T')
 
+
+@instrumented(skip=('_limited',))
 class FantasyFootballTreasurer:
-    """Fantasy Football Treasurer - Agent to interact with Yahoo Fantasy Football."""
+    """Fantasy Football Treasurer - Agent to interact with Yahoo Fantasy Football.
+
+    Every method's latency is recorded in ``metrics`` (pass the client's
+    ``metrics`` to get one report covering requests and parsing).
+    """
     
-    def __init__(self, client: YahooFantasyClient):
+    # Parsed results are reused for this long before being fetched again
+    RESULT_MAX_AGE = 300
+    # Seasons offered when listing the user's leagues
+    SEASONS = range(2021, 2027)
+    # Weeks requested per multi-week scoreboard call (a 17-week season is two calls)
+    SCOREBOARD_BATCH_SIZE = 9
+    
+    def __init__(
+        self,
+        client: YahooFantasyClient,
+        max_concurrency: int = 8,
+        cache_size: int = 256,
+        sync_store: Optional[SyncStore] = None,
+        metrics: Optional[Metrics] = None,
+        owner_index: Optional[OwnerIndex] = None
+    ):
         self.client = client
+        self._semaphore = asyncio.BoundedSemaphore(max_concurrency)
+        self._results = LRUCache(cache_size, max_age=self.RESULT_MAX_AGE)
+        # When set, league earnings read weekly scores through sync_weekly_scores
+        self._sync_store = sync_store
+        # When set, owners are resolved by manager GUID and indexed leagues' teams are not refetched
+        self.owner_index = owner_index
+        self.metrics = metrics if metrics is not None else Metrics()
+        # league_key -> current week, finished flag and closed weeks from its latest scoreboard
+        self._scoreboard_status: Dict[str, Dict] = {}
     
-    async def get_league_standings(self, league_key: str) -> List[Dict]:
+    def invalidate_cache(self, key: Optional[str] = None, method: Optional[str] = None) -> int:
+        """Forget memoized results.
+
+        With no arguments everything is dropped. ``key`` limits this to results
+        whose arguments start with that league/team key (so a league key also
+        covers its teams); ``method`` limits it to one method name.
+        """
+        def matches(entry) -> bool:
+            name, args, _ = entry
+            if method is not None and name != method:
+                return False
+            if key is None:
+                return True
+            return any(isinstance(arg, str) and arg.startswith(key) for arg in args)
+        
+        return self._results.invalidate(matches)
+    
+    async def _limited(self, aw: Awaitable[T]) -> T:
+        """Await a request while holding one of the agent's concurrency slots."""
+        async with self._semaphore:
+            return await aw
+    
+    @memoized
+    async def get_league_standings(self, league_key: str) -> List[TeamStanding]:
         """Get league standings with team records and points."""
         standings_data = await self.client.get_league_standings(league_key)
         standings = []
@@ -19,93 +85,37 @@ class FantasyFootballTreasurer:
             return standings
         
         try:
-            fantasy_content = standings_data.get('fantasy_content', {})
-            league_data = fantasy_content.get('league', [])
+            teams_obj = child(child(content(standings_data, 'league'), 'standings'), 'teams')
             
-            if isinstance(league_data, list):
-                for item in league_data:
-                    if isinstance(item, dict) and 'standings' in item:
-                        standings_obj = item['standings']
-                        
-                        # Handle standings as list or dict
-                        teams_obj = None
-                        if isinstance(standings_obj, dict):
-                            teams_obj = standings_obj.get('0', {}).get('teams', {})
-                        elif isinstance(standings_obj, list):
-                            for s_item in standings_obj:
-                                if isinstance(s_item, dict) and 'teams' in s_item:
-                                    teams_obj = s_item['teams']
-                                    break
-                        
-                        if teams_obj is None:
-                            continue
-                        
-                        if isinstance(teams_obj, dict):
-                            teams_list = [v for k, v in teams_obj.items() if k != 'count']
-                        else:
-                            teams_list = teams_obj if isinstance(teams_obj, list) else []
-                        
-                        for team_data in teams_list:
-                            if not isinstance(team_data, dict):
-                                continue
-                            
-                            team_info = team_data.get('team', [])
-                            if isinstance(team_info, dict):
-                                team_info = [team_info]
-                            
-                            team = {
-                                'name': '',
-                                'team_key': '',
-                                'rank': 0,
-                                'wins': 0,
-                                'losses': 0,
-                                'ties': 0,
-                                'points_for': 0.0,
-                                'points_against': 0.0,
-                                'streak': '',
-                                'manager': ''
-                            }
-                            
-                            for info in team_info:
-                                if isinstance(info, list):
-                                    for detail in info:
-                                        if isinstance(detail, dict):
-                                            if 'name' in detail:
-                                                team['name'] = detail['name']
-                                            if 'team_key' in detail:
-                                                team['team_key'] = detail['team_key']
-                                            if 'managers' in detail:
-                                                managers = detail['managers']
-                                                if isinstance(managers, list) and managers:
-                                                    mgr = managers[0].get('manager', {})
-                                                    team['manager'] = mgr.get('nickname', '')
-                                                elif isinstance(managers, dict):
-                                                    mgr = managers.get('0', {}).get('manager', {})
-                                                    team['manager'] = mgr.get('nickname', '')
-                                elif isinstance(info, dict):
-                                    if 'team_standings' in info:
-                                        ts = info['team_standings']
-                                        team['rank'] = int(ts.get('rank', 0))
-                                        team['points_for'] = float(ts.get('points_for', 0))
-                                        team['points_against'] = float(ts.get('points_against', 0))
-                                        
-                                        streak = ts.get('streak', {})
-                                        if streak:
-                                            team['streak'] = f"{streak.get('type', '')[0].upper()}{streak.get('value', '')}"
-                                        
-                                        outcome = ts.get('outcome_totals', {})
-                                        team['wins'] = int(outcome.get('wins', 0))
-                                        team['losses'] = int(outcome.get('losses', 0))
-                                        team['ties'] = int(outcome.get('ties', 0))
-                            
-                            if team['name']:
-                                standings.append(team)
+            for team_data in iter_collection(teams_obj, 'team'):
+                info = flatten(team_data)
+                if not info.get('name'):
+                    continue
+                
+                ts = info.get('team_standings') or {}
+                outcome = ts.get('outcome_totals') or {}
+                streak = ts.get('streak') or {}
+                streak_type = streak.get('type', '')
+                
+                standings.append(TeamStanding(
+                    name=info['name'],
+                    team_key=info.get('team_key', ''),
+                    rank=int(ts.get('rank') or 0),
+                    wins=int(outcome.get('wins', 0)),
+                    losses=int(outcome.get('losses', 0)),
+                    ties=int(outcome.get('ties', 0)),
+                    points_for=float(ts.get('points_for', 0)),
+                    points_against=float(ts.get('points_against', 0)),
+                    streak=f"{streak_type[:1].upper()}{streak.get('value', '')}" if streak else '',
+                    manager=first_manager(info.get('managers')).get('nickname', '')
+                ))
         except (KeyError, TypeError, IndexError, ValueError) as e:
             print(f"Error parsing standings: {e}")
         
-        return sorted(standings, key=lambda x: x['rank'])
+        return sorted(standings, key=lambda x: x.rank)
     
-    async def get_all_teams_info(self, league_key: str) -> List[Dict]:
+    @memoized
+    async def get_all_teams_info(self, league_key: str) -> List[TeamInfo]:
         """Get information about all teams in the league."""
         teams_data = await self.client.get_all_teams(league_key)
         teams = []
@@ -114,168 +124,118 @@ class FantasyFootballTreasurer:
             return teams
         
         try:
-            fantasy_content = teams_data.get('fantasy_content', {})
-            league_data = fantasy_content.get('league', [])
+            teams_obj = child(content(teams_data, 'league'), 'teams')
             
-            if isinstance(league_data, list):
-                for item in league_data:
-                    if isinstance(item, dict) and 'teams' in item:
-                        teams_obj = item['teams']
-                        
-                        if isinstance(teams_obj, dict):
-                            teams_list = [v for k, v in teams_obj.items() if k != 'count']
-                        else:
-                            teams_list = teams_obj if isinstance(teams_obj, list) else []
-                        
-                        for team_data in teams_list:
-                            if not isinstance(team_data, dict):
-                                continue
-                            
-                            team_info = team_data.get('team', [])
-                            if isinstance(team_info, dict):
-                                team_info = [team_info]
-                            
-                            team = {
-                                'name': '',
-                                'team_key': '',
-                                'team_id': '',
-                                'manager': '',
-                                'logo_url': '',
-                                'waiver_priority': 0,
-                                'moves': 0,
-                                'trades': 0
-                            }
-                            
-                            for info in team_info:
-                                if isinstance(info, list):
-                                    for detail in info:
-                                        if isinstance(detail, dict):
-                                            if 'name' in detail:
-                                                team['name'] = detail['name']
-                                            if 'team_key' in detail:
-                                                team['team_key'] = detail['team_key']
-                                            if 'team_id' in detail:
-                                                team['team_id'] = detail['team_id']
-                                            if 'team_logos' in detail:
-                                                logos = detail['team_logos']
-                                                if isinstance(logos, list) and logos:
-                                                    team['logo_url'] = logos[0].get('team_logo', {}).get('url', '')
-                                            if 'managers' in detail:
-                                                managers = detail['managers']
-                                                # Handle managers as list
-                                                if isinstance(managers, list) and managers:
-                                                    for mgr_item in managers:
-                                                        if isinstance(mgr_item, dict) and 'manager' in mgr_item:
-                                                            mgr = mgr_item['manager']
-                                                            team['manager'] = mgr.get('nickname', '') or mgr.get('guid', '')
-                                                            break
-                                                        elif isinstance(mgr_item, dict):
-                                                            team['manager'] = mgr_item.get('nickname', '') or mgr_item.get('guid', '')
-                                                            break
-                                                # Handle managers as dict
-                                                elif isinstance(managers, dict):
-                                                    for key, mgr_item in managers.items():
-                                                        if key == 'count':
-                                                            continue
-                                                        if isinstance(mgr_item, dict):
-                                                            if 'manager' in mgr_item:
-                                                                mgr = mgr_item['manager']
-                                                                team['manager'] = mgr.get('nickname', '') or mgr.get('guid', '')
-                                                            else:
-                                                                team['manager'] = mgr_item.get('nickname', '') or mgr_item.get('guid', '')
-                                                            break
-                                            if 'waiver_priority' in detail:
-                                                team['waiver_priority'] = int(detail['waiver_priority'])
-                                            if 'number_of_moves' in detail:
-                                                team['moves'] = int(detail['number_of_moves'])
-                                            if 'number_of_trades' in detail:
-                                                team['trades'] = int(detail['number_of_trades'])
-                                elif isinstance(info, dict):
-                                    if 'name' in info:
-                                        team['name'] = info['name']
-                                    if 'waiver_priority' in info:
-                                        team['waiver_priority'] = int(info['waiver_priority'])
-                                    if 'number_of_moves' in info:
-                                        team['moves'] = int(info['number_of_moves'])
-                                    if 'number_of_trades' in info:
-                                        team['trades'] = int(info['number_of_trades'])
-                            
-                            if team['name']:
-                                teams.append(team)
+            for team_data in iter_collection(teams_obj, 'team'):
+                info = flatten(team_data)
+                if not info.get('name'):
+                    continue
+                
+                manager = first_manager(info.get('managers'))
+                logo = next(iter_collection(info.get('team_logos'), 'team_logo'), {})
+                
+                teams.append(TeamInfo(
+                    name=info['name'],
+                    team_key=info.get('team_key', ''),
+                    team_id=info.get('team_id', ''),
+                    manager=manager.get('nickname', '') or manager.get('guid', ''),
+                    logo_url=logo.get('url', ''),
+                    waiver_priority=int(info.get('waiver_priority') or 0),
+                    moves=int(info.get('number_of_moves') or 0),
+                    trades=int(info.get('number_of_trades') or 0),
+                    manager_guid=manager.get('guid', '')
+                ))
         except (KeyError, TypeError, IndexError, ValueError) as e:
             print(f"Error parsing teams: {e}")
         
         return teams
     
-    async def get_team_roster(self, team_key: str) -> List[Dict]:
+    @memoized
+    async def get_team_roster(self, team_key: str) -> List[RosterPlayer]:
         """Get roster (players) for a specific team."""
         roster_data = await self.client.get_team_roster(team_key)
-        players = []
         
         if not roster_data:
-            return players
+            return []
         
         try:
-            fantasy_content = roster_data.get('fantasy_content', {})
-            team_data = fantasy_content.get('team', [])
-            
-            if isinstance(team_data, list):
-                for item in team_data:
-                    if isinstance(item, dict) and 'roster' in item:
-                        roster_obj = item['roster']
-                        players_obj = roster_obj.get('0', {}).get('players', {})
-                        
-                        if isinstance(players_obj, dict):
-                            players_list = [v for k, v in players_obj.items() if k != 'count']
-                        else:
-                            players_list = players_obj if isinstance(players_obj, list) else []
-                        
-                        for player_data in players_list:
-                            if not isinstance(player_data, dict):
-                                continue
-                            
-                            player_info = player_data.get('player', [])
-                            if isinstance(player_info, dict):
-                                player_info = [player_info]
-                            
-                            player = {
-                                'name': '',
-                                'player_key': '',
-                                'position': '',
-                                'team': '',
-                                'status': '',
-                                'selected_position': ''
-                            }
-                            
-                            for info in player_info:
-                                if isinstance(info, list):
-                                    for detail in info:
-                                        if isinstance(detail, dict):
-                                            if 'name' in detail:
-                                                player['name'] = detail['name'].get('full', '')
-                                            if 'player_key' in detail:
-                                                player['player_key'] = detail['player_key']
-                                            if 'editorial_team_abbr' in detail:
-                                                player['team'] = detail['editorial_team_abbr'].upper()
-                                            if 'display_position' in detail:
-                                                player['position'] = detail['display_position']
-                                            if 'status' in detail:
-                                                player['status'] = detail['status']
-                                elif isinstance(info, dict):
-                                    if 'selected_position' in info:
-                                        sel_pos = info['selected_position']
-                                        if isinstance(sel_pos, list) and sel_pos:
-                                            player['selected_position'] = sel_pos[0].get('position', '')
-                                        elif isinstance(sel_pos, dict):
-                                            player['selected_position'] = sel_pos.get('position', '')
-                            
-                            if player['name']:
-                                players.append(player)
+            return self._parse_roster(child(content(roster_data, 'team'), 'roster'))
         except (KeyError, TypeError, IndexError, ValueError) as e:
             print(f"Error parsing roster: {e}")
+            return []
+    
+    async def get_team_rosters(self, team_keys: List[str]) -> Dict[str, List[RosterPlayer]]:
+        """Get rosters for several teams, keyed by team key in the order given.
+
+        Uncached teams are fetched with one ``teams;team_keys=.../roster``
+        collection call; if that call fails, they fall back to concurrent
+        per-team requests (whose errors are raised).
+        """
+        rosters: Dict[str, List[RosterPlayer]] = {}
+        missing = []
+        for team_key in team_keys:
+            cached = self._results.get(memo_key('get_team_roster', (team_key,)))
+            if cached is not None:
+                rosters[team_key] = list(cached)
+            else:
+                missing.append(team_key)
+        
+        if missing:
+            try:
+                rosters_data = await self._limited(self.client.get_team_rosters(missing))
+            except YahooAPIError as e:
+                print(f"Roster collection request failed ({e}); fetching teams one by one")
+                rosters_data = None
+            if rosters_data:
+                fetched = self._split_team_rosters(rosters_data)
+                for team_key, players in fetched.items():
+                    if players:
+                        self._results.put(memo_key('get_team_roster', (team_key,)), players)
+                rosters.update(fetched)
+            else:
+                results = await asyncio.gather(
+                    *(self._limited(self.get_team_roster(team_key)) for team_key in missing)
+                )
+                rosters.update(zip(missing, results))
+        
+        return {team_key: rosters.get(team_key, []) for team_key in team_keys}
+    
+    def _split_team_rosters(self, rosters_data: Dict) -> Dict[str, List[RosterPlayer]]:
+        """Parse a ``teams`` collection payload into players per team key."""
+        rosters: Dict[str, List[RosterPlayer]] = {}
+        
+        try:
+            for team_data in iter_collection(content(rosters_data, 'teams'), 'team'):
+                info = flatten(team_data)
+                if info.get('team_key'):
+                    rosters[info['team_key']] = self._parse_roster(info.get('roster'))
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            print(f"Error parsing rosters: {e}")
+        
+        return rosters
+    
+    def _parse_roster(self, roster_obj: Optional[Dict]) -> List[RosterPlayer]:
+        """Parse the players of one team's ``roster`` resource."""
+        players = []
+        
+        for player_data in iter_collection(child(roster_obj, 'players'), 'player'):
+            info = flatten(player_data)
+            name = (info.get('name') or {}).get('full', '')
+            if not name:
+                continue
+            
+            players.append(RosterPlayer(
+                name=name,
+                player_key=info.get('player_key', ''),
+                position=info.get('display_position', ''),
+                team=info.get('editorial_team_abbr', '').upper(),
+                status=info.get('status', ''),
+                selected_position=flatten(info.get('selected_position')).get('position', '')
+            ))
         
         return players
 
+    @memoized
     async def discover_game_keys(self) -> Dict[int, str]:
         """Discover all available NFL game keys from Yahoo API."""
         games_data = await self.client.get_all_nfl_games()
@@ -285,45 +245,16 @@ class FantasyFootballTreasurer:
             return game_keys
         
         try:
-            fantasy_content = games_data.get('fantasy_content', {})
-            users = fantasy_content.get('users', {})
+            user = next(iter_collection(content(games_data, 'users'), 'user'), [])
             
-            if isinstance(users, dict):
-                user = users.get('0', {}).get('user', [])
-            elif isinstance(users, list):
-                user = users[0] if users else []
-            else:
-                user = []
-            
-            for item in user:
-                if isinstance(item, dict) and 'games' in item:
-                    games = item['games']
-                    
-                    if isinstance(games, dict):
-                        games_list = [v for k, v in games.items() if k != 'count']
-                    elif isinstance(games, list):
-                        games_list = games
-                    else:
-                        continue
+            for game_data in iter_collection(child(user, 'games'), 'game'):
+                game = flatten(game_data)
+                game_key = game.get('game_key')
+                season = game.get('season')
+                
+                if game_key and season:
+                    game_keys[int(season)] = game_key
                     
-                    for game_value in games_list:
-                        if not isinstance(game_value, dict):
-                            continue
-                        
-                        game_info = game_value.get('game', [])
-                        if isinstance(game_info, list) and game_info:
-                            game_data = game_info[0] if isinstance(game_info[0], dict) else {}
-                        elif isinstance(game_info, dict):
-                            game_data = game_info
-                        else:
-                            continue
-                        
-                        game_key = game_data.get('game_key')
-                        season = game_data.get('season')
-                        
-                        if game_key and season:
-                            game_keys[int(season)] = game_key
-                            
         except (KeyError, TypeError, IndexError, ValueError) as e:
             print(f"Error discovering game keys: {e}")
         
@@ -334,110 +265,100 @@ class FantasyFootballTreasurer:
         if season:
             return await self._get_leagues_for_season(season)
         else:
-            # Get leagues for last 6 years
-            all_leagues = []
-            for year in range(2021, 2027):
-                leagues = await self._get_leagues_for_season(year)
-                all_leagues.extend(leagues)
-            return all_leagues
+            leagues_by_year = await self.list_all_leagues_all_years()
+            return [league for year in sorted(leagues_by_year) for league in leagues_by_year[year]]
     
-    async def list_all_leagues_all_years(self) -> Dict[int, List[Dict]]:
-        """List all leagues grouped by year for last 6 years."""
-        leagues_by_year = {}
-        for year in range(2021, 2027):
-            leagues = await self._get_leagues_for_season(year)
-            if leagues:
-                leagues_by_year[year] = leagues
-        return leagues_by_year
+    async def list_all_leagues_all_years(self, game_keys: Optional[Dict[int, str]] = None,
+                                         seasons: Optional[Iterable[int]] = None) -> Dict[int, List[Dict]]:
+        """List all leagues grouped by year for ``seasons`` (default: ``SEASONS``).
+
+        All seasons are requested in a single ``games;game_keys=...`` call built
+        from ``game_keys`` (discovered if not given). If discovery fails, each
+        season is fetched concurrently with the built-in game keys instead.
+        """
+        seasons = set(self.SEASONS if seasons is None else seasons)
+        if game_keys is None:
+            game_keys = await self.discover_game_keys()
+        keys = tuple(game_keys[year] for year in sorted(game_keys) if year in seasons)
+        
+        if keys:
+            leagues = await self._get_leagues_for_game_keys(keys)
+        else:
+            results = await asyncio.gather(
+                *(self._limited(self._get_leagues_for_season(year)) for year in sorted(seasons))
+            )
+            leagues = [league for season_leagues in results for league in season_leagues]
+        
+        leagues_by_year: Dict[int, List[Dict]] = {}
+        seen = set()
+        for league in leagues:
+            # The generic "nfl" key can repeat the current season
+            if league['league_key'] in seen:
+                continue
+            seen.add(league['league_key'])
+            leagues_by_year.setdefault(league['season'], []).append(league)
+        return dict(sorted(leagues_by_year.items()))
+    
+    @memoized
+    async def _get_leagues_for_game_keys(self, game_keys: tuple) -> List[Dict]:
+        """Get leagues for several seasons' game keys in one request."""
+        leagues_data = await self.client.get_leagues_by_game_keys(list(game_keys))
+        return self._parse_user_leagues(leagues_data, None)
     
+    @memoized
     async def _get_leagues_for_season(self, season: int) -> List[Dict]:
         """Get leagues for a specific season."""
         leagues_data = await self.client.get_leagues_by_season(season)
-        
+        return self._parse_user_leagues(leagues_data, season)
+    
+    def _parse_user_leagues(self, leagues_data: Optional[Dict], season: Optional[int]) -> List[Dict]:
+        """Parse a ``users/games/leagues`` payload; each league takes its season from the payload."""
         leagues = []
         
         if not leagues_data:
             return leagues
         
         try:
-            fantasy_content = leagues_data.get('fantasy_content', {})
-            users = fantasy_content.get('users', {})
+            user = next(iter_collection(content(leagues_data, 'users'), 'user'), [])
             
-            # Handle both dict and list formats
-            if isinstance(users, dict):
-                user = users.get('0', {}).get('user', [])
-            elif isinstance(users, list):
-                user = users[0] if users else []
-            else:
-                user = []
-            
-            for item in user:
-                if isinstance(item, dict) and 'games' in item:
-                    games = item['games']
-                    
-                    # Handle games as dict or list
-                    if isinstance(games, dict):
-                        games_list = [v for k, v in games.items() if k != 'count']
-                    elif isinstance(games, list):
-                        games_list = games
-                    else:
-                        continue
-                    
-                    for game_value in games_list:
-                        if not isinstance(game_value, dict):
-                            continue
-                        
-                        game_data = game_value.get('game', [])
-                        if isinstance(game_data, dict):
-                            game_data = [game_data]
-                        
-                        for game_item in game_data:
-                            if not isinstance(game_item, dict):
-                                continue
-                            
-                            # Extract actual season from game data
-                            actual_season = game_item.get('season', season)
-                            if isinstance(actual_season, str):
-                                actual_season = int(actual_season)
-                            
-                            if 'leagues' not in game_item:
-                                continue
-                            
-                            leagues_obj = game_item['leagues']
-                            
-                            # Handle leagues as dict or list
-                            if isinstance(leagues_obj, dict):
-                                leagues_list = [v for k, v in leagues_obj.items() if k != 'count']
-                            elif isinstance(leagues_obj, list):
-                                leagues_list = leagues_obj
-                            else:
-                                continue
-                            
-                            for league_value in leagues_list:
-                                if not isinstance(league_value, dict):
-                                    continue
-                                
-                                league_info = league_value.get('league', [])
-                                if isinstance(league_info, dict):
-                                    league_info = [league_info]
-                                
-                                if league_info and isinstance(league_info[0], dict):
-                                    # Try to get season from league info first, then game data
-                                    league_season = league_info[0].get('season', actual_season)
-                                    if isinstance(league_season, str):
-                                        league_season = int(league_season)
-                                    
-                                    league = {
-                                        'name': league_info[0].get('name', 'Unknown'),
-                                        'league_id': league_info[0].get('league_id'),
-                                        'league_key': league_info[0].get('league_key'),
-                                        'num_teams': league_info[0].get('num_teams'),
-                                        'current_week': league_info[0].get('current_week'),
-                                        'season': league_season
-                                    }
-                                    leagues.append(league)
-        except (KeyError, TypeError, IndexError) as e:
-            print(f"Error parsing leagues for {season}: {e}")
+            for game_data in iter_collection(child(user, 'games'), 'game'):
+                # The game's metadata and its leagues arrive as separate items
+                game = flatten(game_data)
+                game_season = int(game['season']) if 'season' in game else season
+                
+                for league_data in iter_collection(game.get('leagues'), 'league'):
+                    leagues.append(self._league_summary(flatten(league_data), game_season))
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            print(f"Error parsing leagues for {season or 'all seasons'}: {e}")
+        
+        return leagues
+    
+    def _league_summary(self, info: Dict, season: Optional[int] = None) -> Dict:
+        """Build the league dict used throughout the app from flattened league metadata."""
+        league_season = info.get('season', season)
+        return {
+            'name': info.get('name', 'Unknown'),
+            'league_id': info.get('league_id'),
+            'league_key': info.get('league_key'),
+            'num_teams': info.get('num_teams'),
+            'current_week': info.get('current_week'),
+            'is_finished': str(info.get('is_finished', '0')) == '1',
+            'season': int(league_season) if league_season is not None else None
+        }
+    
+    async def get_leagues_info(self, league_keys: List[str]) -> List[Dict]:
+        """Look up several leagues by key in one ``leagues;league_keys=`` call."""
+        leagues_data = await self.client.get_leagues(league_keys)
+        leagues = []
+        
+        if not leagues_data:
+            return leagues
+        
+        try:
+            for league_data in iter_collection(content(leagues_data, 'leagues'), 'league'):
+                leagues.append(self._league_summary(flatten(league_data)))
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            print(f"Error parsing leagues: {e}")
         
         return leagues
     
@@ -465,138 +386,296 @@ class FantasyFootballTreasurer:
         
         return matching
     
+    @memoized
     async def get_weekly_scores(self, league_key: str, week: int) -> List[WeeklyScore]:
         """Get all team scores for a specific week."""
-        scores = []
         scoreboard = await self.client.get_matchups(league_key, week)
+        return self._split_scoreboard(scoreboard, week).get(week, [])
+    
+    async def get_weekly_scores_many(self, league_key: str, weeks: Iterable[int]) -> Dict[int, List[WeeklyScore]]:
+        """Get team scores for several weeks, returned in week order.
+
+        Weeks already memoized are reused; the rest are requested in batches of
+        ``SCOREBOARD_BATCH_SIZE`` weeks per call, with the batches in flight
+        concurrently.
+        """
+        return {week: scores async for week, scores in self.stream_weekly_scores(league_key, weeks)}
+    
+    async def stream_weekly_scores(self, league_key: str, weeks: Iterable[int]) -> AsyncIterator[Tuple[int, List[WeeklyScore]]]:
+        """Yield ``(week, scores)`` in week order, each as soon as its batch has arrived.
+
+        Batches are fetched as in ``get_weekly_scores_many``, all at once, so
+        the first weeks can be processed while later batches are in flight.
+        """
+        weeks = sorted(set(weeks))
+        results: Dict[int, List[WeeklyScore]] = {}
+        missing = []
+        for week in weeks:
+            cached = self._results.get(memo_key('get_weekly_scores', (league_key, week)))
+            if cached is not None:
+                results[week] = list(cached)
+            else:
+                missing.append(week)
+        
+        batch_of_week = {}
+        tasks = []
+        for i in range(0, len(missing), self.SCOREBOARD_BATCH_SIZE):
+            batch = missing[i:i + self.SCOREBOARD_BATCH_SIZE]
+            task = asyncio.ensure_future(self._limited(self._get_weekly_scores_batch(league_key, batch)))
+            tasks.append(task)
+            batch_of_week.update(dict.fromkeys(batch, task))
+        
+        try:
+            for week in weeks:
+                if week not in results:
+                    results.update(await batch_of_week[week])
+                yield week, results.get(week, [])
+        finally:
+            # Stop fetching if the consumer gave up early or a batch failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _get_weekly_scores_batch(self, league_key: str, weeks: List[int]) -> Dict[int, List[WeeklyScore]]:
+        """Fetch several weeks in one multi-week scoreboard call and memoize each week."""
+        scoreboard = await self.client.get_league_scoreboards(league_key, weeks)
+        by_week = self._split_scoreboard(scoreboard, weeks[0] if len(weeks) == 1 else None)
+        self._note_scoreboard_status(league_key, scoreboard, weeks[0] if len(weeks) == 1 else None)
+        for week, scores in by_week.items():
+            if scores:
+                self._results.put(memo_key('get_weekly_scores', (league_key, week)), scores)
+        return by_week
+    
+    def _split_scoreboard(self, scoreboard: Optional[Dict], default_week: Optional[int]) -> Dict[int, List[WeeklyScore]]:
+        """Demultiplex a (possibly multi-week) scoreboard payload into per-week scores.
+
+        Each matchup carries its own ``week``; ``default_week`` is used for
+        matchups that do not.
+        """
+        scores_by_week: Dict[int, List[WeeklyScore]] = {}
         
         if not scoreboard:
-            return scores
+            return scores_by_week
         
         try:
-            fantasy_content = scoreboard.get('fantasy_content', {})
-            league_data = fantasy_content.get('league', [])
-            
-            if isinstance(league_data, dict):
-                league_data = [league_data]
+            matchups = child(child(content(scoreboard, 'league'), 'scoreboard'), 'matchups')
             
-            for item in league_data:
-                if not isinstance(item, dict) or 'scoreboard' not in item:
+            for matchup in iter_collection(matchups, 'matchup'):
+                week = int(matchup.get('week') or default_week or 0)
+                if not week:
                     continue
+                week_scores = scores_by_week.setdefault(week, [])
                 
-                scoreboard_data = item['scoreboard']
-                
-                # Handle matchups as dict or list
-                if isinstance(scoreboard_data, dict):
-                    matchups = scoreboard_data.get('0', {}).get('matchups', {})
-                    if isinstance(matchups, dict):
-                        matchups_list = [v for k, v in matchups.items() if k != 'count']
-                    else:
-                        matchups_list = matchups if isinstance(matchups, list) else []
-                else:
-                    continue
-                
-                for matchup_data in matchups_list:
-                    if not isinstance(matchup_data, dict):
+                for team_data in iter_collection(child(matchup, 'teams'), 'team'):
+                    info = flatten(team_data)
+                    if not info.get('name'):
                         continue
                     
-                    matchup = matchup_data.get('matchup', {})
+                    points_data = info.get('team_points', 0)
+                    if isinstance(points_data, dict):
+                        points_data = points_data.get('total', 0)
                     
-                    # Handle teams
-                    teams_obj = matchup.get('0', {}).get('teams', {})
-                    if isinstance(teams_obj, dict):
-                        teams_list = [v for k, v in teams_obj.items() if k != 'count']
-                    elif isinstance(teams_obj, list):
-                        teams_list = teams_obj
-                    else:
-                        continue
+                    week_scores.append(WeeklyScore(
+                        team_name=info['name'],
+                        week=week,
+                        points=float(points_data or 0),
+                        team_key=info.get('team_key')
+                    ))
                     
-                    for team_data in teams_list:
-                        if not isinstance(team_data, dict):
-                            continue
-                        
-                        team_info = team_data.get('team', [])
-                        if isinstance(team_info, dict):
-                            team_info = [team_info]
-                        
-                        team_name = ""
-                        team_points = 0.0
-                        
-                        for info in team_info:
-                            if isinstance(info, list):
-                                for detail in info:
-                                    if isinstance(detail, dict) and 'name' in detail:
-                                        team_name = detail['name']
-                            elif isinstance(info, dict):
-                                if 'name' in info:
-                                    team_name = info['name']
-                                if 'team_points' in info:
-                                    points_data = info['team_points']
-                                    if isinstance(points_data, dict):
-                                        team_points = float(points_data.get('total', 0))
-                                    else:
-                                        team_points = float(points_data)
-                        
-                        if team_name:
-                            scores.append(WeeklyScore(
-                                team_name=team_name,
-                                week=week,
-                                points=team_points
-                            ))
-                            
         except (KeyError, TypeError, IndexError, ValueError) as e:
-            print(f"Error parsing week {week} scores: {e}")
+            print(f"Error parsing scoreboard: {e}")
         
-        return scores
+        return scores_by_week
     
-    async def get_weekly_top_scorers(self, league_key: str, top_n: int = 3) -> None:
-        """Get top N scorers for each completed week."""
+    def _note_scoreboard_status(self, league_key: str, scoreboard: Optional[Dict], default_week: Optional[int]) -> None:
+        """Remember the league's current week, whether it is finished and which weeks are over.
+
+        A week is over once every one of its matchups has status ``postevent``.
+        """
+        if not scoreboard:
+            return
+        try:
+            league = content(scoreboard, 'league')
+            meta = flatten(league)
+            statuses: Dict[int, set] = {}
+            for matchup in iter_collection(child(child(league, 'scoreboard'), 'matchups'), 'matchup'):
+                week = int(matchup.get('week') or default_week or 0)
+                if week:
+                    statuses.setdefault(week, set()).add(matchup.get('status'))
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            print(f"Error parsing scoreboard status: {e}")
+            return
+        status = self._scoreboard_status.setdefault(
+            league_key, {'current_week': None, 'is_finished': False, 'closed_weeks': set()}
+        )
+        if meta.get('current_week'):
+            status['current_week'] = int(meta['current_week'])
+        status['is_finished'] = str(meta.get('is_finished', '0')) == '1'
+        status['closed_weeks'].update(week for week, seen in statuses.items() if seen == {'postevent'})
+    
+    async def _current_week(self, league: Dict) -> Optional[int]:
+        """The league's current week from its summary, looked up only if the summary lacks it."""
+        current_week = league.get('current_week')
+        if not current_week and league.get('season'):
+            for season_league in await self._get_leagues_for_season(league['season']):
+                if season_league['league_key'] == league['league_key']:
+                    current_week = season_league.get('current_week')
+        return int(current_week) if current_week else None
+    
+    async def sync_weekly_scores(self, league: Dict, weeks: Optional[Iterable[int]] = None) -> Dict[int, List[WeeklyScore]]:
+        """Bring a league's stored score history up to date and return it.
+
+        Only weeks after the stored ``last_completed_week`` are fetched (plus
+        the current week, which may still change, and any requested week the
+        history lacks), so a weekly rerun costs one scoreboard call. Weeks of a
+        finished season, and weeks whose matchups are all over, count as
+        completed, so a closed season costs none. If the scoreboard reports a
+        later current week than the league summary, the weeks since are
+        fetched too. Returns the requested weeks, or the whole history if
+        ``weeks`` is None.
+        """
+        store = self._sync_store or SyncStore()
+        league_key = league['league_key']
+        state = store.load(league_key)
+        current_week = await self._current_week(league)
+        
+        wanted = set(weeks) if weeks is not None else set()
+        if current_week:
+            wanted.update(range(state.last_completed_week + 1, current_week + 1))
+            wanted = {week for week in wanted if week <= current_week}
+        to_fetch = sorted(
+            week for week in wanted
+            if week > state.last_completed_week or week not in state.scores
+        )
+        
+        if to_fetch:
+            fetched = await self.get_weekly_scores_many(league_key, to_fetch)
+            status = self._scoreboard_status.get(league_key, {})
+            if current_week and (status.get('current_week') or 0) > current_week:
+                # The summary was listed before the season moved on
+                fetched.update(await self.get_weekly_scores_many(
+                    league_key, range(current_week + 1, status['current_week'] + 1)))
+                current_week = status['current_week']
+            finished = league.get('is_finished') or status.get('is_finished')
+            closed = status.get('closed_weeks', set())
+            changed = [week for week, scores in fetched.items() if scores and state.merge(week, scores)]
+            # Only advance over a contiguous run of stored weeks so gaps get retried
+            last = state.last_completed_week
+            while last + 1 in state.scores and (current_week is None or last + 1 < current_week
+                                                or finished or last + 1 in closed):
+                last += 1
+            if changed or last != state.last_completed_week:
+                state.last_completed_week = last
+                store.save(state)
+        
+        if weeks is None:
+            return dict(sorted(state.scores.items()))
+        return {week: list(state.scores.get(week, [])) for week in sorted(set(weeks))}
+    
+    async def get_league_earnings(self, league: Dict, prizes: Sequence[float], weeks: Iterable[int]) -> LeagueEarnings:
+        """Fetch a league's teams and the given weeks concurrently and total its weekly prizes.
+
+        With a sync store the weeks come from the league's stored history,
+        topped up with only the weeks that are new since the last run. With an
+        owner index, teams are fetched only for leagues it has not seen, and
+        owners are named by manager GUID so renames across seasons still match.
+        """
+        async for event in self.stream_league_earnings(league, prizes, weeks):
+            pass
+        return event
+    
+    async def stream_league_earnings(self, league: Dict, prizes: Sequence[float],
+                                     weeks: Iterable[int]) -> AsyncIterator[Union[WeekScored, LeagueEarnings]]:
+        """Yield a ``WeekScored`` per week as it arrives, then the league's ``LeagueEarnings``."""
+        league_key = league['league_key']
+        index = self.owner_index
+        teams_task = None
+        if index is None or not index.has_league(league_key):
+            teams_task = asyncio.ensure_future(self._limited(self.get_all_teams_info(league_key)))
+        scores_by_week: Dict[int, List[WeeklyScore]] = {}
+        try:
+            if self._sync_store is not None:
+                weekly_scores = (await self.sync_weekly_scores(league, weeks)).items()
+                for week, scores in weekly_scores:
+                    scores_by_week[week] = scores
+                    yield WeekScored(league_key, week, scores, league.get('season'))
+            else:
+                async for week, scores in self.stream_weekly_scores(league_key, weeks):
+                    scores_by_week[week] = scores
+                    yield WeekScored(league_key, week, scores, league.get('season'))
+            teams = await teams_task if teams_task is not None else []
+        finally:
+            if teams_task is not None:
+                teams_task.cancel()
+        
+        matrix = ScoreMatrix.from_weekly_scores(scores_by_week)
+        team_names = {team.team_key: team.name for team in teams}
+        owners = {team.team_key: team.manager for team in teams if team.manager}
+        if index is not None:
+            if teams and index.add_teams(league_key, teams, league.get('season')):
+                index.save()
+            team_names = {**index.league_teams(league_key), **team_names}
+            owners.update((key, index.owner_of(key)) for key in team_names if index.owner_of(key))
+        team_names.update(zip(matrix.teams, matrix.names))
+        
+        yield LeagueEarnings(
+            league_key=league_key,
+            league_name=league['name'],
+            season=league['season'],
+            team_names=team_names,
+            team_owners={key: owners.get(key, name) for key, name in team_names.items()},
+            earnings=matrix.prize_totals(prizes),
+            scored_weeks=matrix.weeks_with_scores()
+        )
+    
+    async def get_all_league_earnings(self, leagues: List[Dict], prizes: Sequence[float], weeks: Iterable[int]) -> List[LeagueEarnings]:
+        """Total weekly prizes for many leagues at once.
+
+        Every league's requests are in flight together; the agent's concurrency
+        cap and the client's rate limiter bound the actual load on Yahoo.
+        """
+        weeks = list(weeks)
+        return list(await asyncio.gather(
+            *(self.get_league_earnings(league, prizes, weeks) for league in leagues)
+        ))
+    
+    async def stream_all_league_earnings(self, leagues: List[Dict], prizes: Sequence[float],
+                                         weeks: Iterable[int]) -> AsyncIterator[Union[WeekScored, LeagueEarnings]]:
+        """Every league's ``stream_league_earnings`` events, interleaved as they arrive.
+
+        Each league ends with its ``LeagueEarnings``; leagues finish in any order.
+        """
+        weeks = list(weeks)
+        async for event in merge_streams(
+            *(self.stream_league_earnings(league, prizes, weeks) for league in leagues)
+        ):
+            yield event
+    
+    async def get_weekly_top_scorers(self, league_key: str,
+                                     top_n: int = 3) -> AsyncIterator[Union[WeekTopScorers, SeasonTopScorers]]:
+        """Yield the top N scorers of each week up to the current one, then the season summary.
+
+        Weeks are yielded in order as their scoreboards arrive; weeks without
+        scores yield an empty ``top``. The final ``SeasonTopScorers`` totals the
+        weekly top-N appearances of each team.
+        """
         league_info = await self.client.get_league_info(league_key)
         
         current_week = 17
         
         if league_info:
             try:
-                fantasy_content = league_info.get('fantasy_content', {})
-                league_data = fantasy_content.get('league', [])
-                if isinstance(league_data, dict):
-                    current_week = int(league_data.get('current_week', 17))
-                elif isinstance(league_data, list) and league_data and isinstance(league_data[0], dict):
-                    current_week = int(league_data[0].get('current_week', 17))
+                current_week = int(flatten(content(league_info, 'league')).get('current_week', 17))
             except (KeyError, TypeError, ValueError):
                 pass
         
-        print(f"{'='*60}")
-        print(f"TOP {top_n} SCORERS BY WEEK")
-        print(f"{'='*60}\n")
-        
         all_scores: Dict[str, List[float]] = {}
         
-        for week in range(1, current_week + 1):
-            print(f"📅 WEEK {week}")
-            print("-" * 40)
-            
-            scores = await self.get_weekly_scores(league_key, week)
-            
-            if not scores:
-                print("   No scores available for this week.\n")
-                continue
-            
-            sorted_scores = sorted(scores, key=lambda x: x.points, reverse=True)
-            
-            for rank, score in enumerate(sorted_scores[:top_n], 1):
-                medal = ["🥇", "🥈", "🥉"][rank - 1] if rank <= 3 else f"{rank}."
-                print(f"   {medal} {score.team_name}: {score.points:.2f} pts")
-                
-                if score.team_name not in all_scores:
-                    all_scores[score.team_name] = []
-                all_scores[score.team_name].append(score.points)
-            
-            print()
-        
-        print(f"{'='*60}")
-        print(f"SEASON SUMMARY - TOP {top_n} OVERALL SCORERS")
-        print(f"{'='*60}\n")
+        async for week, scores in self.stream_weekly_scores(league_key, range(1, current_week + 1)):
+            top = sorted(scores, key=lambda x: x.points, reverse=True)[:top_n]
+            for score in top:
+                all_scores.setdefault(score.team_name, []).append(score.points)
+            yield WeekTopScorers(league_key, week, top)
         
         team_totals = [
             TopScorer(
@@ -609,11 +688,4 @@ class FantasyFootballTreasurer:
         ]
         
         sorted_totals = sorted(team_totals, key=lambda x: x.total_points, reverse=True)
-        
-        for rank, scorer in enumerate(sorted_totals[:top_n], 1):
-            medal = ["🥇", "🥈", "🥉"][rank - 1] if rank <= 3 else f"{rank}."
-            print(f"{medal} {scorer.team_name}")
-            print(f"   Total Points: {scorer.total_points:.2f}")
-            print(f"   Weeks Played: {scorer.weeks_played}")
-            print(f"   Avg Points/Week: {scorer.average_points:.2f}")
-            print()
\ No newline at end of file
+        yield SeasonTopScorers(league_key, top_n, sorted_totals[:top_n])
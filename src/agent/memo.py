@@ -0,0 +1,71 @@
+import copy
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with an optional per-entry max age."""
+    
+    def __init__(self, maxsize: int = 256, max_age: Optional[float] = None):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, stored_at = entry
+        if self.max_age is not None and time.monotonic() - stored_at > self.max_age:
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; returns how many were dropped."""
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def memo_key(name: str, args: tuple = (), kwargs: Optional[dict] = None) -> Hashable:
+    """Build the cache key ``@memoized`` uses for a call to method ``name``."""
+    return (name, args, tuple(sorted((kwargs or {}).items())))
+
+
+def memoized(method):
+    """Cache an async agent method's parsed result, keyed by method name and arguments.
+
+    The owning object must expose an ``LRUCache`` as ``_results``. Empty results
+    are not cached so a failed fetch is retried on the next call, and callers
+    always get a shallow copy they are free to modify.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = memo_key(method.__name__, args, kwargs)
+        cached = self._results.get(key, _MISSING)
+        if cached is not _MISSING:
+            return copy.copy(cached)
+        result = await method(self, *args, **kwargs)
+        if result:
+            self._results.put(key, result)
+        return copy.copy(result)
+    return wrapper
@@ -0,0 +1,98 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from api.cache import DEFAULT_CACHE_DIR
+from models.team import TeamInfo
+
+
+class OwnerIndex:
+    """Who owns which team, across every season, keyed by Yahoo manager GUID.
+
+    Nicknames and team names change between seasons; the GUID does not. Each
+    owner is shown under the nickname from the newest season indexed, so
+    ``owner_of`` gives one stable name per person for any team key. Leagues
+    are added once and the index is saved as JSON in ``path``.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / 'owners.json'
+        # guid -> {'name': nickname, 'season': season the nickname is from}
+        self._owners: Dict[str, Dict] = {}
+        # team_key -> guid
+        self._team_owner: Dict[str, str] = {}
+        # league_key -> {team_key: team name}
+        self._leagues: Dict[str, Dict[str, str]] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def has_league(self, league_key: str) -> bool:
+        return league_key in self._leagues
+
+    def league_teams(self, league_key: str) -> Dict[str, str]:
+        """Team key -> team name for an indexed league (empty if not indexed)."""
+        return dict(self._leagues.get(league_key, {}))
+
+    def guid_of(self, team_key: str) -> Optional[str]:
+        return self._team_owner.get(team_key)
+
+    def owner_of(self, team_key: str) -> Optional[str]:
+        """The owner's current display name for any season's team key, or None if unknown."""
+        guid = self._team_owner.get(team_key)
+        return self._owners[guid]['name'] if guid else None
+
+    def add_teams(self, league_key: str, teams: Iterable[TeamInfo], season: Optional[int] = None) -> bool:
+        """Index one league's teams; returns True if anything changed.
+
+        Teams without a manager GUID (Yahoo hides some) are kept by name only,
+        so ``owner_of`` returns None for them.
+        """
+        teams = list(teams)
+        names = {team.team_key: team.name for team in teams}
+        changed = self._leagues.get(league_key) != names
+        self._leagues[league_key] = names
+        for team in teams:
+            guid = team.manager_guid
+            if not guid:
+                continue
+            if self._team_owner.get(team.team_key) != guid:
+                self._team_owner[team.team_key] = guid
+                changed = True
+            owner = self._owners.get(guid)
+            newer = owner is None or (season or 0) >= (owner['season'] or 0)
+            if newer and team.manager and (owner is None or owner['name'] != team.manager):
+                self._owners[guid] = {'name': team.manager, 'season': season}
+                changed = True
+        return changed
+
+    def forget(self, league_key: str) -> None:
+        """Drop a league so its teams are fetched and indexed again."""
+        for team_key in self._leagues.pop(league_key, {}):
+            self._team_owner.pop(team_key, None)
+
+    def to_dict(self) -> Dict:
+        return {'owners': self._owners, 'teams': self._team_owner, 'leagues': self._leagues}
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'rb') as f:
+                data = json.load(f)
+            owners = dict(data['owners'])
+            team_owner = dict(data['teams'])
+            leagues = {key: dict(teams) for key, teams in data['leagues'].items()}
+            self._owners, self._team_owner, self._leagues = owners, team_owner, leagues
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Ignoring unreadable owner index {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the index atomically (a crash never leaves a half-written file)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, self.path)
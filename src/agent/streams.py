@@ -0,0 +1,41 @@
+import asyncio
+from typing import AsyncIterator, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+async def merge_streams(*streams: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Yield items from several async iterators as each produces them.
+
+    Every stream is drained concurrently. The first error from any stream is
+    raised to the consumer, and closing the merged stream early (or an error)
+    cancels the streams still running.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def drain(stream: AsyncIterator[T]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((item, None))
+        except Exception as e:
+            await queue.put((None, e))
+        else:
+            await queue.put((_DONE, None))
+
+    tasks = [asyncio.ensure_future(drain(stream)) for stream in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
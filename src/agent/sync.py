@@ -0,0 +1,104 @@
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from api.cache import DEFAULT_CACHE_DIR
+from models.stats import WeeklyScore
+
+
+def scores_hash(scores: List[WeeklyScore]) -> str:
+    """Content hash of one week's scores, independent of team order."""
+    rows = sorted((s.team_key or '', s.team_name, s.points) for s in scores)
+    return hashlib.sha256(json.dumps(rows).encode()).hexdigest()
+
+
+@dataclasses.dataclass
+class LeagueSyncState:
+    """What is already known about one league's weekly scores.
+
+    ``last_completed_week`` is the newest week before the league's current
+    week that has been stored; weeks up to it are not fetched again.
+    """
+    league_key: str
+    last_completed_week: int = 0
+    week_hashes: Dict[int, str] = dataclasses.field(default_factory=dict)
+    scores: Dict[int, List[WeeklyScore]] = dataclasses.field(default_factory=dict)
+    synced_at: Optional[float] = None
+
+    def merge(self, week: int, scores: List[WeeklyScore]) -> bool:
+        """Store a week's scores; returns True if they differ from what was stored."""
+        digest = scores_hash(scores)
+        if self.week_hashes.get(week) == digest:
+            return False
+        self.week_hashes[week] = digest
+        self.scores[week] = list(scores)
+        return True
+
+    def to_dict(self) -> Dict:
+        return {
+            'league_key': self.league_key,
+            'last_completed_week': self.last_completed_week,
+            'week_hashes': {str(week): digest for week, digest in self.week_hashes.items()},
+            'scores': {
+                str(week): [dataclasses.asdict(score) for score in scores]
+                for week, scores in self.scores.items()
+            },
+            'synced_at': self.synced_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LeagueSyncState":
+        return cls(
+            league_key=data['league_key'],
+            last_completed_week=int(data.get('last_completed_week', 0)),
+            week_hashes={int(week): digest for week, digest in data.get('week_hashes', {}).items()},
+            scores={
+                int(week): [WeeklyScore(**score) for score in scores]
+                for week, scores in data.get('scores', {}).items()
+            },
+            synced_at=data.get('synced_at')
+        )
+
+
+class SyncStore:
+    """Persists a LeagueSyncState per league as a JSON file in ``directory``."""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR / 'sync'
+
+    def _path(self, league_key: str) -> Path:
+        return self.directory / f"{league_key}.json"
+
+    def load(self, league_key: str) -> LeagueSyncState:
+        """Return the stored state for a league, or an empty one if it was never synced."""
+        try:
+            with open(self._path(league_key), 'rb') as f:
+                return LeagueSyncState.from_dict(json.load(f))
+        except FileNotFoundError:
+            return LeagueSyncState(league_key)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable sync state for {league_key}: {e}")
+            return LeagueSyncState(league_key)
+
+    def save(self, state: LeagueSyncState) -> None:
+        """Write a league's state atomically (a crash never leaves a half-written file)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        state.synced_at = time.time()
+        path = self._path(state.league_key)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def clear(self, league_key: Optional[str] = None) -> None:
+        """Forget one league's state, or every league's if no key is given."""
+        paths = [self._path(league_key)] if league_key else self.directory.glob('*.json')
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
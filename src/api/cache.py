@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('FFT_CACHE_DIR', Path.home() / '.cache' / 'fantasy-football-treasurer')
+)
+
+
+class ResponseCache:
+    """SQLite-backed cache of raw Yahoo API response bodies keyed by endpoint.
+
+    Bodies are stored undecoded so the client's JSON decoder runs once per read.
+
+    Entries stored with ``ttl=None`` never expire; use that for data Yahoo
+    will not change again (closed weeks, finished seasons).
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        path = str(path) if path else str(DEFAULT_CACHE_DIR / 'responses.sqlite3')
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " endpoint TEXT PRIMARY KEY,"
+            " body BLOB NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL"
+            ")"
+        )
+        self._conn.commit()
+    
+    def get(self, endpoint: str) -> Optional[Union[bytes, str]]:
+        """Return the cached body for an endpoint, or None if missing or expired."""
+        row = self._conn.execute(
+            "SELECT body, expires_at FROM responses WHERE endpoint = ?", (endpoint,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return body
+    
+    def put(self, endpoint: str, body: bytes, ttl: Optional[float]) -> None:
+        """Store a raw body; ``ttl`` is in seconds, or None to keep it forever."""
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (endpoint, body, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (endpoint, body, now, expires_at)
+        )
+        self._conn.commit()
+    
+    def invalidate(self, prefix: str = '') -> None:
+        """Drop every entry whose endpoint starts with ``prefix`` (all entries by default)."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE substr(endpoint, 1, ?) = ?", (len(prefix), prefix)
+        )
+        self._conn.commit()
+    
+    def close(self) -> None:
+        self._conn.close()
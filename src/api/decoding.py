@@ -0,0 +1,39 @@
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+Decoder = Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_loads(body: Union[bytes, str]) -> Any:
+    return json.loads(body)
+
+
+def available_decoders() -> Dict[str, Decoder]:
+    """Return the JSON decoders installed in this environment, fastest first."""
+    decoders: Dict[str, Decoder] = {}
+    if orjson is not None:
+        decoders['orjson'] = orjson.loads
+    if msgspec is not None:
+        decoders['msgspec'] = msgspec.json.Decoder().decode
+    decoders['json'] = _stdlib_loads
+    return decoders
+
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """Return the named JSON decoder, or the fastest one installed when ``name`` is None."""
+    decoders = available_decoders()
+    if name is None:
+        return next(iter(decoders.values()))
+    if name not in decoders:
+        raise ValueError(f"JSON decoder '{name}' is not available (installed: {', '.join(decoders)})")
+    return decoders[name]
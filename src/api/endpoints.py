@@ -1,33 +1,194 @@
-from flask import Blueprint, jsonify
+import dataclasses
+import functools
+import hashlib
+import json
+
+from quart import Blueprint, Response, current_app, request
+
+from api.errors import NotFoundError, YahooAPIError
+from models.score_matrix import ScoreMatrix
 
 endpoints = Blueprint('endpoints', __name__)
 
+# Browsers and proxies may reuse a response this long before revalidating with the ETag
+CLIENT_MAX_AGE = 60
+# Regular season plus playoffs; anything outside would only waste upstream calls
+MAX_WEEK = 18
+
+
+def _agent():
+    return current_app.extensions['treasurer']
+
+
+def _league_key_of(team_key: str) -> str:
+    """``449.l.1.t.3`` -> ``449.l.1``"""
+    return team_key.rsplit('.t.', 1)[0]
+
+
+def _week(text: str) -> int:
+    week = int(text)
+    if not 1 <= week <= MAX_WEEK:
+        raise ValueError(f"week must be between 1 and {MAX_WEEK}, got {week}")
+    return week
+
+
+def _weeks_arg(default_last: int = 17) -> range:
+    """Parse ``?weeks=14`` or ``?weeks=3-14`` (default: the whole regular season)."""
+    text = request.args.get('weeks', str(default_last))
+    start, _, end = text.partition('-')
+    if not end:
+        start, end = '1', start
+    start, end = _week(start), _week(end)
+    if end < start:
+        raise ValueError(f"weeks range {text} ends before it starts")
+    return range(start, end + 1)
+
+
+def _required_arg(name: str) -> str:
+    value = request.args.get(name)
+    if not value:
+        raise ValueError(f"missing query parameter '{name}'")
+    return value
+
+
+def _json_response(body: bytes, status: int = 200) -> Response:
+    return Response(body, status=status, content_type='application/json')
+
+
+def cached_json(view):
+    """Serve a view's JSON result from the server-side cache, with an ETag.
+
+    The view returns a JSON-able object; its encoded body is cached under the
+    request path and query (for the app cache's ``max_age``), so concurrent
+    viewers of the same page share one set of upstream calls. Requests whose
+    ``If-None-Match`` still matches get a 304 with no body. There is no
+    ``Last-Modified``: the cache only knows when it stored a body, not when
+    Yahoo last changed the data.
+    """
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        cache = current_app.extensions['response_cache']
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = cache.get(key)
+        if entry is None:
+            body = json.dumps(await view(*args, **kwargs)).encode()
+            entry = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            cache.put(key, entry)
+        body, etag = entry
+
+        headers = {
+            'ETag': etag,
+            'Cache-Control': f'public, max-age={CLIENT_MAX_AGE}'
+        }
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        else:
+            not_modified = False
+
+        if not_modified:
+            return Response(b'', status=304, headers=headers)
+        response = _json_response(body)
+        response.headers.update(headers)
+        return response
+    return wrapper
+
+
+@endpoints.errorhandler(ValueError)
+async def bad_request(error):
+    return _json_response(json.dumps({'error': str(error)}).encode(), status=400)
+
+
+@endpoints.errorhandler(YahooAPIError)
+async def upstream_error(error):
+    status = 404 if isinstance(error, NotFoundError) else 502
+    return _json_response(json.dumps({'error': str(error), 'upstream_status': error.status}).encode(), status=status)
+
+
 @endpoints.route('/leagues/<league_id>', methods=['GET'])
-def get_league_info(league_id):
-    # Logic to retrieve league information
-    return jsonify({"league_id": league_id, "info": "League information here"})
+@cached_json
+async def get_league_info(league_id):
+    """League metadata; ``league_id`` is a full league key such as ``449.l.530952``."""
+    leagues = await _agent().get_leagues_info([league_id])
+    if not leagues:
+        raise NotFoundError("League not found", status=404, endpoint=league_id)
+    return leagues[0]
+
 
 @endpoints.route('/teams/<team_id>', methods=['GET'])
-def get_team_stats(team_id):
-    # Logic to retrieve team statistics
-    return jsonify({"team_id": team_id, "stats": "Team statistics here"})
+@cached_json
+async def get_team_stats(team_id):
+    """A team's profile and record; ``team_id`` is a full team key such as ``449.l.530952.t.3``."""
+    league_key = _league_key_of(team_id)
+    agent = _agent()
+    teams = await agent.get_all_teams_info(league_key)
+    team = next((team for team in teams if team.team_key == team_id), None)
+    if team is None:
+        raise NotFoundError("Team not found", status=404, endpoint=team_id)
+    standings = await agent.get_league_standings(league_key)
+    standing = next((row for row in standings if row.team_key == team_id), None)
+    return {
+        **dataclasses.asdict(team),
+        'standing': dataclasses.asdict(standing) if standing else None
+    }
+
 
 @endpoints.route('/players/<player_id>', methods=['GET'])
-def get_player_stats(player_id):
-    # Logic to retrieve player statistics
-    return jsonify({"player_id": player_id, "stats": "Player statistics here"})
+async def get_player_stats(player_id):
+    # Individual player stats are not fetched by the agent yet
+    return _json_response(json.dumps({'error': 'Player statistics are not available yet'}).encode(), status=501)
+
 
 @endpoints.route('/standings', methods=['GET'])
-def get_standings():
-    # Logic to retrieve league standings
-    return jsonify({"standings": "League standings here"})
+@cached_json
+async def get_standings():
+    """``/standings?league_key=449.l.530952``"""
+    league_key = _required_arg('league_key')
+    standings = await _agent().get_league_standings(league_key)
+    return {'league_key': league_key, 'standings': [dataclasses.asdict(row) for row in standings]}
+
 
 @endpoints.route('/matchups', methods=['GET'])
-def get_matchups():
-    # Logic to retrieve matchup information
-    return jsonify({"matchups": "Matchup information here"})
+@cached_json
+async def get_matchups():
+    """``/matchups?league_key=449.l.530952&week=3``: every team's score that week."""
+    league_key = _required_arg('league_key')
+    week = _week(_required_arg('week'))
+    scores = await _agent().get_weekly_scores(league_key, week)
+    return {'league_key': league_key, 'week': week, 'scores': [dataclasses.asdict(score) for score in scores]}
+
 
 @endpoints.route('/season_stats', methods=['GET'])
-def get_season_stats():
-    # Logic to retrieve season statistics
-    return jsonify({"season_stats": "Season statistics here"})
\ No newline at end of file
+@cached_json
+async def get_season_stats():
+    """``/season_stats?league_key=449.l.530952&weeks=1-14&prizes=20,10,5``
+
+    Points, weekly top-three finishes and (with ``prizes``) prize money per team.
+    """
+    league_key = _required_arg('league_key')
+    weeks = _weeks_arg()
+    prizes = [float(amount) for amount in request.args.get('prizes', '').split(',') if amount]
+
+    scores_by_week = await _agent().get_weekly_scores_many(league_key, weeks)
+    matrix = ScoreMatrix.from_weekly_scores(scores_by_week)
+    points = matrix.point_totals()
+    top = matrix.top_k(3)
+    finishes = {team: [0, 0, 0] for team in matrix.teams}
+    for place in range(top.shape[0]):
+        for row in top[place][top[place] >= 0]:
+            finishes[matrix.teams[row]][place] += 1
+    earnings = matrix.prize_totals(prizes) if prizes else {}
+    scored = matrix.weeks_with_scores()
+
+    teams = []
+    for team, name in zip(matrix.teams, matrix.names):
+        teams.append({
+            'team_key': team,
+            'name': name,
+            'points': round(points[team], 2),
+            'average': round(points[team] / len(scored), 2) if scored else 0.0,
+            'finishes': dict(zip(('first', 'second', 'third'), finishes[team])),
+            'earnings': earnings.get(team)
+        })
+    teams.sort(key=lambda row: row['points'], reverse=True)
+    return {'league_key': league_key, 'weeks': scored, 'teams': teams}
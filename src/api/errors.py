@@ -0,0 +1,68 @@
+from typing import Optional
+
+
+class YahooAPIError(Exception):
+    """A Yahoo Fantasy API request that failed (after any retries).
+
+    ``retryable`` marks failures that may succeed if the request is repeated.
+    """
+
+    retryable = False
+
+    def __init__(self, message: str, status: Optional[int] = None, endpoint: Optional[str] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        status = f" ({self.status})" if self.status else ''
+        endpoint = f" for {self.endpoint}" if self.endpoint else ''
+        return f"{super().__str__()}{status}{endpoint}"
+
+
+class AuthenticationError(YahooAPIError):
+    """401/403: the access token is missing, expired or lacks permission."""
+
+
+class NotFoundError(YahooAPIError):
+    """404 or an unknown resource key."""
+
+
+class RateLimitedError(YahooAPIError):
+    """429, or Yahoo's own 999 "Request denied" throttling response."""
+
+    retryable = True
+
+
+class ServerError(YahooAPIError):
+    """5xx from Yahoo."""
+
+    retryable = True
+
+
+class YahooConnectionError(YahooAPIError):
+    """The request never got a response (connection reset, timeout, DNS)."""
+
+    retryable = True
+
+
+# Yahoo answers throttled clients with a non-standard 999
+RATE_LIMIT_STATUSES = frozenset({429, 999})
+
+
+def error_for_status(status: int, message: str, endpoint: Optional[str] = None,
+                     retry_after: Optional[float] = None) -> YahooAPIError:
+    """Map an HTTP status to the matching YahooAPIError subclass."""
+    if status in RATE_LIMIT_STATUSES:
+        error_class = RateLimitedError
+    elif status >= 500:
+        error_class = ServerError
+    elif status in (401, 403):
+        error_class = AuthenticationError
+    elif status == 404:
+        error_class = NotFoundError
+    else:
+        error_class = YahooAPIError
+    return error_class(message, status=status, endpoint=endpoint, retry_after=retry_after)
@@ -0,0 +1,227 @@
+import bisect
+import contextlib
+import functools
+import inspect
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; spans a cache hit (~µs) to a slow Yahoo response (several seconds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_KEY_SEGMENT = re.compile(r'^\d+\.l\.\d+(\.t\.\d+)?$|^\d+\.p\.\d+$')
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse an endpoint to its route so histograms group by kind of request.
+
+    ``league/449.l.1/scoreboard;week=1,2?format=json`` -> ``league/{key}/scoreboard``
+    """
+    path = endpoint.split('?', 1)[0]
+    segments = []
+    for segment in path.strip('/').split('/'):
+        name, _, params = segment.partition(';')
+        if _KEY_SEGMENT.match(name):
+            name = '{key}'
+        elif params and '=' in params:
+            name = f"{name};{params.split('=', 1)[0]}"
+        segments.append(name)
+    return '/'.join(segments)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus layout) with min/max tracking."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """Latency histograms and counters for one run, keyed by metric name and labels.
+
+    Histograms (seconds unless the name says otherwise):
+        request_seconds{endpoint}      network time for a Yahoo request
+        rate_limit_wait_seconds        time spent waiting for a rate-limit token
+        decode_seconds{endpoint}       JSON decoding
+        method_seconds{method}         FantasyFootballTreasurer methods (inclusive)
+    Counters:
+        response_bytes{endpoint}, responses{endpoint,status},
+        cache_hits{endpoint}, cache_misses{endpoint}, retries{endpoint}
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Labels]:
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        self.observe_key(self._key(name, labels), value)
+
+    def observe_key(self, key: Tuple[str, Labels], value: float) -> None:
+        """``observe`` with a prebuilt key, for hot paths that record the same series repeatedly."""
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = self._key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_total(self, name: str) -> float:
+        return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        self.counters.clear()
+
+    def summary(self) -> str:
+        """Human-readable end-of-run report: slowest series first, then totals."""
+        lines = [f"{'metric':<44} {'count':>7} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for (name, labels), histogram in sorted(
+            self.histograms.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            label = ','.join(value for _, value in labels)
+            series = f"{name}{{{label}}}" if label else name
+            lines.append(
+                f"{series[:44]:<44} {histogram.count:>7} {histogram.total:>9.3f} "
+                f"{histogram.quantile(0.5) * 1e3:>9.2f} {histogram.quantile(0.95) * 1e3:>9.2f} "
+                f"{histogram.max * 1e3:>9.2f}"
+            )
+        hits, misses = self.counter_total('cache_hits'), self.counter_total('cache_misses')
+        lookups = hits + misses
+        lines.append(
+            f"requests: {int(self.counter_total('responses'))}  "
+            f"bytes: {int(self.counter_total('response_bytes')):,}  "
+            f"cache hits: {int(hits)}/{int(lookups)}"
+            f"{f' ({hits / lookups:.0%})' if lookups else ''}  "
+            f"retries: {int(self.counter_total('retries'))}"
+        )
+        return '\n'.join(lines)
+
+    def prometheus(self, prefix: str = 'fft_') -> str:
+        """Prometheus text exposition format (e.g. for node_exporter's textfile collector)."""
+        def render_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = f"{prefix}{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{render_labels(labels)} {value:g}")
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            metric = f"{prefix}{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, bucket_count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                lines.append(f"{metric}_bucket{render_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{metric}_sum{render_labels(labels)} {histogram.total:.6f}")
+            lines.append(f"{metric}_count{render_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def instrumented(cls=None, *, skip: Sequence[str] = ()):
+    """Class decorator timing every method into ``self.metrics`` as ``method_seconds``.
+
+    Times are inclusive: a method's time covers the methods and requests it
+    awaits; an async generator is timed until it is exhausted or closed.
+    Methods named in ``skip`` are left alone.
+    """
+    def wrap(name, method):
+        key = ('method_seconds', (('method', name),))
+
+        if inspect.isasyncgenfunction(method):
+            @functools.wraps(method)
+            async def timed_stream(self, *args, **kwargs):
+                start = time.perf_counter()
+                stream = method(self, *args, **kwargs)
+                try:
+                    async for item in stream:
+                        yield item
+                finally:
+                    await stream.aclose()
+                    self.metrics.observe_key(key, time.perf_counter() - start)
+            return timed_stream
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed_async(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await method(self, *args, **kwargs)
+                finally:
+                    self.metrics.observe_key(key, time.perf_counter() - start)
+            return timed_async
+
+        @functools.wraps(method)
+        def timed(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics.observe_key(key, time.perf_counter() - start)
+        return timed
+
+    def decorate(cls):
+        for name, attribute in list(vars(cls).items()):
+            if inspect.isfunction(attribute) and not name.startswith('__') and name not in skip:
+                setattr(cls, name, wrap(name, attribute))
+        return cls
+
+    return decorate(cls) if cls is not None else decorate
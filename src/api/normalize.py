@@ -0,0 +1,75 @@
+"""Single-pass helpers for Yahoo Fantasy's JSON envelopes.
+
+Yahoo wraps collections as ``{"0": {...}, "1": {...}, "count": N}`` (or
+occasionally a plain list), and a resource such as a team or player as a list
+mixing metadata lists (``[{"team_key": ...}, {"name": ...}, [], ...]``) with
+sub-resource dicts (``{"team_points": ...}``). These helpers walk those shapes
+lazily, without copying collections into intermediate lists.
+"""
+from typing import Any, Dict, Iterator, Optional
+
+
+def content(payload: Optional[Dict[str, Any]], key: str) -> Any:
+    """Return ``fantasy_content[key]`` from a raw payload, or None."""
+    if not isinstance(payload, dict):
+        return None
+    fantasy_content = payload.get('fantasy_content')
+    if not isinstance(fantasy_content, dict):
+        return None
+    return fantasy_content.get(key)
+
+
+def iter_collection(collection: Any, item_key: str) -> Iterator[Any]:
+    """Yield the ``item_key`` entry of every member of a Yahoo collection."""
+    if isinstance(collection, dict):
+        members = collection.values()
+    elif isinstance(collection, list):
+        members = collection
+    else:
+        return
+    for member in members:
+        # The "count" member is an int and is skipped here
+        if isinstance(member, dict) and item_key in member:
+            yield member[item_key]
+
+
+def child(node: Any, key: str) -> Any:
+    """Return sub-resource ``key`` whether ``node`` is a dict, a ``{"0": {...}}`` wrapper or a list."""
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        wrapped = node.get('0')
+        if isinstance(wrapped, dict):
+            return wrapped.get(key)
+    elif isinstance(node, list):
+        for item in node:
+            if isinstance(item, dict) and key in item:
+                return item[key]
+            if isinstance(item, list):
+                found = child(item, key)
+                if found is not None:
+                    return found
+    return None
+
+
+def flatten(resource: Any) -> Dict[str, Any]:
+    """Merge a resource's metadata lists and sub-resource dicts into one flat dict.
+
+    Later keys win, matching the order Yahoo lists them in.
+    """
+    flat: Dict[str, Any] = {}
+    _merge_into(resource, flat)
+    return flat
+
+
+def _merge_into(node: Any, flat: Dict[str, Any]) -> None:
+    if isinstance(node, dict):
+        flat.update(node)
+    elif isinstance(node, list):
+        for item in node:
+            _merge_into(item, flat)
+
+
+def first_manager(managers: Any) -> Dict[str, Any]:
+    """Return the first manager of a team's ``managers`` collection, or an empty dict."""
+    return next(iter_collection(managers, 'manager'), {})
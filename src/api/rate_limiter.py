@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter shared by all concurrent callers.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``; each
+    request consumes one token and waits only as long as needed for the next.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (e.g. after the server says to back off)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        # Waiters queue on the lock, so tokens are handed out in FIFO order.
+        async with self._lock:
+            paused_for = self._paused_until - time.monotonic()
+            if paused_for > 0:
+                await asyncio.sleep(paused_for)
+                # Resume with one token rather than a full burst
+                self._tokens = min(self._tokens, 1.0)
+                self._updated = time.monotonic()
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,160 @@
+"""Record Yahoo responses to a fixture directory and replay them from a local server.
+
+Record by giving the client a ``record_dir``; every successful response body
+is written there, one file per endpoint. ``ReplayServer`` then serves those
+files over HTTP so a client pointed at ``server.url`` (via ``base_url``)
+runs with no network, optionally with injected latency and 429 responses:
+
+    async with ReplayServer('fixtures/', latency=0.2, error_rate=0.05) as server:
+        async with YahooFantasyClient('token', base_url=server.url) as client:
+            ...
+
+It can also run standalone: ``python src/api/replay.py fixtures/ --latency 0.2``.
+"""
+import asyncio
+import hashlib
+import random
+import re
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import unquote
+
+from aiohttp import web
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def fixture_name(endpoint: str) -> str:
+    """File name for an endpoint: readable prefix plus a hash so names never collide."""
+    endpoint = unquote(endpoint).lstrip('/')
+    digest = hashlib.sha1(endpoint.encode()).hexdigest()[:12]
+    return f"{_UNSAFE.sub('_', endpoint)[:100]}-{digest}.json"
+
+
+class FixtureStore:
+    """Raw response bodies kept as files in ``directory``, keyed by endpoint."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def save(self, endpoint: str, body: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / fixture_name(endpoint)).write_bytes(body)
+
+    def load(self, endpoint: str) -> Optional[bytes]:
+        try:
+            return (self.directory / fixture_name(endpoint)).read_bytes()
+        except FileNotFoundError:
+            return None
+
+
+class ReplayServer:
+    """Local aiohttp server that answers Yahoo API requests from recorded fixtures.
+
+    ``latency`` (plus up to ``jitter``) seconds is added to every response and
+    a fraction ``error_rate`` of requests get a 429 with ``Retry-After``.
+    ``seed`` makes the injected faults reproducible. Endpoints with no fixture
+    get a 404. ``requests``, ``throttled`` and ``max_in_flight`` count what the
+    client actually did.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: Union[str, Path],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ):
+        self.fixtures = FixtureStore(fixture_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._host = host
+        self._port = port
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self) -> "ReplayServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> str:
+        """Start listening and return the base URL to give the client."""
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{self._host}:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if delay:
+                await asyncio.sleep(delay)
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.throttled += 1
+                return web.json_response(
+                    {'error': {'description': 'Request denied (injected)'}},
+                    status=429, headers={'Retry-After': str(self.retry_after)}
+                )
+
+            body = self.fixtures.load(request.raw_path)
+            if body is None:
+                return web.json_response(
+                    {'error': {'description': f'No fixture recorded for {request.raw_path}'}}, status=404
+                )
+            return web.Response(body=body, content_type='application/json')
+        finally:
+            self.in_flight -= 1
+
+
+async def _serve(args) -> None:
+    server = ReplayServer(args.fixture_dir, args.latency, args.jitter, args.error_rate,
+                          seed=args.seed, port=args.port)
+    print(f"Replaying {args.fixture_dir} at {await server.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded Yahoo API fixtures")
+    parser.add_argument('fixture_dir')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
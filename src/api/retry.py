@@ -0,0 +1,84 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class RetryPolicy:
+    """How often and how long to back off before repeating a failed request.
+
+    Delays use "full jitter" exponential backoff: a random wait between 0 and
+    ``base_delay * 2**attempt`` (capped at ``max_delay``), so concurrent
+    callers that failed together do not retry together. A server-supplied
+    ``Retry-After`` is always honoured, up to ``max_retry_after``.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+                 max_retry_after: float = 120.0, rng: Optional[random.Random] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self._random = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0 for the first retry)."""
+        backoff = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+
+class RetryBudget:
+    """Caps how many retries may be spent in a burst, refilling over time.
+
+    Up to ``max_retries`` retries are available at once; spent retries come
+    back at ``refill_per_second``. While the budget is empty, failures are
+    raised immediately instead of piling more load onto an API that is
+    already refusing requests, but a long-running process (the API server)
+    retries again once Yahoo has recovered.
+    """
+
+    def __init__(self, max_retries: int = 100, refill_per_second: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_retries = max_retries
+        self.refill_per_second = refill_per_second
+        self.used = 0
+        self._clock = clock
+        self._tokens = float(max_retries)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.max_retries, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def remaining(self) -> int:
+        self._refill()
+        return int(self._tokens)
+
+    def spend(self) -> bool:
+        """Take one retry from the budget; False if none are left right now."""
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.used += 1
+        return True
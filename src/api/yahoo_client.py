@@ -1,5 +1,20 @@
+import asyncio
+import re
+import time
 import aiohttp
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable
+from api.cache import ResponseCache
+from api.decoding import Decoder, get_decoder
+from api.errors import RateLimitedError, YahooAPIError, YahooConnectionError, error_for_status
+from api.metrics import Metrics, endpoint_label
+from api.rate_limiter import TokenBucket
+from api.replay import FixtureStore
+from api.retry import RetryBudget, RetryPolicy, parse_retry_after
+from api.singleflight import SingleFlight
+
+_SCOREBOARD_WEEKS = re.compile(r'scoreboard;week=([\d,]+)')
+# Resources of whoever is logged in; the cache is shared by every account that uses it
+_LOGGED_IN_USER = 'users;use_login=1'
 
 
 class YahooFantasyClient:
@@ -7,77 +22,262 @@ class YahooFantasyClient:
     
     BASE_URL = "https://fantasysports.yahooapis.com/fantasy/v2"
     
-    def __init__(self, access_token: str):
+    # How long responses that may still change (current week, open leagues) stay cached
+    LIVE_CACHE_TTL = 300
+    
+    def __init__(
+        self,
+        access_token: Optional[str],
+        pool_size: int = 20,
+        keepalive_timeout: float = 30.0,
+        base_url: Optional[str] = None,
+        requests_per_second: Optional[float] = 3.0,
+        burst: int = 6,
+        cache: Optional[ResponseCache] = None,
+        decoder: Optional[Decoder] = None,
+        record_dir: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        token_provider: Optional[Callable[[], Awaitable[str]]] = None
+    ):
         self._access_token = access_token
         self._headers = {
             'Authorization': f'Bearer {access_token}',
             'Accept': 'application/json'
         }
+        # Asked for the token before every request (e.g. YahooOAuth.get_access_token,
+        # which refreshes it before it expires); overrides ``access_token``
+        self._token_provider = token_provider
+        self._base_url = (base_url or self.BASE_URL).rstrip('/')
+        self._pool_size = pool_size
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        # One bucket per client so every concurrent caller shares the budget
+        self._rate_limiter = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self._cache = cache
+        # orjson/msgspec when installed, stdlib json otherwise
+        self._decode = decoder or get_decoder()
+        # Successful responses are written here for api.replay.ReplayServer
+        self._recorder = FixtureStore(record_dir) if record_dir else None
+        # Latency histograms, byte and cache counters for the whole run
+        self.metrics = metrics if metrics is not None else Metrics()
+        # 429/5xx/connection failures are retried with backoff, up to a budget per client
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget or RetryBudget()
+        # Concurrent requests for the same endpoint share one network call
+        self._in_flight = SingleFlight()
+    
+    async def __aenter__(self) -> "YahooFantasyClient":
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
     
-    async def _request(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Make authenticated request to Yahoo API."""
-        url = f"{self.BASE_URL}/{endpoint}"
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                limit_per_host=self._pool_size,
+                keepalive_timeout=self._keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _request(self, endpoint: str) -> Dict[str, Any]:
+        """Make authenticated request to Yahoo API.
+
+        Raises a ``YahooAPIError`` subclass if the request fails; retryable
+        failures are retried per ``retry_policy`` while ``retry_budget`` lasts.
+        Callers asking for an endpoint that is already being fetched wait for
+        that request instead of sending another, and share its decoded result.
+        """
+        metrics = self.metrics
+        label = endpoint_label(endpoint)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self._headers) as response:
-                if response.status == 200:
-                    return await response.json()
+        if self._cache is not None and not endpoint.startswith(_LOGGED_IN_USER):
+            cached = self._cache.get(endpoint)
+            if cached is not None:
+                metrics.increment('cache_hits', endpoint=label)
+                if self._recorder is not None:
+                    self._recorder.save(endpoint, cached)
+                with metrics.timer('decode_seconds', endpoint=label):
+                    return self._decode(cached)
+            metrics.increment('cache_misses', endpoint=label)
+        
+        if endpoint in self._in_flight:
+            metrics.increment('coalesced_requests', endpoint=label)
+        return await self._in_flight.do(endpoint, lambda: self._request_with_retries(endpoint, label))
+    
+    async def _request_with_retries(self, endpoint: str, label: str) -> Dict[str, Any]:
+        """Fetch ``endpoint``, retrying per ``retry_policy`` while ``retry_budget`` lasts."""
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            try:
+                return await self._fetch(endpoint, label)
+            except YahooAPIError as error:
+                if (not error.retryable or attempt + 1 >= self.retry_policy.max_attempts
+                        or not self.retry_budget.spend()):
+                    raise
+                delay = self.retry_policy.delay(attempt, error.retry_after)
+                metrics.increment('retries', endpoint=label)
+                if isinstance(error, RateLimitedError) and self._rate_limiter is not None:
+                    # Throttling applies to the whole client, so every caller backs off
+                    self._rate_limiter.pause(delay)
                 else:
-                    error = await response.text()
-                    print(f"API Error ({response.status}): {error}")
+                    await asyncio.sleep(delay)
+                attempt += 1
+    
+    async def _auth_headers(self) -> Dict[str, str]:
+        """Request headers carrying the current access token."""
+        if self._token_provider is not None:
+            token = await self._token_provider()
+            if token != self._access_token:
+                self._access_token = token
+                self._headers = {**self._headers, 'Authorization': f'Bearer {token}'}
+        return self._headers
+    
+    async def _fetch(self, endpoint: str, label: str) -> Dict[str, Any]:
+        """Send one GET; returns the decoded body or raises the matching YahooAPIError."""
+        metrics = self.metrics
+        url = f"{self._base_url}/{endpoint}"
+        session = self._get_session()
+        headers = await self._auth_headers()
+        
+        if self._rate_limiter is not None:
+            with metrics.timer('rate_limit_wait_seconds'):
+                await self._rate_limiter.acquire()
+        
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers) as response:
+                body = await response.read()
+                status = response.status
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            metrics.increment('connection_errors', endpoint=label)
+            raise YahooConnectionError(f"Request failed: {e!r}", endpoint=endpoint) from e
+        metrics.observe('request_seconds', time.perf_counter() - start, endpoint=label)
+        metrics.increment('responses', endpoint=label, status=str(status))
+        metrics.increment('response_bytes', len(body), endpoint=label)
+        
+        if status != 200:
+            raise error_for_status(status, self._error_message(body), endpoint, retry_after)
+        
+        with metrics.timer('decode_seconds', endpoint=label):
+            data = self._decode(body)
+        if self._recorder is not None:
+            self._recorder.save(endpoint, body)
+        if self._cache is not None and not endpoint.startswith(_LOGGED_IN_USER):
+            self._cache.put(endpoint, body, self._cache_ttl(endpoint, data))
+        return data
+    
+    def _error_message(self, body: bytes) -> str:
+        """Yahoo's error description from an error body, or the raw text."""
+        try:
+            error = self._decode(body).get('error', {})
+            return error.get('description') or str(error)
+        except Exception:  # not JSON; each decoder raises its own error type
+            return body.decode('utf-8', errors='replace')[:200] or 'Yahoo API error'
+    
+    def _cache_ttl(self, endpoint: str, data: Dict[str, Any]) -> Optional[float]:
+        """Return how long a response may be cached; None means it never changes."""
+        league = data.get('fantasy_content', {}).get('league')
+        if isinstance(league, list) and league and isinstance(league[0], dict):
+            meta = league[0]
+            # Nothing in a finished season changes again
+            if str(meta.get('is_finished', '0')) == '1':
+                return None
+            # Scoreboards for weeks before the current week are closed
+            match = _SCOREBOARD_WEEKS.search(endpoint)
+            current_week = meta.get('current_week')
+            if match and current_week:
+                weeks = [int(w) for w in match.group(1).split(',') if w]
+                if weeks and max(weeks) < int(current_week):
                     return None
+        return self.LIVE_CACHE_TTL
     
-    async def get_user_leagues(self, game_key: str = "nfl") -> Optional[List[Dict]]:
+    async def get_user_leagues(self, game_key: str = "nfl") -> Dict:
         """Get all leagues for the authenticated user."""
         endpoint = f"users;use_login=1/games;game_keys={game_key}/leagues?format=json"
         return await self._request(endpoint)
     
-    async def get_all_nfl_games(self) -> Optional[Dict]:
+    async def get_all_nfl_games(self) -> Dict:
         """Get all NFL fantasy games (to discover game keys)."""
         endpoint = "users;use_login=1/games;game_codes=nfl?format=json"
         return await self._request(endpoint)
     
-    async def get_leagues_by_season(self, season: int) -> Optional[List[Dict]]:
+    async def get_leagues_by_season(self, season: int) -> Dict:
         """Get leagues for a specific season."""
         game_key = self._get_game_key(season)
         endpoint = f"users;use_login=1/games;game_keys={game_key}/leagues?format=json"
         return await self._request(endpoint)
     
-    async def get_league_info(self, league_key: str) -> Optional[Dict]:
+    async def get_leagues_by_game_keys(self, game_keys: List[str]) -> Dict:
+        """Get the user's leagues for several seasons in one call."""
+        endpoint = f"users;use_login=1/games;game_keys={','.join(game_keys)}/leagues?format=json"
+        return await self._request(endpoint)
+    
+    async def get_league_info(self, league_key: str) -> Dict:
         """Get league information."""
         endpoint = f"league/{league_key}?format=json"
         return await self._request(endpoint)
     
-    async def get_league_standings(self, league_key: str) -> Optional[Dict]:
+    async def get_league_standings(self, league_key: str) -> Dict:
         """Get league standings."""
         endpoint = f"league/{league_key}/standings?format=json"
         return await self._request(endpoint)
     
-    async def get_league_scoreboard(self, league_key: str, week: int) -> Optional[Dict]:
+    async def get_league_scoreboard(self, league_key: str, week: int) -> Dict:
         """Get scoreboard for a specific week."""
         endpoint = f"league/{league_key}/scoreboard;week={week}?format=json"
         return await self._request(endpoint)
     
-    async def get_all_teams(self, league_key: str) -> Optional[Dict]:
+    async def get_league_scoreboards(self, league_key: str, weeks: List[int]) -> Dict:
+        """Get scoreboards for several weeks in one call (``scoreboard;week=1,2,3``)."""
+        week_list = ",".join(str(week) for week in weeks)
+        endpoint = f"league/{league_key}/scoreboard;week={week_list}?format=json"
+        return await self._request(endpoint)
+    
+    async def get_leagues(self, league_keys: List[str]) -> Dict:
+        """Get several leagues in one call via the ``leagues;league_keys=`` collection."""
+        endpoint = f"leagues;league_keys={','.join(league_keys)}?format=json"
+        return await self._request(endpoint)
+    
+    async def get_all_teams(self, league_key: str) -> Dict:
         """Get all teams in a league."""
         endpoint = f"league/{league_key}/teams?format=json"
         return await self._request(endpoint)
     
-    async def get_team_stats(self, team_key: str, week: int) -> Optional[Dict]:
+    async def get_team_stats(self, team_key: str, week: int) -> Dict:
         """Get team stats for a specific week."""
         endpoint = f"team/{team_key}/stats;type=week;week={week}?format=json"
         return await self._request(endpoint)
     
-    async def get_matchups(self, league_key: str, week: int) -> Optional[Dict]:
+    async def get_matchups(self, league_key: str, week: int) -> Dict:
         """Get matchups for a specific week."""
         endpoint = f"league/{league_key}/scoreboard;week={week}?format=json"
         return await self._request(endpoint)
     
-    async def get_team_roster(self, team_key: str) -> Optional[Dict]:
+    async def get_team_roster(self, team_key: str) -> Dict:
         """Get roster for a specific team."""
         endpoint = f"team/{team_key}/roster?format=json"
         return await self._request(endpoint)
     
+    async def get_team_rosters(self, team_keys: List[str]) -> Dict:
+        """Get rosters for several teams in one call via the ``teams;team_keys=`` collection."""
+        endpoint = f"teams;team_keys={','.join(team_keys)}/roster?format=json"
+        return await self._request(endpoint)
+    
     def _get_game_key(self, season: int) -> str:
         """Get Yahoo game key for NFL season."""
         # Yahoo Fantasy NFL game keys by season
@@ -1,25 +1,124 @@
+import asyncio
 import aiohttp
 import webbrowser
 import base64
 from urllib.parse import urlencode
-from typing import Optional
+from typing import Dict, Optional
+from api.errors import AuthenticationError
+from auth.token_store import OAuthToken, TokenStore
 
 
 class YahooOAuth:
-    """Handle Yahoo OAuth2 authentication without storing credentials."""
+    """Handle Yahoo OAuth2 authentication.
+
+    Credentials and tokens are held in memory only, unless a ``token_store``
+    is given: then the session (including the refresh token) is saved there
+    and later runs refresh it instead of repeating the browser login.
+    """
     
     AUTH_URL = "https://api.login.yahoo.com/oauth2/request_auth"
     TOKEN_URL = "https://api.login.yahoo.com/oauth2/get_token"
     REDIRECT_URI = "https://localhost/callback"
     
-    def __init__(self, client_id: str, client_secret: str, user_email: Optional[str] = None):
+    # Refresh this long before the access token (valid for an hour) expires
+    REFRESH_MARGIN = 120
+    
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        user_email: Optional[str] = None,
+        token_store: Optional[TokenStore] = None,
+        token: Optional[OAuthToken] = None
+    ):
         self._client_id = client_id
         self._client_secret = client_secret
         self._user_email = user_email
-        self._access_token = None
+        self._token_store = token_store
+        self._token = token
+        # Parallel requests that find the token expiring wait for one refresh
+        self._refresh_lock = asyncio.Lock()
+    
+    @classmethod
+    def from_store(cls, token_store: TokenStore) -> Optional["YahooOAuth"]:
+        """Resume a saved session, or None if nothing usable is saved."""
+        session = token_store.load()
+        if not session or not session.get('token'):
+            return None
+        return cls(
+            client_id=session['client_id'],
+            client_secret=session['client_secret'],
+            user_email=session.get('user_email'),
+            token_store=token_store,
+            token=OAuthToken.from_dict(session['token'])
+        )
+    
+    @property
+    def token(self) -> Optional[OAuthToken]:
+        return self._token
+    
+    @property
+    def _access_token(self) -> Optional[str]:
+        return self._token.access_token if self._token else None
+    
+    def save(self, token_store: Optional[TokenStore] = None) -> None:
+        """Persist the session to ``token_store`` (and keep saving refreshed tokens there)."""
+        if token_store is not None:
+            self._token_store = token_store
+        if self._token_store is None or self._token is None:
+            return
+        self._token_store.save({
+            'client_id': self._client_id,
+            'client_secret': self._client_secret,
+            'user_email': self._user_email,
+            'token': self._token.to_dict()
+        })
+    
+    async def get_access_token(self) -> str:
+        """Return a valid access token, refreshing it first if it is about to expire.
+        
+        Safe to call from many tasks at once: only one of them refreshes.
+        Raises AuthenticationError if there is no token or the refresh fails.
+        """
+        token = self._token
+        if token is not None and not token.expires_within(self.REFRESH_MARGIN):
+            return token.access_token
+        async with self._refresh_lock:
+            # Another task may have refreshed while this one waited for the lock
+            if self._token is not None and not self._token.expires_within(self.REFRESH_MARGIN):
+                return self._token.access_token
+            await self.refresh()
+            return self._token.access_token
+    
+    async def refresh(self) -> OAuthToken:
+        """Exchange the refresh token for a new access token."""
+        if self._token is None or not self._token.refresh_token:
+            raise AuthenticationError("No refresh token; sign in again")
+        status, body = await self._token_request({
+            'grant_type': 'refresh_token',
+            'refresh_token': self._token.refresh_token,
+            'redirect_uri': self.REDIRECT_URI
+        })
+        if status != 200:
+            if status in (400, 401):
+                # The refresh token was revoked or has expired; a saved copy is useless now
+                if self._token_store is not None:
+                    self._token_store.clear()
+            raise AuthenticationError(f"Token refresh failed: {body.get('error_description') or body}",
+                                      status=status, endpoint=self.TOKEN_URL)
+        self._token = OAuthToken.from_response(body, previous=self._token)
+        self.save()
+        return self._token
     
     async def authenticate(self) -> Optional[str]:
-        """Perform OAuth2 authentication flow."""
+        """Return an access token, from the saved session if possible or else the browser flow."""
+        if self._token is not None:
+            try:
+                return await self.get_access_token()
+            except AuthenticationError as e:
+                print(f"\n⚠️  Saved session could not be refreshed ({e}); signing in again.")
+                self._token = None
+        
         params = {
             'client_id': self._client_id,
             'redirect_uri': self.REDIRECT_URI,
@@ -58,11 +157,41 @@ class YahooOAuth:
         
         print("\n🔄 Exchanging code for access token...")
         
-        self._access_token = await self._exchange_code(auth_code)
+        self._token = await self._exchange_code(auth_code)
+        self.save()
         return self._access_token
     
-    async def _exchange_code(self, code: str) -> Optional[str]:
-        """Exchange authorization code for access token."""
+    async def _exchange_code(self, code: str) -> Optional[OAuthToken]:
+        """Exchange authorization code for an access token (with its refresh token and expiry)."""
+        data = {
+            'grant_type': 'authorization_code',
+            'code': code,
+            'redirect_uri': self.REDIRECT_URI
+        }
+        
+        try:
+            status, body = await self._token_request(data)
+        except AuthenticationError as e:
+            print(f"\n❌ Error during token exchange: {e}")
+            return None
+        
+        if status == 200:
+            return OAuthToken.from_response(body)
+        
+        print(f"\n❌ Token exchange failed!")
+        print(f"   Status: {status}")
+        print(f"   Response: {body}")
+        
+        error = str(body.get('error', ''))
+        if 'invalid_grant' in error:
+            print("\n   Hint: The authorization code may have expired. Try again.")
+        elif 'invalid_client' in error:
+            print("\n   Hint: Check your Client ID and Client Secret.")
+        
+        return None
+    
+    async def _token_request(self, data: Dict[str, str]) -> tuple:
+        """POST to the token endpoint; returns (status, decoded body)."""
         credentials = f"{self._client_id}:{self._client_secret}"
         encoded_credentials = base64.b64encode(credentials.encode()).decode()
         
@@ -71,38 +200,22 @@ class YahooOAuth:
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         
-        data = {
-            'grant_type': 'authorization_code',
-            'code': code,
-            'redirect_uri': self.REDIRECT_URI
-        }
-        
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(self.TOKEN_URL, headers=headers, data=data) as response:
-                    response_text = await response.text()
-                    
-                    if response.status == 200:
-                        token_data = await response.json()
-                        return token_data.get('access_token')
-                    else:
-                        print(f"\n❌ Token exchange failed!")
-                        print(f"   Status: {response.status}")
-                        print(f"   Response: {response_text}")
-                        
-                        if 'invalid_grant' in response_text:
-                            print("\n   Hint: The authorization code may have expired. Try again.")
-                        elif 'invalid_client' in response_text:
-                            print("\n   Hint: Check your Client ID and Client Secret.")
-                        
-                        return None
-        except Exception as e:
-            print(f"\n❌ Error during token exchange: {e}")
-            return None
+                    text = await response.text()
+                    try:
+                        body = await response.json(content_type=None)
+                    except ValueError:
+                        body = {'error': text}
+                    return response.status, body if isinstance(body, dict) else {'error': text}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise AuthenticationError(f"Could not reach the Yahoo token endpoint: {e!r}",
+                                      endpoint=self.TOKEN_URL) from e
     
     def clear_credentials(self):
         """Clear credentials from memory."""
         self._client_id = None
         self._client_secret = None
         self._user_email = None
-        self._access_token = None
\ No newline at end of file
+        self._token = None
\ No newline at end of file
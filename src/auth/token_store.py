@@ -0,0 +1,110 @@
+import dataclasses
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from api.cache import DEFAULT_CACHE_DIR
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover - optional dependency
+    Fernet = None
+    InvalidToken = ValueError
+
+
+@dataclasses.dataclass
+class OAuthToken:
+    """An OAuth2 access token with the refresh token and expiry Yahoo issued with it."""
+    access_token: str
+    refresh_token: Optional[str] = None
+    expires_at: Optional[float] = None
+    token_type: str = 'bearer'
+
+    def expires_within(self, seconds: float) -> bool:
+        """True if the token is already expired or will be within ``seconds``."""
+        return self.expires_at is not None and self.expires_at - seconds <= time.time()
+
+    @classmethod
+    def from_response(cls, data: Dict, previous: Optional["OAuthToken"] = None) -> "OAuthToken":
+        """Build a token from a token-endpoint response.
+
+        A refresh response may omit ``refresh_token``; the previous one stays valid then.
+        """
+        expires_in = data.get('expires_in')
+        return cls(
+            access_token=data['access_token'],
+            refresh_token=data.get('refresh_token') or (previous.refresh_token if previous else None),
+            expires_at=time.time() + float(expires_in) if expires_in else None,
+            token_type=data.get('token_type', 'bearer')
+        )
+
+    def to_dict(self) -> Dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OAuthToken":
+        return cls(**{field.name: data[field.name] for field in dataclasses.fields(cls) if field.name in data})
+
+
+class TokenStore:
+    """Keeps a signed-in OAuth session in a local file so later runs skip the browser login.
+
+    The file holds the refresh token and the app's client credentials (needed
+    to refresh), so it is written readable by the owner only. With a Fernet
+    ``key`` (or ``FFT_TOKEN_KEY`` in the environment) it is also encrypted;
+    that needs the optional ``cryptography`` package.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, key: Optional[Union[str, bytes]] = None):
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / 'oauth_session.json'
+        key = key or os.environ.get('FFT_TOKEN_KEY')
+        if key and Fernet is None:
+            raise RuntimeError("Encrypting the token store needs the 'cryptography' package")
+        self._fernet = Fernet(key) if key else None
+
+    @property
+    def encrypted(self) -> bool:
+        return self._fernet is not None
+
+    @staticmethod
+    def generate_key() -> str:
+        """A new random key for ``FFT_TOKEN_KEY``."""
+        if Fernet is None:
+            raise RuntimeError("Generating a token key needs the 'cryptography' package")
+        return Fernet.generate_key().decode()
+
+    def load(self) -> Optional[Dict]:
+        """Return the saved session, or None if there is none (or it cannot be read)."""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            if self._fernet is not None:
+                data = self._fernet.decrypt(data)
+            return json.loads(data)
+        except (InvalidToken, ValueError) as e:
+            print(f"Ignoring unreadable OAuth session in {self.path}: {e!r}")
+            return None
+
+    def save(self, session: Dict) -> None:
+        """Write the session atomically, readable by the current user only."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(session).encode()
+        if self._fernet is not None:
+            data = self._fernet.encrypt(data)
+        tmp_path = self.path.with_suffix('.tmp')
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Forget the saved session (sign out)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,291 @@
+"""Non-interactive command line for scheduled treasurer runs and reports.
+
+Examples:
+    python src/cli.py leagues
+    python src/cli.py treasurer --league-key 449.l.530952 --weeks 1-14 --prizes 20 10 5
+    python src/cli.py treasurer --league-name office --seasons 2021-2025 --weeks 14 \\
+        --prizes 20 10 5 --format json --output earnings.json
+    python src/cli.py standings --league-key 449.l.530952
+    python src/cli.py ingest --seasons 2015-2025
+    python src/cli.py --offline treasurer --seasons 2015-2025 --weeks 14 --prizes 20 10 5
+
+The Yahoo access token comes from --access-token or the YAHOO_ACCESS_TOKEN
+environment variable (a .env file in the working directory is loaded). Without
+either, the session saved by `python src/main.py` ("stay signed in") is used and
+refreshed as needed, so long scheduled runs outlive the one-hour token.
+With --offline, reports read the local warehouse filled by `ingest` instead.
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import sys
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from api.cache import ResponseCache
+from api.errors import YahooAPIError
+from api.metrics import Metrics
+from api.yahoo_client import YahooFantasyClient
+from auth.oauth import YahooOAuth
+from auth.token_store import TokenStore
+from agent.agent import FantasyFootballTreasurer
+from agent.owners import OwnerIndex
+from agent.sync import SyncStore
+from main import (aggregate_owner_earnings, owner_name, parse_season_range, print_owner_leaderboard,
+                  print_standings)
+from storage.warehouse import Warehouse, ingest_leagues
+
+
+def parse_weeks(text: str) -> range:
+    """Parse '14' (weeks 1-14) or '3-14' into a range of weeks."""
+    start, _, end = text.partition('-')
+    if not end:
+        start, end = '1', start
+    weeks = range(int(start), int(end) + 1)
+    if not weeks or weeks.start < 1:
+        raise argparse.ArgumentTypeError(f"invalid week range: {text}")
+    return weeks
+
+
+def _season_range(text: str) -> tuple:
+    try:
+        return parse_season_range(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid season range: {text}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Fantasy Football Treasurer - non-interactive reports",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('\n\n', 1)[1]
+    )
+    parser.add_argument('--access-token', default=None,
+                        help="Yahoo OAuth access token (default: $YAHOO_ACCESS_TOKEN)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="bypass the on-disk response cache and stored score history")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('-o', '--output', default=None, help="write the report to this file instead of stdout")
+    parser.add_argument('--offline', action='store_true', help="report from the local warehouse; no API calls")
+    parser.add_argument('--warehouse', default=None, help="warehouse database path (default: in the cache directory)")
+    parser.add_argument('--record', default=None, metavar='DIR', help="save every API response to DIR for replay")
+    parser.add_argument('--metrics', action='store_true', help="print request/parse timings to stderr at the end")
+    parser.add_argument('--metrics-file', default=None,
+                        help="write run metrics in Prometheus text format (e.g. for a textfile collector)")
+    parser.add_argument('--base-url', default=None,
+                        help="API base URL, e.g. a replay server started with src/api/replay.py")
+    
+    def add_league_selection(command):
+        command.add_argument('--league-key', nargs='+', default=[], help="one or more league keys")
+        command.add_argument('--league-name', default='', help="substring filter on league names")
+        command.add_argument('--seasons', type=_season_range, default=None,
+                             help="season or range, e.g. 2024 or 2021-2025")
+    
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    commands.add_parser('leagues', help="list your leagues and their keys")
+    
+    treasurer = commands.add_parser('treasurer', help="weekly prize money by owner")
+    add_league_selection(treasurer)
+    treasurer.add_argument('--weeks', type=parse_weeks, required=True, help="e.g. 14 or 1-14")
+    treasurer.add_argument('--prizes', type=float, nargs=3, required=True, metavar=('FIRST', 'SECOND', 'THIRD'))
+    
+    standings = commands.add_parser('standings', help="league standings")
+    add_league_selection(standings)
+    
+    ingest = commands.add_parser('ingest', help="store league history in the local warehouse")
+    add_league_selection(ingest)
+    ingest.add_argument('--weeks', type=parse_weeks, default=None, help="default: up to each league's current week")
+    ingest.add_argument('--rosters', action='store_true', help="also store current rosters")
+    
+    return parser
+
+
+async def select_leagues(agent: FantasyFootballTreasurer, args) -> List[dict]:
+    """Resolve --league-key / --league-name / --seasons to league dicts."""
+    start, end = args.seasons or (None, None)
+    if args.league_key:
+        leagues = await agent.get_leagues_info(args.league_key)
+    else:
+        # Without --seasons only the agent's default seasons are listed
+        seasons = range(start, end + 1) if args.seasons else None
+        leagues_by_year = await agent.list_all_leagues_all_years(seasons=seasons)
+        leagues = [league for year in leagues_by_year for league in leagues_by_year[year]]
+        missing = sorted(set(seasons or ()) - set(leagues_by_year))
+        if missing:
+            print(f"warning: no leagues found for season(s) {', '.join(map(str, missing))}", file=sys.stderr)
+    
+    name_filter = args.league_name.lower()
+    return [
+        league for league in leagues
+        if name_filter in league['name'].lower()
+        and (start is None or start <= league['season'] <= end)
+    ]
+
+
+def print_leagues(leagues: List[dict]):
+    for league in leagues:
+        print(f"{league['season']}  {league['league_key']:<16}  {league['name']}")
+
+
+def report_standings(standings_by_league: List[tuple], args) -> list:
+    """Print (league, standings) pairs as text; returns the JSON-able report."""
+    report = []
+    for league, standings in standings_by_league:
+        report.append({**league, 'standings': [dataclasses.asdict(team) for team in standings]})
+        if args.format == 'text':
+            print(f"\n{league['season']} {league['name']} ({league['league_key']})")
+            print_standings(standings)
+    return report
+
+
+def report_earnings(results: list, args, owner_index: Optional[OwnerIndex] = None,
+                    owner_totals: Optional[dict] = None) -> dict:
+    """Print LeagueEarnings and the owner leaderboard as text; returns the JSON-able report.
+
+    ``owner_totals`` defaults to summing ``results`` by owner (through ``owner_index``).
+    """
+    if owner_totals is None:
+        owner_totals = aggregate_owner_earnings(results, owner_index)
+    if args.format == 'text':
+        first, second, third = args.prizes
+        print(f"Weeks {args.weeks.start}-{args.weeks.stop - 1} | "
+              f"Prizes: 1st=${first:.2f}, 2nd=${second:.2f}, 3rd=${third:.2f}")
+        for result in results:
+            print(f"\n{result.season} {result.league_name} ({result.league_key})")
+            ranked = sorted(result.earnings.items(), key=lambda item: item[1], reverse=True)
+            for team_key, amount in ranked:
+                if amount > 0:
+                    owner = owner_name(result, team_key, owner_index)
+                    print(f"   {result.team_names[team_key]} ({owner}): ${amount:.2f}")
+        print_owner_leaderboard(owner_totals)
+    return {
+        'weeks': list(args.weeks),
+        'prizes': list(args.prizes),
+        'leagues': [dataclasses.asdict(result) for result in results],
+        'owners': owner_totals
+    }
+
+
+async def run_command(agent: FantasyFootballTreasurer, args, warehouse: Optional[Warehouse] = None) -> Optional[object]:
+    """Run the selected command against the API, printing text output; returns the JSON-able result."""
+    if args.command == 'leagues':
+        leagues_by_year = await agent.list_all_leagues_all_years()
+        leagues = [league for year in leagues_by_year for league in leagues_by_year[year]]
+        if args.format == 'text':
+            print_leagues(leagues)
+        return leagues
+    
+    leagues = await select_leagues(agent, args)
+    if not leagues:
+        raise LookupError("no leagues matched the given selection")
+    
+    if args.command == 'ingest':
+        await ingest_leagues(agent, warehouse or Warehouse(), leagues, args.weeks, rosters=args.rosters)
+        if args.format == 'text':
+            print(f"Stored {len(leagues)} league(s):")
+            print_leagues(leagues)
+        return leagues
+    
+    if args.command == 'standings':
+        standings = await asyncio.gather(*(agent.get_league_standings(league['league_key']) for league in leagues))
+        return report_standings(list(zip(leagues, standings)), args)
+    
+    results = await agent.get_all_league_earnings(leagues, args.prizes, args.weeks)
+    return report_earnings(results, args, agent.owner_index)
+
+
+def run_offline(warehouse: Warehouse, args) -> Optional[object]:
+    """Run the selected report from the local warehouse without touching the API."""
+    if args.command == 'ingest':
+        raise LookupError("ingest needs the API; drop --offline")
+    
+    if args.command == 'leagues':
+        leagues = warehouse.leagues()
+        if args.format == 'text':
+            print_leagues(leagues)
+        return leagues
+    
+    leagues = warehouse.leagues(args.league_key, args.league_name, args.seasons)
+    if not leagues:
+        raise LookupError("no stored leagues matched the given selection; run ingest first")
+    
+    if args.command == 'standings':
+        return report_standings([(league, warehouse.standings(league['league_key'])) for league in leagues], args)
+    
+    # Owners are summed by manager GUID in SQL, matching the online report's OwnerIndex
+    return report_earnings(warehouse.league_earnings(leagues, args.prizes, args.weeks), args,
+                           owner_totals=warehouse.owner_earnings(leagues, args.prizes, args.weeks))
+
+
+def report_metrics(metrics: Metrics, args) -> None:
+    if args.metrics:
+        print(metrics.summary(), file=sys.stderr)
+    if args.metrics_file:
+        with open(args.metrics_file, 'w') as f:
+            f.write(metrics.prometheus())
+
+
+async def run_cli(args) -> int:
+    load_dotenv()
+    access_token = args.access_token or os.environ.get('YAHOO_ACCESS_TOKEN')
+    oauth = None
+    if not access_token and not args.offline:
+        oauth = YahooOAuth.from_store(TokenStore())
+        if oauth is None:
+            print("error: no access token; pass --access-token, set YAHOO_ACCESS_TOKEN "
+                  "or sign in once with src/main.py and stay signed in", file=sys.stderr)
+            return 2
+    
+    cache = None if args.no_cache or args.offline else ResponseCache()
+    warehouse = Warehouse(args.warehouse) if args.offline or args.command == 'ingest' else None
+    try:
+        with contextlib.ExitStack() as stack:
+            out = stack.enter_context(open(args.output, 'w')) if args.output else sys.stdout
+            # Text reports print straight to the output; with JSON, stray messages go to stderr
+            stack.enter_context(contextlib.redirect_stdout(out if args.format == 'text' else sys.stderr))
+            if args.offline:
+                result = run_offline(warehouse, args)
+            else:
+                token_provider = oauth.get_access_token if oauth else None
+                async with YahooFantasyClient(access_token, base_url=args.base_url, cache=cache,
+                                              record_dir=args.record, token_provider=token_provider) as client:
+                    sync_store = None if args.no_cache else SyncStore()
+                    owner_index = None if args.no_cache else OwnerIndex()
+                    agent = FantasyFootballTreasurer(client, sync_store=sync_store, metrics=client.metrics,
+                                                     owner_index=owner_index)
+                    try:
+                        result = await run_command(agent, args, warehouse)
+                    finally:
+                        # Reported for failed runs too, where retries and error counts matter most
+                        report_metrics(client.metrics, args)
+            if args.format == 'json':
+                json.dump(result, out, indent=2, default=str)
+                out.write('\n')
+    except LookupError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except YahooAPIError as e:
+        # Fail the whole run rather than write a report with missing weeks
+        print(f"error: Yahoo API request failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+        if warehouse is not None:
+            warehouse.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return asyncio.run(run_cli(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
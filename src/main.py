@@ -1,8 +1,17 @@
 import asyncio
+import os
 from auth.prompt_credentials import prompt_for_credentials
 from auth.oauth import YahooOAuth
+from auth.token_store import TokenStore
+from api.cache import ResponseCache
+from api.errors import AuthenticationError, YahooAPIError
 from api.yahoo_client import YahooFantasyClient
 from agent.agent import FantasyFootballTreasurer
+from agent.owners import OwnerIndex
+from agent.sync import SyncStore
+from models.events import SeasonTopScorers, WeekScored, WeekTopScorers
+from models.score_matrix import ScoreMatrix
+from models.stats import LeagueEarnings
 
 
 def get_prize_inputs() -> dict:
@@ -58,37 +67,23 @@ def get_prize_inputs() -> dict:
     }
 
 
-def print_prize_table(weekly_rankings: dict, prizes: dict):
+def print_prize_table(matrix: ScoreMatrix, prizes: dict):
     """Print a table showing prize money earned by each team per week."""
     pos1_prize = prizes['pos1_prize']
     pos2_prize = prizes['pos2_prize']
     pos3_prize = prizes['pos3_prize']
     num_weeks = prizes['num_weeks']
     
-    # Collect all team names
-    all_teams = set()
-    for week_data in weekly_rankings.values():
-        for team in week_data:
-            all_teams.add(team)
+    matrix = matrix.first_weeks(num_weeks)
+    amounts = matrix.prize_matrix((pos1_prize, pos2_prize, pos3_prize))
     
-    all_teams = sorted(all_teams)
-    
-    # Build prize data: team -> {week: prize}
-    prize_data = {team: {} for team in all_teams}
-    
-    for week, rankings in weekly_rankings.items():
-        if week > num_weeks:
-            continue
-        for rank, team in enumerate(rankings, 1):
-            if rank == 1:
-                prize_data[team][week] = pos1_prize
-            elif rank == 2:
-                prize_data[team][week] = pos2_prize
-            elif rank == 3:
-                prize_data[team][week] = pos3_prize
+    # Rows for every team that finished in the top 3 at least once
+    top = matrix.top_k(3)
+    placed = set(top[top >= 0].tolist())
+    rows = [row for row in range(len(matrix)) if row in placed]
     
     # Calculate column widths
-    max_name_len = max(len(team) for team in all_teams) if all_teams else 10
+    max_name_len = max(len(matrix.names[row]) for row in rows) if rows else 10
     max_name_len = max(max_name_len, 10)  # Minimum width
     col_width = 8  # Width for week columns
     
@@ -112,18 +107,19 @@ def print_prize_table(weekly_rankings: dict, prizes: dict):
     grand_total = 0
     team_totals = []
     
-    for team in all_teams:
+    for row_index in rows:
+        team = matrix.names[row_index]
         row = f"{team:<{max_name_len}}"
-        total = 0
         
         for week in range(1, num_weeks + 1):
-            prize = prize_data[team].get(week, 0)
-            total += prize
+            col = matrix.week_index.get(week)
+            prize = amounts[row_index, col] if col is not None else 0
             if prize > 0:
                 row += f" | ${prize:>{col_width-1}.2f}"
             else:
                 row += f" | {'-':>{col_width}}"
         
+        total = float(amounts[row_index].sum())
         row += f" | ${total:>{col_width-1}.2f}"
         print(row)
         
@@ -163,7 +159,7 @@ def print_standings(standings: list):
         return
     
     # Calculate column widths
-    max_name_len = max(len(s['name']) for s in standings) if standings else 15
+    max_name_len = max(len(s.name) for s in standings) if standings else 15
     max_name_len = max(max_name_len, 15)
     
     # Header
@@ -172,11 +168,11 @@ def print_standings(standings: list):
     print("-" * len(header))
     
     for team in standings:
-        record = f"{team['wins']}-{team['losses']}"
-        if team['ties'] > 0:
-            record += f"-{team['ties']}"
+        record = f"{team.wins}-{team.losses}"
+        if team.ties > 0:
+            record += f"-{team.ties}"
         
-        row = f"{team['rank']:<6} | {team['name']:<{max_name_len}} | {record:<10} | {team['points_for']:>12.2f} | {team['points_against']:>14.2f} | {team['streak']:>6}"
+        row = f"{team.rank:<6} | {team.name:<{max_name_len}} | {record:<10} | {team.points_for:>12.2f} | {team.points_against:>14.2f} | {team.streak:>6}"
         print(row)
     
     print()
@@ -193,29 +189,29 @@ def print_team_stats(teams: list, standings: list):
         return
     
     # Create a lookup for standings info
-    standings_lookup = {s['name']: s for s in standings} if standings else {}
+    standings_lookup = {s.name: s for s in standings} if standings else {}
     
     for i, team in enumerate(teams, 1):
         print(f"{'─' * 50}")
-        print(f"📋 Team #{i}: {team['name']}")
+        print(f"📋 Team #{i}: {team.name}")
         print(f"{'─' * 50}")
-        print(f"   Manager: {team['manager'] or 'N/A'}")
-        print(f"   Team Key: {team['team_key']}")
+        print(f"   Manager: {team.manager or 'N/A'}")
+        print(f"   Team Key: {team.team_key}")
         
         # Add standings info if available
-        if team['name'] in standings_lookup:
-            s = standings_lookup[team['name']]
-            record = f"{s['wins']}-{s['losses']}"
-            if s['ties'] > 0:
-                record += f"-{s['ties']}"
+        if team.name in standings_lookup:
+            s = standings_lookup[team.name]
+            record = f"{s.wins}-{s.losses}"
+            if s.ties > 0:
+                record += f"-{s.ties}"
             print(f"   Record: {record}")
-            print(f"   Points For: {s['points_for']:.2f}")
-            print(f"   Points Against: {s['points_against']:.2f}")
-            print(f"   Streak: {s['streak']}")
+            print(f"   Points For: {s.points_for:.2f}")
+            print(f"   Points Against: {s.points_against:.2f}")
+            print(f"   Streak: {s.streak}")
         
-        print(f"   Waiver Priority: {team['waiver_priority']}")
-        print(f"   Moves: {team['moves']}")
-        print(f"   Trades: {team['trades']}")
+        print(f"   Waiver Priority: {team.waiver_priority}")
+        print(f"   Moves: {team.moves}")
+        print(f"   Trades: {team.trades}")
         print()
 
 
@@ -232,7 +228,7 @@ async def print_player_stats(agent, teams: list):
     # Ask user which team's roster to view
     print("Select a team to view roster:")
     for i, team in enumerate(teams, 1):
-        print(f"   {i}. {team['name']}")
+        print(f"   {i}. {team.name}")
     print(f"   {len(teams) + 1}. View all teams")
     
     while True:
@@ -252,12 +248,15 @@ async def print_player_stats(agent, teams: list):
     else:
         selected_teams = [teams[idx]]
     
+    # Fetch every selected roster up front (one collection request)
+    rosters = await agent.get_team_rosters([team.team_key for team in selected_teams])
+    
     for team in selected_teams:
         print(f"\n{'─' * 60}")
-        print(f"📋 {team['name']} - Roster")
+        print(f"📋 {team.name} - Roster")
         print(f"{'─' * 60}")
         
-        roster = await agent.get_team_roster(team['team_key'])
+        roster = rosters.get(team.team_key, [])
         
         if not roster:
             print("   No roster data available.")
@@ -271,9 +270,9 @@ async def print_player_stats(agent, teams: list):
         print(f"   {'-' * 55}")
         
         for player in roster:
-            pos = player['selected_position'] or player['position']
-            status = player['status'] if player['status'] else 'Active'
-            print(f"   {pos:<5} | {player['name']:<30} | {player['team']:<5} | {status:<10}")
+            pos = player.selected_position or player.position
+            status = player.status if player.status else 'Active'
+            print(f"   {pos:<5} | {player.name:<30} | {player.team:<5} | {status:<10}")
         
         print()
 
@@ -289,9 +288,9 @@ def print_team_owners(teams: list):
         return
     
     # Calculate column widths
-    max_team_len = max(len(t['name']) for t in teams) if teams else 20
+    max_team_len = max(len(t.name) for t in teams) if teams else 20
     max_team_len = max(max_team_len, 15)
-    max_owner_len = max(len(t['manager'] or 'N/A') for t in teams) if teams else 15
+    max_owner_len = max(len(t.manager or 'N/A') for t in teams) if teams else 15
     max_owner_len = max(max_owner_len, 10)
     
     # Header
@@ -301,8 +300,8 @@ def print_team_owners(teams: list):
     
     # Rows
     for i, team in enumerate(teams, 1):
-        owner = team['manager'] or 'N/A'
-        print(f"   {i:<4} | {team['name']:<{max_team_len}} | {owner:<{max_owner_len}}")
+        owner = team.manager or 'N/A'
+        print(f"   {i:<4} | {team.name:<{max_team_len}} | {owner:<{max_owner_len}}")
     
     print()
 
@@ -404,66 +403,25 @@ async def multi_year_treasurer(agent, all_leagues: list):
         except ValueError:
             print("❌ Please enter a valid number.")
     
-    # Process each year
-    owner_totals = {}  # owner_name -> {total: float, years: {year: amount}}
+    # Fetch every season concurrently, reporting each week as it arrives
+    print(f"\n📊 Processing {len(matching_leagues)} season(s)...")
+    print("=" * 70)
+    
+    results = await render_league_progress(agent.stream_all_league_earnings(
+        matching_leagues, (pos1_prize, pos2_prize, pos3_prize), range(1, num_weeks + 1)
+    ))
+    
     year_summaries = {}  # year -> {team_name: amount}
     team_to_owner_global = {}  # Keep track of team->owner mapping across years
     
-    print(f"\n📊 Processing {len(matching_leagues)} season(s)...")
-    print("=" * 70)
+    for result in results:
+        year_summaries[result.season] = {
+            result.team_names[key]: amount for key, amount in result.earnings.items()
+        }
+        for key, name in result.team_names.items():
+            team_to_owner_global[name] = owner_name(result, key, agent.owner_index)
     
-    for league in matching_leagues:
-        year = league['season']
-        print(f"\n📅 {year}: {league['name']}")
-        print("-" * 50)
-        
-        # Get team info to map team names to owners
-        await asyncio.sleep(0.5)  # Rate limiting
-        teams = await agent.get_all_teams_info(league['league_key'])
-        team_to_owner = {}
-        print(f"   Teams found: {len(teams)}")
-        for team in teams:
-            owner = team['manager'] if team['manager'] else team['name']
-            team_to_owner[team['name']] = owner
-            team_to_owner_global[team['name']] = owner  # Store globally
-            # Debug: show team->owner mapping
-            # print(f"      {team['name']} -> {owner}")
-        
-        # Get weekly scores with rate limiting
-        weekly_rankings = {}
-        for week in range(1, num_weeks + 1):
-            await asyncio.sleep(0.3)  # Rate limiting between API calls
-            scores = await agent.get_weekly_scores(league['league_key'], week)
-            if scores:
-                sorted_scores = sorted(scores, key=lambda x: x.points, reverse=True)
-                weekly_rankings[week] = [s.team_name for s in sorted_scores[:3]]
-                print(f"   Week {week}: ✅")
-            else:
-                weekly_rankings[week] = []
-                print(f"   Week {week}: ⚠️ No data")
-        
-        # Calculate team earnings for this year
-        team_earnings = {}
-        for week, rankings in weekly_rankings.items():
-            for rank, team_name in enumerate(rankings, 1):
-                if team_name not in team_earnings:
-                    team_earnings[team_name] = 0
-                if rank == 1:
-                    team_earnings[team_name] += pos1_prize
-                elif rank == 2:
-                    team_earnings[team_name] += pos2_prize
-                elif rank == 3:
-                    team_earnings[team_name] += pos3_prize
-        
-        year_summaries[year] = team_earnings
-        
-        # Aggregate by owner
-        for team_name, amount in team_earnings.items():
-            owner = team_to_owner.get(team_name, team_name)
-            if owner not in owner_totals:
-                owner_totals[owner] = {'total': 0, 'years': {}}
-            owner_totals[owner]['total'] += amount
-            owner_totals[owner]['years'][year] = owner_totals[owner]['years'].get(year, 0) + amount
+    owner_totals = aggregate_owner_earnings(results, agent.owner_index)
     
     # Print results
     print("\n" + "=" * 70)
@@ -478,8 +436,8 @@ async def multi_year_treasurer(agent, all_leagues: list):
     print("\n" + "-" * 70)
     print("👥 TEAM TO OWNER MAPPING")
     print("-" * 70)
-    for team_name, owner_name in sorted(team_to_owner_global.items()):
-        print(f"   {team_name} -> {owner_name}")
+    for team, owner in sorted(team_to_owner_global.items()):
+        print(f"   {team} -> {owner}")
     
     # Print yearly breakdown
     print("\n" + "-" * 70)
@@ -495,11 +453,83 @@ async def multi_year_treasurer(agent, all_leagues: list):
             if amount > 0:
                 print(f"      {team}: ${amount:.2f}")
     
-    # Print owner leaderboard
+    print_owner_leaderboard(owner_totals)
+
+
+async def render_league_progress(events) -> list:
+    """Print league-earnings stream events as they arrive; returns the LeagueEarnings, oldest season first."""
+    results = []
+    async for event in events:
+        if isinstance(event, WeekScored):
+            status = f"✅ {len(event.scores)} teams" if event.scores else "⚠️ No data"
+            print(f"   {event.season} Week {event.week}: {status}")
+        elif isinstance(event, LeagueEarnings):
+            print(f"\n📅 {event.season}: {event.league_name} - {len(event.team_names)} teams, "
+                  f"{len(event.scored_weeks)} week(s) scored\n")
+            results.append(event)
+    return sorted(results, key=lambda result: result.season)
+
+
+async def print_weekly_top_scorers(events, top_n: int = 3):
+    """Print the events of FantasyFootballTreasurer.get_weekly_top_scorers as they arrive."""
+    print(f"{'='*60}")
+    print(f"TOP {top_n} SCORERS BY WEEK")
+    print(f"{'='*60}\n")
+    
+    async for event in events:
+        if isinstance(event, WeekTopScorers):
+            print(f"📅 WEEK {event.week}")
+            print("-" * 40)
+            if not event.top:
+                print("   No scores available for this week.\n")
+                continue
+            for rank, score in enumerate(event.top, 1):
+                medal = ["🥇", "🥈", "🥉"][rank - 1] if rank <= 3 else f"{rank}."
+                print(f"   {medal} {score.team_name}: {score.points:.2f} pts")
+            print()
+        
+        elif isinstance(event, SeasonTopScorers):
+            print(f"{'='*60}")
+            print(f"SEASON SUMMARY - TOP {event.top_n} OVERALL SCORERS")
+            print(f"{'='*60}\n")
+            for rank, scorer in enumerate(event.scorers, 1):
+                medal = ["🥇", "🥈", "🥉"][rank - 1] if rank <= 3 else f"{rank}."
+                print(f"{medal} {scorer.team_name}")
+                print(f"   Total Points: {scorer.total_points:.2f}")
+                print(f"   Weeks Played: {scorer.weeks_played}")
+                print(f"   Avg Points/Week: {scorer.average_points:.2f}")
+                print()
+
+
+def owner_name(result, team_key: str, owner_index=None) -> str:
+    """Owner of a LeagueEarnings team, resolved through the GUID owner index when there is one."""
+    owner = owner_index.owner_of(team_key) if owner_index is not None else None
+    return owner or result.team_owners.get(team_key, result.team_names.get(team_key, team_key))
+
+
+def aggregate_owner_earnings(results: list, owner_index=None) -> dict:
+    """Sum LeagueEarnings by owner: owner -> {'total': float, 'years': {season: amount}}.
+    
+    With an ``OwnerIndex``, a manager who renamed between seasons is still one owner.
+    """
+    owner_totals = {}
+    for result in results:
+        for team_key, amount in result.earnings.items():
+            owner = owner_name(result, team_key, owner_index)
+            if owner not in owner_totals:
+                owner_totals[owner] = {'total': 0, 'years': {}}
+            owner_totals[owner]['total'] += amount
+            owner_totals[owner]['years'][result.season] = owner_totals[owner]['years'].get(result.season, 0) + amount
+    return owner_totals
+
+
+def print_owner_leaderboard(owner_totals: dict):
+    """Print owners ranked by total earnings with one column per season."""
     print("\n" + "=" * 70)
     print("🏆 TOTAL EARNINGS BY OWNER")
     print("=" * 70 + "\n")
     
+    years = sorted({year for data in owner_totals.values() for year in data['years']})
     sorted_owners = sorted(owner_totals.items(), key=lambda x: x[1]['total'], reverse=True)
     
     max_owner_len = max(len(o) for o, _ in sorted_owners) if sorted_owners else 15
@@ -532,6 +562,72 @@ async def multi_year_treasurer(agent, all_leagues: list):
     print()
 
 
+def parse_season_range(text: str) -> tuple:
+    """Parse '2024' or '2021-2025' into an inclusive (start, end) tuple."""
+    start, _, end = text.partition('-')
+    start = int(start)
+    end = int(end) if end else start
+    if end < start:
+        raise ValueError(f"end season {end} is before start season {start}")
+    return start, end
+
+
+async def multi_league_treasurer(agent, all_leagues: list):
+    """Calculate prize money by owner across every league the user belongs to."""
+    print("\n" + "=" * 70)
+    print("🗂️  ALL-LEAGUES TREASURER")
+    print("=" * 70)
+    print("\nThis feature totals earnings by OWNER across all of your leagues at once.\n")
+    
+    available_years = sorted(set(l['season'] for l in all_leagues))
+    print(f"Available seasons: {available_years}")
+    print(f"Available leagues: {sorted(set(l['name'] for l in all_leagues))}")
+    
+    name_filter = input("\nLeague name filter (blank for all leagues): ").strip().lower()
+    
+    while True:
+        seasons = input("Seasons, e.g. 2024 or 2021-2025 (blank for all): ").strip()
+        if not seasons:
+            start_year, end_year = available_years[0], available_years[-1]
+            break
+        try:
+            start_year, end_year = parse_season_range(seasons)
+            break
+        except ValueError:
+            print("❌ Please enter a year or a range like 2021-2025.")
+    
+    matching_leagues = sorted(
+        (l for l in all_leagues
+         if name_filter in l['name'].lower() and start_year <= l['season'] <= end_year),
+        key=lambda l: (l['season'], l['name'])
+    )
+    
+    if not matching_leagues:
+        print("\n❌ No leagues match that filter.")
+        return
+    
+    print(f"\n✅ {len(matching_leagues)} league(s) selected:")
+    for l in matching_leagues:
+        print(f"   📅 {l['season']}: {l['name']} ({l['league_key']})")
+    
+    prizes = get_prize_inputs()
+    prize_amounts = (prizes['pos1_prize'], prizes['pos2_prize'], prizes['pos3_prize'])
+    
+    print(f"\n📊 Fetching {len(matching_leagues)} league(s) concurrently...")
+    results = await agent.get_all_league_earnings(
+        matching_leagues, prize_amounts, range(1, prizes['num_weeks'] + 1)
+    )
+    
+    print("\n" + "-" * 70)
+    print("🏈 EARNINGS BY LEAGUE")
+    print("-" * 70)
+    for result in results:
+        paid = sum(result.earnings.values())
+        print(f"   {result.season} {result.league_name}: ${paid:.2f} over {len(result.scored_weeks)} week(s)")
+    
+    print_owner_leaderboard(aggregate_owner_earnings(results, agent.owner_index))
+
+
 def show_main_menu():
     """Display the main menu and get user choice."""
     print("\n" + "=" * 60)
@@ -539,61 +635,29 @@ def show_main_menu():
     print("=" * 60)
     print("   1. 🏆 League Treasurer (Single Season)")
     print("   2. 📅 Multi-Year Treasurer (Earnings by Owner)")
-    print("   3. 📊 View Team Statistics")
-    print("   4. 🏈 View Player Rosters")
-    print("   5. 🏅 View League Standings")
-    print("   6. 🎯 View Weekly Matchups (Coming Soon)")
-    print("   7. 📈 View Season Statistics (Coming Soon)")
-    print("   8. 🔄 Switch League")
-    print("   9. 👋 Exit")
+    print("   3. 🗂️  All-Leagues Treasurer (Every League, by Owner)")
+    print("   4. 📊 View Team Statistics")
+    print("   5. 🏈 View Player Rosters")
+    print("   6. 🏅 View League Standings")
+    print("   7. 🎯 View Weekly Matchups (Coming Soon)")
+    print("   8. 📈 View Season Statistics (Top Scorers)")
+    print("   9. 🔄 Switch League")
+    print("  10. 👋 Exit")
     print("-" * 60)
     
     while True:
         try:
-            choice = input("Enter your choice (1-9): ").strip()
-            if choice in ['1', '2', '3', '4', '5', '6', '7', '8', '9']:
+            choice = input("Enter your choice (1-10): ").strip()
+            if choice in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10']:
                 return int(choice)
             else:
-                print("Invalid choice. Please enter 1-9.")
+                print("Invalid choice. Please enter 1-10.")
         except ValueError:
             print("Please enter a number.")
 
 
-async def run():
-    print("=" * 60)
-    print("🏈 Fantasy Football Treasurer")
-    print("=" * 60)
-    print("\n⚠️  Your credentials will NOT be stored anywhere.")
-    print("They are only used for this session.\n")
-    
-    # Prompt for credentials (not stored)
-    credentials = prompt_for_credentials()
-    
-    print(f"\n👤 Authenticating as: {credentials['email']}")
-    
-    # Initialize OAuth (credentials held in memory only)
-    oauth = YahooOAuth(
-        client_id=credentials['client_id'],
-        client_secret=credentials['client_secret'],
-        user_email=credentials['email']
-    )
-    
-    # Authenticate
-    print("\n🔐 Authenticating with Yahoo...")
-    access_token = await oauth.authenticate()
-    
-    if not access_token:
-        print("❌ Authentication failed. Exiting.")
-        return
-    
-    print("✅ Authentication successful!\n")
-    
-    # Initialize the Yahoo client
-    client = YahooFantasyClient(access_token)
-    
-    # Initialize the agent with the client
-    agent = FantasyFootballTreasurer(client)
-    
+async def run_menu(agent):
+    """Discover the user's leagues and drive the interactive main menu."""
     # Discover available game keys
     print("🔍 Discovering available NFL seasons...")
     game_keys = await agent.discover_game_keys()
@@ -607,7 +671,7 @@ async def run():
     print("📋 Fetching all your Fantasy Football leagues...")
     print("=" * 60)
     
-    leagues_by_year = await agent.list_all_leagues_all_years()
+    leagues_by_year = await agent.list_all_leagues_all_years(game_keys)
     
     if not leagues_by_year:
         print("❌ No leagues found.")
@@ -660,88 +724,166 @@ async def run():
     while True:
         menu_choice = show_main_menu()
         
-        if menu_choice == 1:
-            # League Treasurer
-            print(f"\n📊 League Treasurer - {selected_league['name']} ({selected_league['season']})")
-            prizes = get_prize_inputs()
+        if menu_choice == 10:
+            # Exit
+            break
+        
+        try:
+            if menu_choice == 1:
+                # League Treasurer
+                print(f"\n📊 League Treasurer - {selected_league['name']} ({selected_league['season']})")
+                prizes = get_prize_inputs()
+                
+                print(f"\n📊 Fetching weekly scores for weeks 1-{prizes['num_weeks']}...")
+                print("=" * 60)
+                
+                scores_by_week = await agent.get_weekly_scores_many(
+                    selected_league['league_key'], range(1, prizes['num_weeks'] + 1)
+                )
+                for week, scores in scores_by_week.items():
+                    if scores:
+                        print(f"   Week {week}: ✅ {len(scores)} teams")
+                    else:
+                        print(f"   Week {week}: ⚠️ No scores available")
+                
+                print_prize_table(ScoreMatrix.from_weekly_scores(scores_by_week), prizes)
             
-            print(f"\n📊 Fetching weekly scores for weeks 1-{prizes['num_weeks']}...")
-            print("=" * 60)
+            elif menu_choice == 2:
+                # Multi-Year Treasurer
+                await multi_year_treasurer(agent, all_leagues)
             
-            weekly_rankings = {}
-            for week in range(1, prizes['num_weeks'] + 1):
-                scores = await agent.get_weekly_scores(selected_league['league_key'], week)
-                
-                if scores:
-                    sorted_scores = sorted(scores, key=lambda x: x.points, reverse=True)
-                    weekly_rankings[week] = [s.team_name for s in sorted_scores[:3]]
-                    print(f"   Week {week}: ✅ {len(scores)} teams")
-                else:
-                    weekly_rankings[week] = []
-                    print(f"   Week {week}: ⚠️ No scores available")
+            elif menu_choice == 3:
+                # All-Leagues Treasurer
+                await multi_league_treasurer(agent, all_leagues)
             
-            print_prize_table(weekly_rankings, prizes)
-        
-        elif menu_choice == 2:
-            # Multi-Year Treasurer
-            await multi_year_treasurer(agent, all_leagues)
-        
-        elif menu_choice == 3:
-            # Team Statistics
-            print(f"\n📊 Fetching team statistics for {selected_league['name']}...")
-            teams = await agent.get_all_teams_info(selected_league['league_key'])
-            standings = await agent.get_league_standings(selected_league['league_key'])
-            print_team_stats(teams, standings)
+            elif menu_choice == 4:
+                # Team Statistics
+                print(f"\n📊 Fetching team statistics for {selected_league['name']}...")
+                teams = await agent.get_all_teams_info(selected_league['league_key'])
+                standings = await agent.get_league_standings(selected_league['league_key'])
+                print_team_stats(teams, standings)
+            
+            elif menu_choice == 5:
+                # Player Rosters
+                print(f"\n🏈 Fetching team rosters for {selected_league['name']}...")
+                teams = await agent.get_all_teams_info(selected_league['league_key'])
+                await print_player_stats(agent, teams)
+            
+            elif menu_choice == 6:
+                # League Standings
+                print(f"\n🏅 Fetching league standings for {selected_league['name']}...")
+                standings = await agent.get_league_standings(selected_league['league_key'])
+                print_standings(standings)
+            
+            elif menu_choice == 7:
+                # Weekly Matchups - Coming Soon
+                print("\n🎯 Weekly Matchups feature is coming soon!")
+                print("   This feature will show head-to-head matchups for any week.")
+            
+            elif menu_choice == 8:
+                # Season Statistics - weekly top scorers, printed as each week arrives
+                print(f"\n📈 Fetching season statistics for {selected_league['name']}...\n")
+                await print_weekly_top_scorers(agent.get_weekly_top_scorers(selected_league['league_key']))
+            
+            elif menu_choice == 9:
+                # Switch League
+                print("\n🔄 Select a different league:")
+                print("-" * 60)
+                for i, league in enumerate(all_leagues, 1):
+                    marker = " 👈" if league == selected_league else ""
+                    print(f"   {i}. {league['season']} - {league['name']}{marker}")
+                
+                while True:
+                    try:
+                        choice = input(f"\nEnter choice (1-{len(all_leagues)}): ").strip()
+                        idx = int(choice) - 1
+                        if 0 <= idx < len(all_leagues):
+                            selected_league = all_leagues[idx]
+                            print(f"\n✅ Switched to: {selected_league['name']} ({selected_league['season']})")
+                            break
+                        else:
+                            print("Invalid choice. Try again.")
+                    except ValueError:
+                        print("Please enter a number.")
+        except YahooAPIError as e:
+            # A failed request aborts this action only; nothing partial is reported as a result
+            print(f"\n❌ Yahoo API request failed: {e}")
+
+
+async def run():
+    print("=" * 60)
+    print("🏈 Fantasy Football Treasurer")
+    print("=" * 60)
+    
+    # A saved session skips the prompts and browser login; FFT_TOKEN_KEY encrypts it
+    try:
+        token_store = TokenStore()
+    except RuntimeError as e:
+        print(f"\n⚠️  {e}; sessions will not be saved.")
+        token_store = None
+    oauth = YahooOAuth.from_store(token_store) if token_store else None
+    
+    if oauth is not None:
+        print(f"\n🔑 Resuming saved session (delete {token_store.path} to sign out)")
+        access_token = await oauth.authenticate()
+    else:
+        print("\n⚠️  Your credentials will NOT be stored anywhere unless you choose to stay signed in.")
+        print("Otherwise they are only used for this session.\n")
         
-        elif menu_choice == 4:
-            # Player Rosters
-            print(f"\n🏈 Fetching team rosters for {selected_league['name']}...")
-            teams = await agent.get_all_teams_info(selected_league['league_key'])
-            await print_player_stats(agent, teams)
+        # Prompt for credentials (not stored)
+        credentials = prompt_for_credentials()
         
-        elif menu_choice == 5:
-            # League Standings
-            print(f"\n🏅 Fetching league standings for {selected_league['name']}...")
-            standings = await agent.get_league_standings(selected_league['league_key'])
-            print_standings(standings)
+        print(f"\n👤 Authenticating as: {credentials['email']}")
         
-        elif menu_choice == 6:
-            # Weekly Matchups - Coming Soon
-            print("\n🎯 Weekly Matchups feature is coming soon!")
-            print("   This feature will show head-to-head matchups for any week.")
+        # Initialize OAuth (credentials held in memory only)
+        oauth = YahooOAuth(
+            client_id=credentials['client_id'],
+            client_secret=credentials['client_secret'],
+            user_email=credentials['email']
+        )
+        credentials.clear()
         
-        elif menu_choice == 7:
-            # Season Statistics - Coming Soon
-            print("\n📈 Season Statistics feature is coming soon!")
-            print("   This feature will show aggregated stats across the entire season.")
+        # Authenticate
+        print("\n🔐 Authenticating with Yahoo...")
+        access_token = await oauth.authenticate()
         
-        elif menu_choice == 8:
-            # Switch League
-            print("\n🔄 Select a different league:")
-            print("-" * 60)
-            for i, league in enumerate(all_leagues, 1):
-                marker = " 👈" if league == selected_league else ""
-                print(f"   {i}. {league['season']} - {league['name']}{marker}")
-            
-            while True:
-                try:
-                    choice = input(f"\nEnter choice (1-{len(all_leagues)}): ").strip()
-                    idx = int(choice) - 1
-                    if 0 <= idx < len(all_leagues):
-                        selected_league = all_leagues[idx]
-                        print(f"\n✅ Switched to: {selected_league['name']} ({selected_league['season']})")
-                        break
-                    else:
-                        print("Invalid choice. Try again.")
-                except ValueError:
-                    print("Please enter a number.")
+        if access_token and token_store is not None:
+            answer = input("Stay signed in on this computer? (y/N): ").strip().lower()
+            if answer == 'y':
+                oauth.save(token_store)
+                encrypted = "encrypted" if token_store.encrypted else "unencrypted; set FFT_TOKEN_KEY to encrypt it"
+                print(f"💾 Session saved to {token_store.path} ({encrypted})")
+    
+    if not access_token:
+        print("❌ Authentication failed. Exiting.")
+        return
+    
+    print("✅ Authentication successful!\n")
+    
+    # Closed weeks and finished seasons are served from the on-disk cache
+    cache = ResponseCache()
+    
+    # Initialize the Yahoo client (one pooled session for the whole run); the token
+    # is refreshed before it expires, so long sessions never need a new login
+    async with YahooFantasyClient(access_token, cache=cache, token_provider=oauth.get_access_token) as client:
+        # Initialize the agent; stored score history means reruns fetch only new weeks
+        agent = FantasyFootballTreasurer(client, sync_store=SyncStore(), metrics=client.metrics,
+                                         owner_index=OwnerIndex())
+        try:
+            await run_menu(agent)
+        except AuthenticationError as e:
+            print(f"\n❌ Yahoo rejected the access token ({e}). Please sign in again.")
+        except YahooAPIError as e:
+            print(f"\n❌ Yahoo API request failed: {e}")
         
-        elif menu_choice == 9:
-            # Exit
-            break
+        # FFT_METRICS=1 prints where the run's time went (network, decoding, parsing)
+        if os.environ.get('FFT_METRICS'):
+            print("\n" + client.metrics.summary())
+    
+    cache.close()
     
     # Clear credentials from memory
-    credentials.clear()
+    oauth.clear_credentials()
     print("\n🔒 Credentials cleared from memory.")
     print("👋 Session ended.")
 
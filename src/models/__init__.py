@@ -1,3 +1,7 @@
-from models.stats import WeeklyScore, TopScorer, TeamStats
+from models.stats import WeeklyScore, TopScorer, TeamStats, TeamStanding, LeagueEarnings
+from models.events import WeekScored, WeekTopScorers, SeasonTopScorers
+from models.team import TeamInfo
+from models.player import RosterPlayer
 
-__all__ = ['WeeklyScore', 'TopScorer', 'TeamStats']
\ No newline at end of file
+__all__ = ['WeeklyScore', 'TopScorer', 'TeamStats', 'TeamStanding', 'LeagueEarnings', 'TeamInfo', 'RosterPlayer',
+           'WeekScored', 'WeekTopScorers', 'SeasonTopScorers']
\ No newline at end of file
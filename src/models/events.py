@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from models.stats import SLOTS, TopScorer, WeeklyScore
+
+
+# Events yielded by the agent's streaming methods as results arrive. A stream
+# ends with its final result (LeagueEarnings, SeasonTopScorers), so consumers
+# can render progress and results from one ``async for``.
+
+
+@dataclass(**SLOTS)
+class WeekScored:
+    """One week's scores for a league have arrived (empty if Yahoo has none yet)."""
+    league_key: str
+    week: int
+    scores: List[WeeklyScore]
+    season: Optional[int] = None
+
+
+@dataclass(**SLOTS)
+class WeekTopScorers:
+    """The highest-scoring teams of one week, best first."""
+    league_key: str
+    week: int
+    top: List[WeeklyScore]
+
+
+@dataclass(**SLOTS)
+class SeasonTopScorers:
+    """Season totals for the teams that made a weekly top N, best first."""
+    league_key: str
+    top_n: int
+    scorers: List[TopScorer]
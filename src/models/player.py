@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from models.stats import SLOTS
+
+
 class Player:
     def __init__(self, player_id, name, position, team, stats=None):
         self.player_id = player_id
@@ -13,4 +17,14 @@ class Player:
         return self.stats.get(stat_name, None)
 
     def __repr__(self):
-        return f"Player(id={self.player_id}, name={self.name}, position={self.position}, team={self.team}, stats={self.stats})"
\ No newline at end of file
+        return f"Player(id={self.player_id}, name={self.name}, position={self.position}, team={self.team}, stats={self.stats})"
+
+@dataclass(**SLOTS)
+class RosterPlayer:
+    """A player on a team's roster."""
+    name: str
+    player_key: str = ''
+    position: str = ''
+    team: str = ''
+    status: str = ''
+    selected_position: str = ''
@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from models.stats import WeeklyScore
+
+
+class ScoreMatrix:
+    """Teams × weeks array of fantasy points with vectorized ranking and prize maths.
+
+    Rows are teams (keyed by team key when Yahoo supplied one, otherwise by
+    name) and columns are weeks; a team with no score for a week holds NaN.
+    """
+    
+    def __init__(self, teams: Sequence[str], weeks: Sequence[int], points: np.ndarray,
+                 names: Optional[Sequence[str]] = None):
+        self.teams = list(teams)
+        self.weeks = list(weeks)
+        self.points = np.asarray(points, dtype=float).reshape(len(self.teams), len(self.weeks))
+        self.names = list(names) if names is not None else list(self.teams)
+        self.team_index = {team: row for row, team in enumerate(self.teams)}
+        self.week_index = {week: col for col, week in enumerate(self.weeks)}
+    
+    @classmethod
+    def from_weekly_scores(cls, scores_by_week: Dict[int, Iterable[WeeklyScore]]) -> "ScoreMatrix":
+        """Build a matrix from ``get_weekly_scores`` / ``get_weekly_scores_many`` output."""
+        weeks = sorted(scores_by_week)
+        names: Dict[str, str] = {}
+        cells = []
+        for col, week in enumerate(weeks):
+            for score in scores_by_week[week]:
+                team = score.team_key or score.team_name
+                names.setdefault(team, score.team_name)
+                cells.append((team, col, score.points))
+        
+        # Rows in display order (by team name)
+        teams = sorted(names, key=lambda team: (names[team].lower(), team))
+        team_index = {team: row for row, team in enumerate(teams)}
+        points = np.full((len(teams), len(weeks)), np.nan)
+        for team, col, value in cells:
+            points[team_index[team], col] = value
+        return cls(teams, weeks, points, [names[team] for team in teams])
+    
+    def __len__(self) -> int:
+        return len(self.teams)
+    
+    def first_weeks(self, num_weeks: int) -> "ScoreMatrix":
+        """Return a view restricted to weeks ``<= num_weeks``."""
+        cols = [col for col, week in enumerate(self.weeks) if week <= num_weeks]
+        return ScoreMatrix(self.teams, [self.weeks[col] for col in cols], self.points[:, cols], self.names)
+    
+    def top_k(self, k: int = 3) -> np.ndarray:
+        """Row indices of each week's ``k`` highest scorers, best first.
+
+        Returns a ``(k, weeks)`` int array; slots with no scoring team are -1.
+        """
+        n_teams = len(self.teams)
+        ranks = np.full((k, len(self.weeks)), -1, dtype=int)
+        if n_teams == 0 or not self.weeks or k <= 0:
+            return ranks
+        
+        filled = np.where(np.isnan(self.points), -np.inf, self.points)
+        take = min(k, n_teams)
+        if take < n_teams:
+            candidates = np.argpartition(-filled, take - 1, axis=0)[:take]
+        else:
+            candidates = np.broadcast_to(np.arange(n_teams)[:, None], filled.shape)
+        values = np.take_along_axis(filled, candidates, axis=0)
+        order = np.argsort(-values, axis=0, kind='stable')
+        top = np.take_along_axis(candidates, order, axis=0)
+        top_values = np.take_along_axis(values, order, axis=0)
+        ranks[:take] = np.where(np.isneginf(top_values), -1, top)
+        return ranks
+    
+    def prize_matrix(self, prizes: Sequence[float]) -> np.ndarray:
+        """Teams × weeks array of prize money, ``prizes[i]`` going to each week's (i+1)th scorer."""
+        amounts = np.zeros(self.points.shape)
+        top = self.top_k(len(prizes))
+        cols = np.arange(len(self.weeks))
+        for rank, prize in enumerate(prizes):
+            placed = top[rank] >= 0
+            amounts[top[rank, placed], cols[placed]] += prize
+        return amounts
+    
+    def prize_totals(self, prizes: Sequence[float]) -> Dict[str, float]:
+        """Total prize money per team across all weeks."""
+        totals = self.prize_matrix(prizes).sum(axis=1)
+        return {team: float(total) for team, total in zip(self.teams, totals)}
+    
+    def point_totals(self) -> Dict[str, float]:
+        """Total points per team, ignoring weeks without a score."""
+        totals = np.nansum(self.points, axis=1)
+        return {team: float(total) for team, total in zip(self.teams, totals)}
+    
+    def weeks_with_scores(self) -> List[int]:
+        """Weeks in which at least one team has a score."""
+        scored = ~np.isnan(self.points).all(axis=0) if len(self.teams) else np.zeros(len(self.weeks), bool)
+        return [week for week, has_score in zip(self.weeks, scored) if has_score]
@@ -1,8 +1,12 @@
+import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional
 
+# Slotted records keep multi-season archives compact (dataclass slots need 3.10+)
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**SLOTS)
 class WeeklyScore:
     """Represents a team's score for a single week."""
     team_name: str
@@ -10,9 +14,10 @@ class WeeklyScore:
     points: float
     opponent_name: Optional[str] = None
     opponent_points: Optional[float] = None
+    team_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TopScorer:
     """Represents a top scorer summary."""
     team_name: str
@@ -21,7 +26,7 @@ class TopScorer:
     average_points: float
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TeamStats:
     """Comprehensive team statistics."""
     team_name: str
@@ -37,4 +42,32 @@ class TeamStats:
         total_games = self.wins + self.losses + self.ties
         if total_games == 0:
             return 0.0
-        return self.wins / total_games
\ No newline at end of file
+        return self.wins / total_games
+
+
+@dataclass(**SLOTS)
+class TeamStanding:
+    """A team's row in the league standings."""
+    name: str
+    team_key: str = ''
+    rank: int = 0
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    points_for: float = 0.0
+    points_against: float = 0.0
+    streak: str = ''
+    manager: str = ''
+
+
+
+@dataclass(**SLOTS)
+class LeagueEarnings:
+    """Weekly prize money won in one league-season, keyed by team key."""
+    league_key: str
+    league_name: str
+    season: int
+    team_names: Dict[str, str]
+    team_owners: Dict[str, str]
+    earnings: Dict[str, float]
+    scored_weeks: List[int]
@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from models.stats import SLOTS
+
+
 class Team:
     def __init__(self, team_id, team_name, manager, roster):
         self.team_id = team_id
@@ -24,4 +28,18 @@ class Team:
         return self.roster
 
     def __str__(self):
-        return f"{self.team_name} managed by {self.manager}"
\ No newline at end of file
+        return f"{self.team_name} managed by {self.manager}"
+
+@dataclass(**SLOTS)
+class TeamInfo:
+    """A team in a league as reported by Yahoo's teams resource."""
+    name: str
+    team_key: str = ''
+    team_id: str = ''
+    manager: str = ''
+    logo_url: str = ''
+    waiver_priority: int = 0
+    moves: int = 0
+    trades: int = 0
+    # Stable across seasons, unlike the nickname in ``manager``
+    manager_guid: str = ''
@@ -0,0 +1,77 @@
+"""HTTP API for league dashboards, served by Quart (ASGI) from one shared agent.
+
+    python src/server.py                                   # development server
+    hypercorn --chdir src "server:create_app()"
+
+The token comes from ``access_token``, ``YAHOO_ACCESS_TOKEN`` or, failing
+both, the session saved by ``python src/main.py`` ("stay signed in"), which
+is refreshed before it expires so the server keeps working past the hour.
+
+All requests share one pooled YahooFantasyClient (with its rate limiter and
+on-disk cache) and one FantasyFootballTreasurer, so concurrent viewers of the
+same league reuse each other's upstream calls.
+"""
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from quart import Quart
+
+from agent.agent import FantasyFootballTreasurer
+from agent.memo import LRUCache
+from agent.sync import SyncStore
+from api.cache import ResponseCache
+from api.endpoints import endpoints
+from api.yahoo_client import YahooFantasyClient
+from auth.oauth import YahooOAuth
+from auth.token_store import TokenStore
+
+# Rendered responses are reused this long; the agent and client cache below that
+RESPONSE_MAX_AGE = 60
+
+
+def create_app(agent: Optional[FantasyFootballTreasurer] = None, access_token: Optional[str] = None,
+               response_cache_size: int = 1024) -> Quart:
+    """Build the app; without an ``agent`` one is created when the server starts."""
+    app = Quart(__name__)
+    app.register_blueprint(endpoints)
+    app.extensions['response_cache'] = LRUCache(response_cache_size, max_age=RESPONSE_MAX_AGE)
+
+    @app.route('/metrics')
+    async def metrics():
+        body = app.extensions['treasurer'].client.metrics.prometheus()
+        return body, 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+    if agent is not None:
+        app.extensions['treasurer'] = agent
+        return app
+
+    @app.before_serving
+    async def open_client():
+        load_dotenv()
+        token = access_token or os.environ.get('YAHOO_ACCESS_TOKEN')
+        token_provider = None
+        if not token:
+            oauth = YahooOAuth.from_store(TokenStore())
+            if oauth is None:
+                raise RuntimeError("Set YAHOO_ACCESS_TOKEN, or sign in once with src/main.py and stay signed in")
+            token_provider = oauth.get_access_token
+        cache = ResponseCache()
+        client = YahooFantasyClient(token, cache=cache, token_provider=token_provider)
+        await client.__aenter__()
+        app.extensions['yahoo_cache'] = cache
+        app.extensions['yahoo_client'] = client
+        app.extensions['treasurer'] = FantasyFootballTreasurer(
+            client, sync_store=SyncStore(), metrics=client.metrics
+        )
+
+    @app.after_serving
+    async def close_client():
+        await app.extensions['yahoo_client'].close()
+        app.extensions['yahoo_cache'].close()
+
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(host=os.environ.get('FFT_HOST', '127.0.0.1'), port=int(os.environ.get('FFT_PORT', '5000')))
@@ -0,0 +1,316 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from api.cache import DEFAULT_CACHE_DIR
+from models.player import RosterPlayer
+from models.stats import LeagueEarnings, TeamStanding, WeeklyScore
+from models.team import TeamInfo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leagues (
+    league_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    num_teams INTEGER,
+    current_week INTEGER
+);
+CREATE TABLE IF NOT EXISTS owners (
+    owner TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    season INTEGER
+);
+CREATE TABLE IF NOT EXISTS teams (
+    team_key TEXT PRIMARY KEY,
+    league_key TEXT NOT NULL REFERENCES leagues (league_key),
+    season INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    owner TEXT REFERENCES owners (owner),
+    manager TEXT
+);
+CREATE TABLE IF NOT EXISTS weekly_scores (
+    league_key TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    team_key TEXT NOT NULL,
+    points REAL NOT NULL,
+    PRIMARY KEY (league_key, week, team_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS standings (
+    team_key TEXT PRIMARY KEY,
+    league_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    manager TEXT,
+    rank INTEGER,
+    wins INTEGER,
+    losses INTEGER,
+    ties INTEGER,
+    points_for REAL,
+    points_against REAL,
+    streak TEXT
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    team_key TEXT NOT NULL,
+    player_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position TEXT,
+    team TEXT,
+    status TEXT,
+    selected_position TEXT,
+    PRIMARY KEY (team_key, player_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS teams_owner_season ON teams (owner, season);
+CREATE INDEX IF NOT EXISTS teams_league ON teams (league_key);
+CREATE INDEX IF NOT EXISTS leagues_season ON leagues (season);
+CREATE INDEX IF NOT EXISTS standings_league_rank ON standings (league_key, rank);
+"""
+# Bumped when a table changes shape; version 2 keys owners by manager GUID
+SCHEMA_VERSION = 2
+
+# Each week's places within a league; ties go to the team listed first by name,
+# matching ScoreMatrix's display order
+_WEEKLY_PLACES = """
+SELECT s.league_key, s.week, s.team_key,
+       ROW_NUMBER() OVER (
+           PARTITION BY s.league_key, s.week
+           ORDER BY s.points DESC, t.name COLLATE NOCASE, s.team_key
+       ) AS place
+FROM weekly_scores s JOIN teams t ON t.team_key = s.team_key
+WHERE {where} AND s.week BETWEEN ? AND ?
+"""
+
+
+class Warehouse:
+    """Local SQLite store of league history for offline reports.
+
+    ``weekly_scores`` is keyed (league_key, week, team_key) so per-league,
+    per-week scans are index range reads; ``teams`` is indexed on
+    (owner, season) for cross-season owner queries. Owners are keyed by
+    Yahoo manager GUID, like ``OwnerIndex``, and shown under the nickname
+    from the newest season stored.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        path = str(path) if path else str(DEFAULT_CACHE_DIR / 'warehouse.sqlite3')
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Older warehouses keyed owners by nickname; the next ingest stores the teams again
+            self._conn.executescript("DROP TABLE IF EXISTS teams; DROP TABLE IF EXISTS owners;")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -- writes ---------------------------------------------------------------
+
+    def add_league(self, league: Dict) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO leagues (league_key, name, season, num_teams, current_week)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (league['league_key'], league['name'], league['season'],
+                 league.get('num_teams'), league.get('current_week'))
+            )
+
+    def add_teams(self, league: Dict, teams: Iterable[TeamInfo]) -> None:
+        """Store a league's teams, owned by their manager's GUID.
+
+        Teams whose GUID Yahoo hides fall back to the manager nickname (or the
+        team name) as the owner, as ``aggregate_owner_earnings`` does online.
+        """
+        season = league['season']
+        rows = [(team.team_key, league['league_key'], season, team.name,
+                 team.manager_guid or team.manager or team.name, team.manager)
+                for team in teams]
+        with self._conn:
+            # Each owner keeps the nickname from the newest season stored
+            self._conn.executemany(
+                "INSERT INTO owners (owner, name, season) VALUES (?, ?, ?)"
+                " ON CONFLICT (owner) DO UPDATE SET name = excluded.name, season = excluded.season"
+                " WHERE excluded.season >= owners.season",
+                [(owner, manager or name, season) for _, _, _, name, owner, manager in rows]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO teams (team_key, league_key, season, name, owner, manager)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def add_weekly_scores(self, league_key: str, scores_by_week: Dict[int, Iterable[WeeklyScore]]) -> None:
+        rows = [(league_key, week, score.team_key or score.team_name, score.points)
+                for week, scores in scores_by_week.items() for score in scores]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO weekly_scores (league_key, week, team_key, points) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def add_standings(self, league_key: str, standings: Iterable[TeamStanding]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO standings"
+                " (team_key, league_key, name, manager, rank, wins, losses, ties, points_for, points_against, streak)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(team.team_key, league_key, team.name, team.manager, team.rank, team.wins, team.losses,
+                  team.ties, team.points_for, team.points_against, team.streak) for team in standings]
+            )
+
+    def add_rosters(self, rosters: Dict[str, List[RosterPlayer]]) -> None:
+        with self._conn:
+            self._conn.executemany("DELETE FROM rosters WHERE team_key = ?", [(key,) for key in rosters])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rosters"
+                " (team_key, player_key, name, position, team, status, selected_position)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(team_key, player.player_key, player.name, player.position, player.team,
+                  player.status, player.selected_position)
+                 for team_key, players in rosters.items() for player in players]
+            )
+
+    # -- queries --------------------------------------------------------------
+
+    def leagues(self, league_keys: Sequence[str] = (), name: str = '',
+                seasons: Optional[tuple] = None) -> List[Dict]:
+        """Stored leagues, optionally by key, name substring and (start, end) season range."""
+        sql = "SELECT league_key, name, season, num_teams, current_week FROM leagues WHERE instr(lower(name), ?) > 0"
+        params: list = [name.lower()]
+        if league_keys:
+            sql += f" AND league_key IN ({','.join('?' * len(league_keys))})"
+            params.extend(league_keys)
+        if seasons:
+            sql += " AND season BETWEEN ? AND ?"
+            params.extend(seasons)
+        sql += " ORDER BY season, name"
+        return [
+            {'name': name, 'league_id': league_key.rsplit('.', 1)[-1], 'league_key': league_key,
+             'num_teams': num_teams, 'current_week': current_week, 'season': season}
+            for league_key, name, season, num_teams, current_week in self._conn.execute(sql, params)
+        ]
+
+    def standings(self, league_key: str) -> List[TeamStanding]:
+        rows = self._conn.execute(
+            "SELECT name, team_key, rank, wins, losses, ties, points_for, points_against, streak, manager"
+            " FROM standings WHERE league_key = ? ORDER BY rank",
+            (league_key,)
+        )
+        return [TeamStanding(*row) for row in rows]
+
+    def league_earnings(self, leagues: List[Dict], prizes: Sequence[float],
+                        weeks: Iterable[int]) -> List[LeagueEarnings]:
+        """Weekly prize totals per league, ranked and summed in SQL.
+
+        Mirrors ``FantasyFootballTreasurer.get_all_league_earnings`` for a
+        contiguous week range.
+        """
+        weeks = sorted(set(weeks))
+        if not leagues or not weeks:
+            return []
+        league_keys = [league['league_key'] for league in leagues]
+        placeholders = ','.join('?' * len(league_keys))
+        prize_case = ' '.join(f"WHEN {place} THEN ?" for place in range(1, len(prizes) + 1))
+
+        earnings: Dict[str, Dict[str, float]] = {key: {} for key in league_keys}
+        rows = self._conn.execute(
+            f"WITH places AS ({_WEEKLY_PLACES.format(where=f's.league_key IN ({placeholders})')}),"
+            f" won AS (SELECT team_key, SUM(CASE place {prize_case} ELSE 0 END) AS amount"
+            f"         FROM places GROUP BY team_key)"
+            f" SELECT t.league_key, t.team_key, COALESCE(won.amount, 0)"
+            f" FROM teams t LEFT JOIN won ON won.team_key = t.team_key"
+            f" WHERE t.league_key IN ({placeholders})",
+            [*league_keys, weeks[0], weeks[-1], *prizes, *league_keys]
+        )
+        for league_key, team_key, amount in rows:
+            earnings[league_key][team_key] = float(amount)
+
+        names: Dict[str, Dict[str, str]] = {key: {} for key in league_keys}
+        owners: Dict[str, Dict[str, str]] = {key: {} for key in league_keys}
+        for league_key, team_key, name, owner in self._conn.execute(
+            f"SELECT t.league_key, t.team_key, t.name, o.name"
+            f" FROM teams t LEFT JOIN owners o ON o.owner = t.owner WHERE t.league_key IN ({placeholders})",
+            league_keys
+        ):
+            names[league_key][team_key] = name
+            owners[league_key][team_key] = owner or name
+
+        scored: Dict[str, List[int]] = {key: [] for key in league_keys}
+        for league_key, week in self._conn.execute(
+            f"SELECT DISTINCT league_key, week FROM weekly_scores"
+            f" WHERE league_key IN ({placeholders}) AND week BETWEEN ? AND ? ORDER BY week",
+            [*league_keys, weeks[0], weeks[-1]]
+        ):
+            scored[league_key].append(week)
+
+        return [
+            LeagueEarnings(
+                league_key=league['league_key'],
+                league_name=league['name'],
+                season=league['season'],
+                team_names=names[league['league_key']],
+                team_owners=owners[league['league_key']],
+                earnings=earnings[league['league_key']],
+                scored_weeks=scored[league['league_key']]
+            )
+            for league in leagues
+        ]
+
+    def owner_earnings(self, leagues: List[Dict], prizes: Sequence[float],
+                       weeks: Iterable[int]) -> Dict[str, Dict]:
+        """Prize money per owner across ``leagues``, in ``aggregate_owner_earnings`` shape.
+
+        Places are ranked and summed per (owner, season) entirely in SQL, so a
+        manager who renamed between seasons is still one owner.
+        """
+        weeks = sorted(set(weeks))
+        if not leagues or not weeks:
+            return {}
+        league_keys = [league['league_key'] for league in leagues]
+        placeholders = ','.join('?' * len(league_keys))
+        prize_case = ' '.join(f"WHEN {place} THEN ?" for place in range(1, len(prizes) + 1))
+        rows = self._conn.execute(
+            f"WITH places AS ({_WEEKLY_PLACES.format(where=f's.league_key IN ({placeholders})')}),"
+            f" won AS (SELECT team_key, SUM(CASE place {prize_case} ELSE 0 END) AS amount"
+            f"         FROM places GROUP BY team_key)"
+            f" SELECT COALESCE(o.name, t.owner, t.name), t.season, COALESCE(SUM(won.amount), 0)"
+            f" FROM teams t LEFT JOIN owners o ON o.owner = t.owner LEFT JOIN won ON won.team_key = t.team_key"
+            f" WHERE t.league_key IN ({placeholders})"
+            f" GROUP BY t.owner, t.season",
+            [*league_keys, weeks[0], weeks[-1], *prizes, *league_keys]
+        )
+        owner_totals: Dict[str, Dict] = {}
+        for owner, season, amount in rows:
+            totals = owner_totals.setdefault(owner, {'total': 0, 'years': {}})
+            totals['total'] += amount
+            totals['years'][season] = totals['years'].get(season, 0) + amount
+        return owner_totals
+
+
+async def ingest_league(agent, warehouse: Warehouse, league: Dict, weeks: Optional[Iterable[int]] = None,
+                        rosters: bool = False) -> None:
+    """Parse one league through the agent and store it.
+
+    ``weeks`` defaults to every week up to the league's current week.
+    """
+    league_key = league['league_key']
+    if weeks is None:
+        weeks = range(1, int(league.get('current_week') or 17) + 1)
+    teams, standings, scores_by_week = await asyncio.gather(
+        agent.get_all_teams_info(league_key),
+        agent.get_league_standings(league_key),
+        agent.get_weekly_scores_many(league_key, weeks)
+    )
+    warehouse.add_league(league)
+    warehouse.add_teams(league, teams)
+    warehouse.add_standings(league_key, standings)
+    warehouse.add_weekly_scores(league_key, scores_by_week)
+    if rosters and teams:
+        warehouse.add_rosters(await agent.get_team_rosters([team.team_key for team in teams]))
+
+
+async def ingest_leagues(agent, warehouse: Warehouse, leagues: List[Dict],
+                         weeks: Optional[Iterable[int]] = None, rosters: bool = False) -> None:
+    """Ingest several leagues concurrently (bounded by the agent's concurrency cap)."""
+    weeks = list(weeks) if weeks is not None else None
+    await asyncio.gather(*(ingest_league(agent, warehouse, league, weeks, rosters) for league in leagues))
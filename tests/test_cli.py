@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from agent.agent import FantasyFootballTreasurer
+from agent.owners import OwnerIndex
+from cli import build_parser, parse_weeks, run_command, run_offline, select_leagues
+from main import aggregate_owner_earnings
+from storage.warehouse import Warehouse, ingest_leagues
+from tests.test_owners import LEAGUES, for_league, renamed_teams
+from tests.test_treasurer import FakeClient, scoreboard_payload, teams_payload, user_games_payload
+
+
+class TestArguments(unittest.TestCase):
+
+    def test_week_ranges(self):
+        self.assertEqual(parse_weeks('14'), range(1, 15))
+        self.assertEqual(parse_weeks('3-5'), range(3, 6))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_weeks('5-3')
+
+    def test_treasurer_arguments(self):
+        args = build_parser().parse_args([
+            '--format', 'json', 'treasurer', '--league-key', '449.l.1', '423.l.1',
+            '--seasons', '2023-2024', '--weeks', '4', '--prizes', '20', '10', '5'
+        ])
+        self.assertEqual(args.league_key, ['449.l.1', '423.l.1'])
+        self.assertEqual(args.seasons, (2023, 2024))
+        self.assertEqual(args.prizes, [20.0, 10.0, 5.0])
+
+
+class TestRunCommand(unittest.IsolatedAsyncioTestCase):
+
+    async def test_treasurer_filters_leagues_and_reports_owners(self):
+        client = FakeClient(
+            get_all_nfl_games=user_games_payload({2023: '423', 2024: '449'}, with_leagues=False),
+            get_leagues_by_game_keys=user_games_payload({2023: '423', 2024: '449'}),
+            get_all_teams=teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        args = build_parser().parse_args(
+            ['treasurer', '--seasons', '2024', '--weeks', '4', '--prizes', '20', '10', '5'])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report = await run_command(FantasyFootballTreasurer(client), args)
+
+        self.assertEqual([league['season'] for league in report['leagues']], [2024])
+        self.assertEqual(report['owners']['owner4']['total'], 80.0)
+        self.assertIn('449.l.1', output.getvalue())
+
+    async def test_seasons_before_the_default_range_are_listed(self):
+        seasons = {2015: '348', 2016: '359', 2023: '423'}
+        client = FakeClient(
+            get_all_nfl_games=user_games_payload(seasons, with_leagues=False),
+            get_leagues_by_game_keys=lambda keys: user_games_payload(
+                {season: key for season, key in seasons.items() if key in keys}),
+        )
+        args = build_parser().parse_args(['ingest', '--seasons', '2014-2016'])
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            leagues = await select_leagues(FantasyFootballTreasurer(client), args)
+        self.assertEqual([league['season'] for league in leagues], [2015, 2016])
+        self.assertIn('no leagues found for season(s) 2014', errors.getvalue())
+
+
+class TestOffline(unittest.IsolatedAsyncioTestCase):
+
+    async def test_treasurer_from_warehouse(self):
+        client = FakeClient(
+            get_all_teams=teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        warehouse = Warehouse(':memory:')
+        self.addCleanup(warehouse.close)
+        league = {'league_key': '449.l.1', 'name': 'Office League', 'season': 2024, 'current_week': 4}
+        await ingest_leagues(FantasyFootballTreasurer(client), warehouse, [league])
+
+        args = build_parser().parse_args(
+            ['--offline', 'treasurer', '--league-name', 'office', '--weeks', '4', '--prizes', '20', '10', '5'])
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = run_offline(warehouse, args)
+        self.assertEqual(report['owners']['owner4']['total'], 80.0)
+
+    async def test_renamed_manager_is_one_owner_offline_as_online(self):
+        client = FakeClient(
+            get_all_teams=renamed_teams,
+            get_league_scoreboards=lambda league_key, weeks: for_league(scoreboard_payload(weeks), league_key),
+        )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        agent = FantasyFootballTreasurer(client, owner_index=OwnerIndex(Path(tmp.name) / 'owners.json'))
+        warehouse = Warehouse(':memory:')
+        self.addCleanup(warehouse.close)
+        await ingest_leagues(agent, warehouse, [{**league, 'current_week': 4} for league in LEAGUES])
+        online = aggregate_owner_earnings(
+            await agent.get_all_league_earnings(LEAGUES, (20, 10, 5), range(1, 5)), agent.owner_index)
+
+        args = build_parser().parse_args(
+            ['--offline', 'treasurer', '--league-name', 'office', '--weeks', '4', '--prizes', '20', '10', '5'])
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = run_offline(warehouse, args)
+        self.assertEqual(report['owners'], online)
+        self.assertEqual(report['owners']['owner4'], {'total': 160.0, 'years': {2023: 80.0, 2024: 80.0}})
+        self.assertNotIn('old-owner4', report['owners'])
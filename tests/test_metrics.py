@@ -0,0 +1,82 @@
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from agent.agent import FantasyFootballTreasurer
+from api.cache import ResponseCache
+from api.metrics import Histogram, Metrics, endpoint_label
+from api.yahoo_client import YahooFantasyClient
+from tests.test_treasurer import FakeClient, scoreboard_payload, teams_payload
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_endpoint_labels_drop_keys_and_parameters(self):
+        self.assertEqual(endpoint_label('league/449.l.1/scoreboard;week=1,2?format=json'),
+                         'league/{key}/scoreboard;week')
+        self.assertEqual(endpoint_label('team/449.l.1.t.3/roster?format=json'), 'team/{key}/roster')
+
+    def test_histogram_quantiles_stay_within_observed_range(self):
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for value in (0.005, 0.05, 0.05, 0.5):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1, 0])
+        self.assertTrue(0.01 <= histogram.quantile(0.5) <= 0.1)
+        self.assertLessEqual(histogram.quantile(0.99), 0.5)
+
+    def test_prometheus_export(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe('request_seconds', 0.5, endpoint='league/{key}')
+        metrics.increment('cache_hits', endpoint='league/{key}')
+        text = metrics.prometheus()
+        self.assertIn('# TYPE fft_request_seconds histogram', text)
+        self.assertIn('fft_request_seconds_bucket{endpoint="league/{key}",le="1"} 1', text)
+        self.assertIn('fft_request_seconds_bucket{endpoint="league/{key}",le="+Inf"} 1', text)
+        self.assertIn('fft_cache_hits_total{endpoint="league/{key}"} 1', text)
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+
+    async def test_client_records_latency_bytes_and_cache_hits(self):
+        async def handler(request):
+            return web.json_response({'fantasy_content': {}})
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        cache = ResponseCache(':memory:')
+        self.addCleanup(cache.close)
+
+        async with YahooFantasyClient('token', base_url=str(server.make_url('')), cache=cache) as client:
+            await client.get_league_standings('449.l.1')
+            await client.get_league_standings('449.l.1')
+        metrics = client.metrics
+
+        label = (('endpoint', 'league/{key}/standings'),)
+        self.assertEqual(metrics.histograms[('request_seconds', label)].count, 1)
+        self.assertEqual(metrics.histograms[('decode_seconds', label)].count, 2)
+        self.assertEqual(metrics.counters[('cache_hits', label)], 1)
+        self.assertEqual(metrics.counters[('cache_misses', label)], 1)
+        self.assertGreater(metrics.counter_total('response_bytes'), 0)
+        self.assertIn('cache hits: 1/2', metrics.summary())
+
+    async def test_agent_methods_are_timed(self):
+        agent = FantasyFootballTreasurer(FakeClient(get_all_teams=teams_payload('Alpha', 'Bravo')))
+        await agent.get_all_teams_info('449.l.1')
+        await agent.get_all_teams_info('449.l.1')
+        timed = agent.metrics.histograms[('method_seconds', (('method', 'get_all_teams_info'),))]
+        self.assertEqual(timed.count, 2)
+
+    async def test_streams_are_timed_until_closed(self):
+        agent = FantasyFootballTreasurer(FakeClient(
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks)))
+        stream = agent.stream_weekly_scores('449.l.1', range(1, 5))
+        async for week, _ in stream:
+            if week == 2:
+                break
+        await stream.aclose()
+        timed = agent.metrics.histograms[('method_seconds', (('method', 'stream_weekly_scores'),))]
+        self.assertEqual(timed.count, 1)
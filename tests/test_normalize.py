@@ -0,0 +1,37 @@
+import unittest
+
+from api.normalize import child, content, first_manager, flatten, iter_collection
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_iter_collection_skips_count(self):
+        collection = {'0': {'team': 'a'}, '1': {'team': 'b'}, 'count': 2}
+        self.assertEqual(list(iter_collection(collection, 'team')), ['a', 'b'])
+        self.assertEqual(list(iter_collection([{'team': 'a'}], 'team')), ['a'])
+        self.assertEqual(list(iter_collection(None, 'team')), [])
+
+    def test_child_unwraps_dict_zero_and_list_shapes(self):
+        self.assertEqual(child({'teams': 1}, 'teams'), 1)
+        self.assertEqual(child({'0': {'teams': 2}, 'week': '1'}, 'teams'), 2)
+        self.assertEqual(child([{'league_key': 'k'}, {'teams': 3}], 'teams'), 3)
+        self.assertIsNone(child('not a node', 'teams'))
+
+    def test_flatten_merges_metadata_and_subresources(self):
+        team = [
+            [{'team_key': '449.l.1.t.1'}, {'name': 'Alpha'}, [], {'managers': [{'manager': {'nickname': 'Al'}}]}],
+            {'team_points': {'total': '101.5'}},
+        ]
+        flat = flatten(team)
+        self.assertEqual(flat['name'], 'Alpha')
+        self.assertEqual(flat['team_points']['total'], '101.5')
+        self.assertEqual(first_manager(flat['managers'])['nickname'], 'Al')
+        self.assertEqual(first_manager(None), {})
+
+    def test_content(self):
+        self.assertEqual(content({'fantasy_content': {'league': [1]}}, 'league'), [1])
+        self.assertIsNone(content(None, 'league'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import stat
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from api.errors import AuthenticationError
+from api.yahoo_client import YahooFantasyClient
+from auth.oauth import YahooOAuth
+from auth.token_store import Fernet, OAuthToken, TokenStore
+
+
+class TestOAuthRefresh(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.token_requests = []
+        self.api_tokens = []
+        self.refresh_status = 200
+
+        async def token(request):
+            form = await request.post()
+            self.token_requests.append(dict(form))
+            await asyncio.sleep(0.01)
+            if self.refresh_status != 200:
+                return web.json_response({'error': 'invalid_grant'}, status=self.refresh_status)
+            return web.json_response({'access_token': f"access-{len(self.token_requests)}", 'expires_in': 3600})
+
+        async def api(request):
+            self.api_tokens.append(request.headers['Authorization'])
+            return web.json_response({'fantasy_content': {}})
+
+        app = web.Application()
+        app.router.add_post('/oauth2/get_token', token)
+        app.router.add_get('/{tail:.*}', api)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TokenStore(Path(self.tmp.name) / 'session.json')
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.tmp.cleanup()
+
+    def oauth(self, expires_in: float) -> YahooOAuth:
+        token = OAuthToken('access-0', refresh_token='refresh-1', expires_at=time.time() + expires_in)
+        oauth = YahooOAuth('id', 'secret', token_store=self.store, token=token)
+        oauth.TOKEN_URL = str(self.server.make_url('/oauth2/get_token'))
+        return oauth
+
+    async def test_valid_token_is_not_refreshed(self):
+        oauth = self.oauth(expires_in=3600)
+        self.assertEqual(await oauth.get_access_token(), 'access-0')
+        self.assertEqual(self.token_requests, [])
+
+    async def test_parallel_callers_share_one_refresh(self):
+        oauth = self.oauth(expires_in=30)
+        tokens = await asyncio.gather(*[oauth.get_access_token() for _ in range(10)])
+        self.assertEqual(set(tokens), {'access-1'})
+        self.assertEqual(len(self.token_requests), 1)
+        self.assertEqual(self.token_requests[0]['grant_type'], 'refresh_token')
+        # Yahoo did not send a new refresh token, so the old one is kept and saved
+        self.assertEqual(oauth.token.refresh_token, 'refresh-1')
+        self.assertEqual(YahooOAuth.from_store(self.store).token.access_token, 'access-1')
+
+    async def test_failed_refresh_forgets_the_saved_session(self):
+        oauth = self.oauth(expires_in=0)
+        oauth.save()
+        self.refresh_status = 400
+        with self.assertRaises(AuthenticationError):
+            await oauth.get_access_token()
+        self.assertIsNone(self.store.load())
+
+    async def test_client_sends_the_refreshed_token(self):
+        oauth = self.oauth(expires_in=3600)
+        async with YahooFantasyClient(None, base_url=str(self.server.make_url('')), requests_per_second=None,
+                                      token_provider=oauth.get_access_token) as client:
+            await client.get_league_info('449.l.1')
+            oauth.token.expires_at = time.time()
+            await client.get_league_standings('449.l.1')
+        self.assertEqual(self.api_tokens, ['Bearer access-0', 'Bearer access-1'])
+
+
+class TestTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'session.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_session_round_trip_is_private(self):
+        token = OAuthToken.from_response({'access_token': 'a', 'refresh_token': 'r', 'expires_in': 3600})
+        YahooOAuth('id', 'secret', 'me@example.com', token=token).save(TokenStore(self.path))
+        oauth = YahooOAuth.from_store(TokenStore(self.path))
+        self.assertEqual(oauth.token, token)
+        self.assertFalse(oauth.token.expires_within(60))
+        if os.name == 'posix':
+            self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o600)
+
+    def test_missing_or_corrupt_session(self):
+        store = TokenStore(self.path)
+        self.assertIsNone(YahooOAuth.from_store(store))
+        self.path.write_text('{not json')
+        self.assertIsNone(store.load())
+
+    @unittest.skipIf(Fernet is None, "cryptography is not installed")
+    def test_encrypted_session(self):
+        key = TokenStore.generate_key()
+        TokenStore(self.path, key=key).save({'token': {'access_token': 'secret-token'}})
+        self.assertNotIn(b'secret-token', self.path.read_bytes())
+        self.assertEqual(TokenStore(self.path, key=key).load()['token']['access_token'], 'secret-token')
+        self.assertIsNone(TokenStore(self.path, key=TokenStore.generate_key()).load())
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from agent.agent import FantasyFootballTreasurer
+from agent.owners import OwnerIndex
+from main import aggregate_owner_earnings, multi_year_treasurer
+from models.team import TeamInfo
+from tests.test_treasurer import FakeClient, scoreboard_payload, teams_payload
+
+LEAGUES = [{'league_key': '423.l.1', 'league_id': '1', 'name': 'Office League', 'season': 2023},
+           {'league_key': '449.l.1', 'league_id': '1', 'name': 'Office League', 'season': 2024}]
+
+
+def for_league(payload, league_key):
+    """A test payload with its ``449.l.1`` keys rewritten to another league's."""
+    return json.loads(json.dumps(payload).replace('449.l.1', league_key))
+
+
+def renamed_teams(league_key):
+    """Same four managers (GUID1-4) each season, under per-season team names and nicknames."""
+    payload = for_league(teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'), league_key)
+    if league_key.startswith('423'):
+        payload = json.loads(json.dumps(payload).replace('"owner', '"old-owner'))
+    return payload
+
+
+class TestOwnerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'owners.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_newest_nickname_names_the_owner_in_every_season(self):
+        index = OwnerIndex(self.path)
+        self.assertTrue(index.add_teams('449.l.1', [TeamInfo('Bolts', '449.l.1.t.1', manager='Sam', manager_guid='G1')], 2024))
+        self.assertTrue(index.add_teams('423.l.1', [TeamInfo('Chargers', '423.l.1.t.5', manager='Sammy', manager_guid='G1')], 2023))
+        self.assertEqual(index.owner_of('423.l.1.t.5'), 'Sam')
+        self.assertEqual(index.owner_of('449.l.1.t.1'), 'Sam')
+        self.assertIsNone(index.owner_of('449.l.1.t.9'))
+        self.assertFalse(index.add_teams('449.l.1', [TeamInfo('Bolts', '449.l.1.t.1', manager='Sam', manager_guid='G1')], 2024))
+
+        index.save()
+        loaded = OwnerIndex(self.path)
+        self.assertEqual(len(loaded), 1)
+        self.assertTrue(loaded.has_league('423.l.1'))
+        self.assertEqual(loaded.guid_of('423.l.1.t.5'), 'G1')
+        self.assertEqual(loaded.league_teams('423.l.1'), {'423.l.1.t.5': 'Chargers'})
+
+    def test_unreadable_index_starts_empty(self):
+        self.path.write_text('{"owners": []}')
+        self.assertEqual(len(OwnerIndex(self.path)), 0)
+
+
+class TestMultiYearOwners(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'owners.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_agent(self):
+        client = FakeClient(
+            get_all_teams=renamed_teams,
+            get_league_scoreboards=lambda league_key, weeks: for_league(scoreboard_payload(weeks), league_key),
+        )
+        return client, FantasyFootballTreasurer(client, owner_index=OwnerIndex(self.path))
+
+    async def test_renamed_managers_are_one_owner_and_indexed_teams_are_not_refetched(self):
+        client, agent = self.make_agent()
+        results = await agent.get_all_league_earnings(LEAGUES, (20, 10, 5), range(1, 3))
+        owners = aggregate_owner_earnings(results, agent.owner_index)
+        self.assertEqual(set(owners), {'owner1', 'owner2', 'owner3', 'owner4'})
+        self.assertEqual(owners['owner4'], {'total': 80.0, 'years': {2023: 40.0, 2024: 40.0}})
+        self.assertEqual(sum(name == 'get_all_teams' for name, _ in client.calls), 2)
+
+        client, agent = self.make_agent()
+        results = await agent.get_all_league_earnings(LEAGUES, (20, 10, 5), range(1, 3))
+        self.assertEqual([name for name, _ in client.calls], ['get_league_scoreboards'] * 2)
+        self.assertEqual(results[0].team_owners['423.l.1.t.4'], 'owner4')
+        self.assertEqual(results[0].team_names['423.l.1.t.1'], 'Alpha')
+
+    async def test_multi_year_treasurer_reports_owners_by_guid(self):
+        _, agent = self.make_agent()
+        answers = iter(['2023', '2024', 'Office', '20', '10', '5', '2'])
+        output = io.StringIO()
+        with mock.patch('builtins.input', lambda prompt='': next(answers)), contextlib.redirect_stdout(output):
+            await multi_year_treasurer(agent, LEAGUES)
+        report = output.getvalue()
+        self.assertIn('Delta -> owner4', report)
+        self.assertNotIn('old-owner', report)
+        self.assertIn('GRAND TOTAL PAID OUT: $140.00', report)
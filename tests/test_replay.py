@@ -0,0 +1,82 @@
+import tempfile
+import time
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from agent.agent import FantasyFootballTreasurer
+from api.errors import NotFoundError, RateLimitedError
+from api.replay import FixtureStore, ReplayServer, fixture_name
+from api.retry import RetryPolicy
+from api.yahoo_client import YahooFantasyClient
+from tests.test_treasurer import scoreboard_payload, teams_payload
+
+
+class TestRecordAndReplay(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fixture_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.fixture_dir.cleanup)
+
+        async def yahoo(request):
+            if request.path.endswith('/teams'):
+                return web.json_response(teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'))
+            return web.json_response(scoreboard_payload([1, 2, 3]))
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', yahoo)
+        self.yahoo = TestServer(app)
+        await self.yahoo.start_server()
+        self.addAsyncCleanup(self.yahoo.close)
+
+    async def record(self):
+        async with YahooFantasyClient('token', base_url=str(self.yahoo.make_url('')),
+                                      record_dir=self.fixture_dir.name) as client:
+            agent = FantasyFootballTreasurer(client)
+            return await agent.get_league_earnings(
+                {'league_key': '449.l.1', 'name': 'Office League', 'season': 2024}, (20, 10, 5), [1, 2, 3])
+
+    async def test_replayed_run_matches_recorded_run(self):
+        recorded = await self.record()
+
+        async with ReplayServer(self.fixture_dir.name) as server:
+            async with YahooFantasyClient('token', base_url=server.url) as client:
+                agent = FantasyFootballTreasurer(client)
+                replayed = await agent.get_league_earnings(
+                    {'league_key': '449.l.1', 'name': 'Office League', 'season': 2024}, (20, 10, 5), [1, 2, 3])
+                with self.assertRaises(NotFoundError):
+                    await client.get_league_standings('449.l.1')
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(server.requests, 3)
+
+    async def test_injected_latency_and_throttling(self):
+        await self.record()
+        async with ReplayServer(self.fixture_dir.name, latency=0.05, error_rate=1.0, seed=1) as server:
+            async with YahooFantasyClient('token', base_url=server.url, requests_per_second=None,
+                                          retry_policy=RetryPolicy(max_attempts=1)) as client:
+                start = time.perf_counter()
+                with self.assertRaises(RateLimitedError) as raised:
+                    await client.get_all_teams('449.l.1')
+                elapsed = time.perf_counter() - start
+
+        self.assertEqual(raised.exception.retry_after, 1)
+        self.assertEqual(server.throttled, 1)
+        self.assertGreaterEqual(elapsed, 0.05)
+
+
+class TestFixtureStore(unittest.TestCase):
+
+    def test_names_are_safe_and_distinct(self):
+        name = fixture_name('league/449.l.1/scoreboard;week=1,2?format=json')
+        self.assertNotIn('/', name)
+        self.assertNotEqual(name, fixture_name('league/449.l.1/scoreboard;week=1,3?format=json'))
+        self.assertEqual(fixture_name('/league/1?format=json'), fixture_name('league/1?format=json'))
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FixtureStore(directory)
+            store.save('league/1?format=json', b'{"a": 1}')
+            self.assertEqual(store.load('league/1?format=json'), b'{"a": 1}')
+            self.assertIsNone(store.load('league/2?format=json'))
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from models.score_matrix import ScoreMatrix
+from models.stats import WeeklyScore
+
+
+def scores(week, points_by_team):
+    return [WeeklyScore(team_name=name, week=week, points=points, team_key=f'k.{name}')
+            for name, points in points_by_team.items()]
+
+
+class TestScoreMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = ScoreMatrix.from_weekly_scores({
+            1: scores(1, {'Delta': 90.0, 'alpha': 120.5, 'Charlie': 101.0, 'Bravo': 130.0}),
+            2: scores(2, {'Delta': 140.0, 'alpha': 80.0, 'Charlie': 99.0, 'Bravo': 100.0}),
+            3: [],
+        })
+
+    def test_rows_sorted_by_name_with_missing_weeks_as_nan(self):
+        self.assertEqual(self.matrix.names, ['alpha', 'Bravo', 'Charlie', 'Delta'])
+        self.assertEqual(self.matrix.teams[0], 'k.alpha')
+        self.assertEqual(self.matrix.weeks, [1, 2, 3])
+        self.assertTrue(np.isnan(self.matrix.points[:, 2]).all())
+        self.assertEqual(self.matrix.weeks_with_scores(), [1, 2])
+
+    def test_top_k_orders_best_first(self):
+        top = self.matrix.top_k(3)
+        names = self.matrix.names
+        self.assertEqual([names[row] for row in top[:, 0]], ['Bravo', 'alpha', 'Charlie'])
+        self.assertEqual([names[row] for row in top[:, 1]], ['Delta', 'Bravo', 'Charlie'])
+        self.assertEqual(top[:, 2].tolist(), [-1, -1, -1])
+
+    def test_top_k_larger_than_league(self):
+        top = self.matrix.top_k(6)
+        self.assertEqual(top[4:, 0].tolist(), [-1, -1])
+
+    def test_prize_totals(self):
+        totals = self.matrix.prize_totals((20, 10, 5))
+        self.assertEqual(totals, {'k.alpha': 10.0, 'k.Bravo': 30.0, 'k.Charlie': 10.0, 'k.Delta': 20.0})
+        self.assertEqual(self.matrix.prize_matrix((20, 10, 5)).sum(), 70.0)
+
+    def test_first_weeks_and_point_totals(self):
+        first = self.matrix.first_weeks(1)
+        self.assertEqual(first.weeks, [1])
+        self.assertEqual(first.point_totals()['k.Delta'], 90.0)
+        self.assertEqual(self.matrix.point_totals()['k.Delta'], 230.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
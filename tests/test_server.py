@@ -0,0 +1,116 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import quart  # noqa: F401
+except ImportError:  # the API server is an optional extra
+    quart = None
+
+from agent.agent import FantasyFootballTreasurer
+from api.cache import ResponseCache
+from auth.oauth import YahooOAuth
+from auth.token_store import OAuthToken, TokenStore
+from tests.test_treasurer import FakeClient, scoreboard_payload, standings_payload, teams_payload
+
+if quart is not None:
+    from server import create_app
+
+
+@unittest.skipIf(quart is None, "quart is not installed")
+class TestEndpoints(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.client = FakeClient(
+            get_all_teams=teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_standings=standings_payload(),
+            get_matchups=lambda league_key, week: scoreboard_payload([week]),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        self.app = create_app(FantasyFootballTreasurer(self.client))
+        self.http = self.app.test_client()
+
+    def upstream_calls(self):
+        return len(self.client.calls)
+
+    async def test_standings(self):
+        response = await self.http.get('/standings?league_key=449.l.1')
+        self.assertEqual(response.status_code, 200)
+        body = await response.get_json()
+        self.assertEqual([row['name'] for row in body['standings']], ['Alpha', 'Bravo'])
+
+    async def test_team_combines_profile_and_record(self):
+        response = await self.http.get('/teams/449.l.1.t.2')
+        body = await response.get_json()
+        self.assertEqual(body['name'], 'Bravo')
+        self.assertEqual(body['standing']['rank'], 1)
+        self.assertEqual((await self.http.get('/teams/449.l.1.t.9')).status_code, 404)
+
+    async def test_season_stats(self):
+        response = await self.http.get('/season_stats?league_key=449.l.1&weeks=4&prizes=20,10,5')
+        body = await response.get_json()
+        self.assertEqual(body['weeks'], [1, 2, 3, 4])
+        self.assertEqual(body['teams'][0]['name'], 'Delta')
+        self.assertEqual(body['teams'][0]['finishes'], {'first': 4, 'second': 0, 'third': 0})
+        self.assertEqual(body['teams'][0]['earnings'], 80.0)
+
+    async def test_responses_are_cached_and_revalidated(self):
+        first = await self.http.get('/matchups?league_key=449.l.1&week=3')
+        calls = self.upstream_calls()
+        etag = first.headers['ETag']
+        self.assertNotIn('Last-Modified', first.headers)
+
+        again = await self.http.get('/matchups?week=3&league_key=449.l.1')
+        self.assertEqual(await again.get_data(), await first.get_data())
+        self.assertEqual(self.upstream_calls(), calls)
+
+        not_modified = await self.http.get('/matchups?league_key=449.l.1&week=3', headers={'If-None-Match': etag})
+        self.assertEqual(not_modified.status_code, 304)
+        since = await self.http.get('/matchups?league_key=449.l.1&week=3',
+                                    headers={'If-Modified-Since': 'Wed, 21 Oct 2099 07:28:00 GMT'})
+        self.assertEqual(since.status_code, 200)
+
+    async def test_metrics_come_from_the_agents_client(self):
+        self.client.metrics.increment('responses', endpoint='league', status='200')
+        response = await self.http.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+        self.assertIn('fft_responses', (await response.get_data()).decode())
+
+    async def test_missing_parameter_is_a_bad_request(self):
+        response = await self.http.get('/standings')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_weeks_outside_the_season_are_rejected_before_any_upstream_call(self):
+        for path in ('/season_stats?league_key=449.l.1&weeks=1-5000', '/season_stats?league_key=449.l.1&weeks=0-3',
+                     '/season_stats?league_key=449.l.1&weeks=9-3', '/matchups?league_key=449.l.1&week=-3',
+                     '/matchups?league_key=449.l.1&week=19'):
+            response = await self.http.get(path)
+            self.assertEqual(response.status_code, 400, path)
+        self.assertEqual(self.upstream_calls(), 0)
+        self.assertEqual((await self.http.get('/season_stats?league_key=449.l.1&weeks=18')).status_code, 200)
+
+
+@unittest.skipIf(quart is None, "quart is not installed")
+class TestServerSignIn(unittest.IsolatedAsyncioTestCase):
+
+    async def test_saved_session_refreshes_the_server_token(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = TokenStore(Path(directory) / 'session.json')
+            token = OAuthToken('saved-token', refresh_token='refresh', expires_at=time.time() + 3600)
+            YahooOAuth('id', 'secret', token=token).save(store)
+
+            environ = {key: value for key, value in os.environ.items() if key != 'YAHOO_ACCESS_TOKEN'}
+            with mock.patch.dict(os.environ, environ, clear=True), \
+                    mock.patch('server.load_dotenv'), \
+                    mock.patch('server.TokenStore', return_value=store), \
+                    mock.patch('server.ResponseCache', lambda: ResponseCache(':memory:')):
+                app = create_app()
+                async with app.test_app():
+                    client = app.extensions['yahoo_client']
+                    self.assertIsNotNone(client._token_provider)
+                    headers = await client._auth_headers()
+        self.assertEqual(headers['Authorization'], 'Bearer saved-token')
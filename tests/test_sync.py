@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+
+from agent.agent import FantasyFootballTreasurer
+from agent.sync import LeagueSyncState, SyncStore
+from models.stats import WeeklyScore
+from tests.test_treasurer import FakeClient, scoreboard_payload, user_games_payload
+
+LEAGUE = {'league_key': '449.l.1', 'name': 'Office League', 'season': 2024}
+
+
+def season_payload(current_week):
+    payload = user_games_payload({2024: '449'})
+    games = payload['fantasy_content']['users']['0']['user'][1]['games']
+    games['0']['game'][1]['leagues']['0']['league'][0]['current_week'] = current_week
+    return payload
+
+
+class TestSyncStore(unittest.TestCase):
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = SyncStore(directory)
+            state = store.load('449.l.1')
+            self.assertEqual(state.last_completed_week, 0)
+            self.assertTrue(state.merge(1, [WeeklyScore('Alpha', 1, 101.5, team_key='449.l.1.t.1')]))
+            state.last_completed_week = 1
+            store.save(state)
+
+            loaded = store.load('449.l.1')
+            self.assertEqual(loaded.last_completed_week, 1)
+            self.assertEqual(loaded.scores[1][0].points, 101.5)
+            self.assertEqual(loaded.week_hashes, state.week_hashes)
+
+    def test_unchanged_week_is_not_merged(self):
+        state = LeagueSyncState('449.l.1')
+        scores = [WeeklyScore('Alpha', 1, 100.0), WeeklyScore('Bravo', 1, 90.0)]
+        self.assertTrue(state.merge(1, scores))
+        self.assertFalse(state.merge(1, list(reversed(scores))))
+        self.assertTrue(state.merge(1, [WeeklyScore('Alpha', 1, 100.0), WeeklyScore('Bravo', 1, 92.0)]))
+
+
+class TestIncrementalSync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def agent(self, current_week, scoreboard_week=None, **scoreboard):
+        client = FakeClient(
+            get_leagues_by_season=season_payload(current_week),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(
+                weeks, current_week=scoreboard_week or current_week, **scoreboard),
+        )
+        return client, FantasyFootballTreasurer(client, sync_store=SyncStore(self.directory.name))
+
+    def scoreboard_calls(self, client):
+        return [args[1] for name, args in client.calls if name == 'get_league_scoreboards']
+
+    async def test_rerun_fetches_only_new_weeks(self):
+        client, agent = self.agent(current_week=5)
+        history = await agent.sync_weekly_scores(LEAGUE)
+        self.assertEqual(list(history), [1, 2, 3, 4, 5])
+        self.assertEqual(self.scoreboard_calls(client), [[1, 2, 3, 4, 5]])
+        self.assertEqual(SyncStore(self.directory.name).load('449.l.1').last_completed_week, 4)
+
+        # A week later, in a new process: only the last open week and the new one
+        client, agent = self.agent(current_week=6)
+        history = await agent.sync_weekly_scores(LEAGUE)
+        self.assertEqual(list(history), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.scoreboard_calls(client), [[5, 6]])
+
+    async def test_earnings_use_stored_history(self):
+        client, agent = self.agent(current_week=5)
+        await agent.sync_weekly_scores(LEAGUE)
+
+        client, agent = self.agent(current_week=5)
+        client.payloads['get_all_teams'] = None
+        result = await agent.get_league_earnings(LEAGUE, (20, 10, 5), range(1, 5))
+        self.assertEqual(result.scored_weeks, [1, 2, 3, 4])
+        self.assertEqual(self.scoreboard_calls(client), [[5]])
+
+    async def test_finished_season_is_not_fetched_again(self):
+        client, agent = self.agent(current_week=17, is_finished=1)
+        history = await agent.sync_weekly_scores(LEAGUE)
+        self.assertEqual(list(history), list(range(1, 18)))
+        self.assertEqual(SyncStore(self.directory.name).load('449.l.1').last_completed_week, 17)
+
+        client, agent = self.agent(current_week=17, is_finished=1)
+        history = await agent.sync_weekly_scores({**LEAGUE, 'current_week': '17'})
+        self.assertEqual(list(history), list(range(1, 18)))
+        self.assertEqual(client.calls, [])
+
+    async def test_weeks_whose_matchups_are_over_count_as_completed(self):
+        client, agent = self.agent(current_week=5, status=lambda week: 'postevent')
+        await agent.sync_weekly_scores(LEAGUE)
+        self.assertEqual(SyncStore(self.directory.name).load('449.l.1').last_completed_week, 5)
+
+        client, agent = self.agent(current_week=5, status=lambda week: 'midevent' if week == 6 else 'postevent')
+        await agent.sync_weekly_scores({**LEAGUE, 'current_week': '6'})
+        self.assertEqual(self.scoreboard_calls(client), [[6]])
+
+    async def test_current_week_comes_from_the_league_and_the_scoreboard(self):
+        client, agent = self.agent(current_week=5)
+        await agent.sync_weekly_scores({**LEAGUE, 'current_week': '5'})
+        self.assertNotIn('get_leagues_by_season', [name for name, args in client.calls])
+
+        # Listed before the season moved on: the scoreboard says week 6 has started
+        client, agent = self.agent(current_week=5, scoreboard_week=6)
+        history = await agent.sync_weekly_scores({**LEAGUE, 'current_week': '5'})
+        self.assertEqual(list(history), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.scoreboard_calls(client), [[5], [6]])
+        self.assertEqual(SyncStore(self.directory.name).load('449.l.1').last_completed_week, 5)
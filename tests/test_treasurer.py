@@ -0,0 +1,387 @@
+import asyncio
+import contextlib
+import io
+import unittest
+
+from agent.agent import FantasyFootballTreasurer
+from agent.memo import LRUCache
+from agent.streams import merge_streams
+from api.metrics import Metrics
+from main import print_weekly_top_scorers
+from models.events import SeasonTopScorers, WeekScored, WeekTopScorers
+from models.stats import LeagueEarnings
+
+
+def teams_payload(*names):
+    teams = {str(i): {'team': [[
+        {'team_key': f'449.l.1.t.{i + 1}'},
+        {'team_id': str(i + 1)},
+        {'name': name},
+        {'managers': [{'manager': {'nickname': f'owner{i + 1}', 'guid': f'GUID{i + 1}'}}]},
+    ]]} for i, name in enumerate(names)}
+    teams['count'] = len(names)
+    return {'fantasy_content': {'league': [{'league_key': '449.l.1'}, {'teams': teams}]}}
+
+
+def scoreboard_payload(weeks, names=('Alpha', 'Bravo', 'Charlie', 'Delta'), current_week=17, is_finished=0,
+                       status=None):
+    """Yahoo-shaped scoreboard with one matchup per team pair for each week.
+
+    ``status`` maps a week to its matchups' status (``postevent`` once played).
+    """
+    matchups = {}
+    for week in weeks:
+        for pair in range(0, len(names), 2):
+            teams = {}
+            for slot, name in enumerate(names[pair:pair + 2]):
+                index = pair + slot
+                teams[str(slot)] = {'team': [
+                    [{'team_key': f'449.l.1.t.{index + 1}'}, {'team_id': str(index + 1)}, {'name': name}],
+                    {'team_points': {'coverage_type': 'week', 'week': str(week),
+                                     'total': str(100 + week + index * 10)}},
+                ]}
+            teams['count'] = len(teams)
+            matchup = {'week': str(week), '0': {'teams': teams}}
+            if status is not None:
+                matchup['status'] = status(week)
+            matchups[str(len(matchups))] = {'matchup': matchup}
+    matchups['count'] = len(matchups)
+    return {'fantasy_content': {'league': [
+        {'league_key': '449.l.1', 'current_week': str(current_week), 'is_finished': is_finished},
+        {'scoreboard': {'0': {'matchups': matchups}, 'week': str(weeks[0])}},
+    ]}}
+
+
+def roster_resource(team_index):
+    players = {str(i): {'player': [
+        [{'player_key': f'449.p.{team_index}{i}'}, {'name': {'full': f'Player {team_index}-{i}'}},
+         {'editorial_team_abbr': 'buf'}, {'display_position': 'QB'}],
+        {'selected_position': [{'coverage_type': 'week', 'week': '1'}, {'position': 'QB'}]},
+    ]} for i in range(2)}
+    players['count'] = 2
+    return {'roster': {'coverage_type': 'week', '0': {'players': players}}}
+
+
+def rosters_payload(team_keys):
+    teams = {str(i): {'team': [[{'team_key': key}, {'name': f'Team {i}'}], roster_resource(i)]}
+             for i, key in enumerate(team_keys)}
+    teams['count'] = len(team_keys)
+    return {'fantasy_content': {'teams': teams}}
+
+
+def user_games_payload(seasons, with_leagues=True):
+    """Yahoo-shaped users;use_login=1/games payload, optionally with each game's leagues."""
+    games = {}
+    for i, (season, game_key) in enumerate(seasons.items()):
+        game = [{'game_key': game_key, 'code': 'nfl', 'season': str(season)}]
+        if with_leagues:
+            game.append({'leagues': {'0': {'league': [{
+                'league_key': f'{game_key}.l.1', 'league_id': '1', 'name': 'Office League',
+                'num_teams': 12, 'current_week': 17, 'season': str(season),
+            }]}, 'count': 1}})
+        games[str(i)] = {'game': game}
+    games['count'] = len(seasons)
+    return {'fantasy_content': {'users': {'0': {'user': [{'guid': 'ME'}, {'games': games}]}, 'count': 1}}}
+
+
+def standings_payload():
+    teams = {}
+    for i, (name, rank, wins) in enumerate([('Bravo', 2, 8), ('Alpha', 1, 10)]):
+        teams[str(i)] = {'team': [
+            [{'team_key': f'449.l.1.t.{i + 1}'}, {'name': name},
+             {'managers': [{'manager': {'nickname': f'owner{i + 1}'}}]}],
+            {'team_points': {'total': '1500.25'}},
+            {'team_standings': {'rank': rank, 'outcome_totals': {'wins': str(wins), 'losses': 14 - wins, 'ties': 0},
+                                'streak': {'type': 'win', 'value': '3'},
+                                'points_for': '1847.52', 'points_against': 1623.18}},
+        ]}
+    teams['count'] = 2
+    return {'fantasy_content': {'league': [{'league_key': '449.l.1'}, {'standings': [{'teams': teams}]}]}}
+
+
+class FakeClient:
+    """Stand-in for YahooFantasyClient that serves canned payloads and counts calls."""
+
+    def __init__(self, **payloads):
+        self.payloads = payloads
+        self.calls = []
+        self.metrics = Metrics()
+
+    def __getattr__(self, name):
+        async def call(*args):
+            self.calls.append((name, args))
+            payload = self.payloads.get(name)
+            result = payload(*args) if callable(payload) else payload
+            # Payload functions may be coroutines, to simulate slow responses
+            return await result if asyncio.iscoroutine(result) else result
+        return call
+
+
+class TestResultMemoization(unittest.IsolatedAsyncioTestCase):
+
+    async def test_repeat_calls_reuse_parsed_result(self):
+        client = FakeClient(get_all_teams=teams_payload('Alpha', 'Bravo'))
+        agent = FantasyFootballTreasurer(client)
+        first = await agent.get_all_teams_info('449.l.1')
+        second = await agent.get_all_teams_info('449.l.1')
+        self.assertEqual(first, second)
+        self.assertEqual(len(client.calls), 1)
+
+    async def test_invalidate_by_league_key(self):
+        client = FakeClient(get_all_teams=teams_payload('Alpha'))
+        agent = FantasyFootballTreasurer(client)
+        await agent.get_all_teams_info('449.l.1')
+        self.assertEqual(agent.invalidate_cache('449.l.1'), 1)
+        await agent.get_all_teams_info('449.l.1')
+        self.assertEqual(len(client.calls), 2)
+
+    async def test_empty_results_are_not_cached(self):
+        client = FakeClient()
+        agent = FantasyFootballTreasurer(client)
+        await agent.get_all_teams_info('449.l.1')
+        await agent.get_all_teams_info('449.l.1')
+        self.assertEqual(len(client.calls), 2)
+
+
+class TestParsers(unittest.IsolatedAsyncioTestCase):
+
+    async def test_standings_sorted_by_rank(self):
+        agent = FantasyFootballTreasurer(FakeClient(get_league_standings=standings_payload()))
+        standings = await agent.get_league_standings('449.l.1')
+        self.assertEqual([team.name for team in standings], ['Alpha', 'Bravo'])
+        self.assertEqual(standings[0].wins, 10)
+        self.assertEqual(standings[0].streak, 'W3')
+        self.assertEqual(standings[0].manager, 'owner2')
+        self.assertAlmostEqual(standings[0].points_against, 1623.18)
+
+    async def test_teams_info(self):
+        agent = FantasyFootballTreasurer(FakeClient(get_all_teams=teams_payload('Alpha', 'Bravo')))
+        teams = await agent.get_all_teams_info('449.l.1')
+        self.assertEqual([team.team_key for team in teams], ['449.l.1.t.1', '449.l.1.t.2'])
+        self.assertEqual(teams[1].manager, 'owner2')
+
+
+class TestWeeklyScores(unittest.IsolatedAsyncioTestCase):
+
+    def make_agent(self):
+        client = FakeClient(
+            get_matchups=lambda league_key, week: scoreboard_payload([week]),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        return client, FantasyFootballTreasurer(client)
+
+    async def test_single_week(self):
+        client, agent = self.make_agent()
+        scores = await agent.get_weekly_scores('449.l.1', 3)
+        self.assertEqual([s.team_name for s in scores], ['Alpha', 'Bravo', 'Charlie', 'Delta'])
+        self.assertEqual(scores[2].points, 123.0)
+        self.assertTrue(all(s.week == 3 for s in scores))
+        self.assertEqual(scores[0].team_key, '449.l.1.t.1')
+
+    async def test_season_is_fetched_in_batches_and_split_by_week(self):
+        client, agent = self.make_agent()
+        by_week = await agent.get_weekly_scores_many('449.l.1', range(1, 18))
+        self.assertEqual(list(by_week), list(range(1, 18)))
+        self.assertTrue(all(len(scores) == 4 for scores in by_week.values()))
+        self.assertEqual(by_week[17][0].points, 117.0)
+        self.assertEqual([name for name, _ in client.calls], ['get_league_scoreboards'] * 2)
+
+    async def test_weeks_are_fetched_concurrently_up_to_the_cap_and_returned_in_order(self):
+        in_flight, peak = [0], [0]
+
+        async def slow_scoreboards(league_key, weeks):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            # Later weeks answer first, so week order is not arrival order
+            await asyncio.sleep(0.002 * (18 - weeks[0]))
+            in_flight[0] -= 1
+            return scoreboard_payload(weeks)
+
+        client = FakeClient(get_league_scoreboards=slow_scoreboards)
+        agent = FantasyFootballTreasurer(client, max_concurrency=3)
+        agent.SCOREBOARD_BATCH_SIZE = 1
+        by_week = await agent.get_weekly_scores_many('449.l.1', [5, 1, 3, 2, 4, 6, 7, 8])
+        self.assertEqual(list(by_week), [1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertTrue(all(scores[0].week == week for week, scores in by_week.items()))
+        self.assertEqual(peak[0], 3)
+        self.assertEqual(len(client.calls), 8)
+
+    async def test_batched_weeks_are_memoized_per_week(self):
+        client, agent = self.make_agent()
+        await agent.get_weekly_scores_many('449.l.1', [1, 2])
+        await agent.get_weekly_scores('449.l.1', 2)
+        await agent.get_weekly_scores_many('449.l.1', [1, 2, 3])
+        self.assertEqual(
+            client.calls,
+            [('get_league_scoreboards', ('449.l.1', [1, 2])), ('get_league_scoreboards', ('449.l.1', [3]))]
+        )
+
+
+class TestRosters(unittest.IsolatedAsyncioTestCase):
+
+    async def test_all_rosters_in_one_collection_call(self):
+        client = FakeClient(get_team_rosters=rosters_payload)
+        agent = FantasyFootballTreasurer(client)
+        keys = ['449.l.1.t.1', '449.l.1.t.2', '449.l.1.t.3']
+        rosters = await agent.get_team_rosters(keys)
+        self.assertEqual(list(rosters), keys)
+        self.assertEqual(rosters['449.l.1.t.2'][0].name, 'Player 1-0')
+        self.assertEqual(rosters['449.l.1.t.2'][0].team, 'BUF')
+        self.assertEqual(rosters['449.l.1.t.2'][0].selected_position, 'QB')
+        self.assertEqual(len(client.calls), 1)
+
+        # Per-team lookups are now served from the memo
+        await agent.get_team_roster('449.l.1.t.3')
+        self.assertEqual(len(client.calls), 1)
+
+    async def test_falls_back_to_per_team_requests(self):
+        client = FakeClient(get_team_roster=lambda key: {'fantasy_content': {'team': [
+            [{'team_key': key}], roster_resource(0)]}})
+        agent = FantasyFootballTreasurer(client)
+        rosters = await agent.get_team_rosters(['449.l.1.t.1', '449.l.1.t.2'])
+        self.assertEqual([len(players) for players in rosters.values()], [2, 2])
+        self.assertEqual([name for name, _ in client.calls],
+                         ['get_team_rosters', 'get_team_roster', 'get_team_roster'])
+
+
+class TestLeagueDiscovery(unittest.IsolatedAsyncioTestCase):
+
+    SEASONS = {2022: '414', 2023: '423', 2024: '449'}
+
+    async def test_all_seasons_in_one_request(self):
+        client = FakeClient(
+            get_all_nfl_games=user_games_payload(self.SEASONS, with_leagues=False),
+            get_leagues_by_game_keys=lambda keys: user_games_payload(
+                {season: key for season, key in self.SEASONS.items() if key in keys}),
+        )
+        agent = FantasyFootballTreasurer(client)
+        game_keys = await agent.discover_game_keys()
+        self.assertEqual(game_keys, self.SEASONS)
+
+        leagues_by_year = await agent.list_all_leagues_all_years(game_keys)
+        self.assertEqual(list(leagues_by_year), [2022, 2023, 2024])
+        self.assertEqual(leagues_by_year[2023][0]['league_key'], '423.l.1')
+        self.assertEqual(client.calls[-1], ('get_leagues_by_game_keys', (['414', '423', '449'],)))
+
+
+class TestLeagueEarnings(unittest.IsolatedAsyncioTestCase):
+
+    async def test_leagues_are_totalled_by_team_with_owners(self):
+        client = FakeClient(
+            get_all_teams=teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        agent = FantasyFootballTreasurer(client)
+        leagues = [{'league_key': '449.l.1', 'name': 'Office League', 'season': 2024},
+                   {'league_key': '423.l.1', 'name': 'Office League', 'season': 2023}]
+        results = await agent.get_all_league_earnings(leagues, (20, 10, 5), range(1, 5))
+
+        self.assertEqual([result.season for result in results], [2024, 2023])
+        earnings = results[0].earnings
+        # Delta always scores highest, then Charlie, then Bravo
+        self.assertEqual(earnings['449.l.1.t.4'], 80.0)
+        self.assertEqual(earnings['449.l.1.t.3'], 40.0)
+        self.assertEqual(earnings['449.l.1.t.1'], 0.0)
+        self.assertEqual(results[0].team_owners['449.l.1.t.4'], 'owner4')
+        self.assertEqual(results[0].scored_weeks, [1, 2, 3, 4])
+
+
+class TestStreams(unittest.IsolatedAsyncioTestCase):
+
+    async def test_early_weeks_are_yielded_before_later_batches_arrive(self):
+        release = asyncio.Event()
+
+        async def scoreboards(league_key, weeks):
+            if weeks[0] > 1:
+                await release.wait()
+            return scoreboard_payload(weeks)
+
+        agent = FantasyFootballTreasurer(FakeClient())
+        agent.client.get_league_scoreboards = scoreboards
+        stream = agent.stream_weekly_scores('449.l.1', range(1, 18))
+        seen = []
+        async for week, scores in stream:
+            seen.append(week)
+            if week == FantasyFootballTreasurer.SCOREBOARD_BATCH_SIZE:
+                # The second batch is still waiting when the first nine weeks are out
+                self.assertFalse(release.is_set())
+                release.set()
+        self.assertEqual(seen, list(range(1, 18)))
+
+    async def test_top_scorers_stream_ends_with_season_summary(self):
+        client = FakeClient(
+            get_league_info={'fantasy_content': {'league': [{'league_key': '449.l.1', 'current_week': '3'}]}},
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        events = [event async for event in FantasyFootballTreasurer(client).get_weekly_top_scorers('449.l.1', 2)]
+        self.assertEqual([event.week for event in events[:-1]], [1, 2, 3])
+        self.assertIsInstance(events[0], WeekTopScorers)
+        self.assertEqual([score.team_name for score in events[0].top], ['Delta', 'Charlie'])
+        summary = events[-1]
+        self.assertIsInstance(summary, SeasonTopScorers)
+        self.assertEqual([(s.team_name, s.weeks_played) for s in summary.scorers], [('Delta', 3), ('Charlie', 3)])
+        self.assertEqual(summary.scorers[0].total_points, 131.0 + 132.0 + 133.0)
+
+    async def test_top_scorers_are_rendered_week_by_week(self):
+        client = FakeClient(
+            get_league_info={'fantasy_content': {'league': [{'league_key': '449.l.1', 'current_week': '2'}]}},
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            await print_weekly_top_scorers(FantasyFootballTreasurer(client).get_weekly_top_scorers('449.l.1'))
+        report = output.getvalue()
+        self.assertLess(report.index('WEEK 1'), report.index('WEEK 2'))
+        self.assertIn('🥇 Delta: 132.00 pts', report)
+        self.assertIn('SEASON SUMMARY - TOP 3 OVERALL SCORERS', report)
+        self.assertIn('Total Points: 263.00', report)
+
+    async def test_league_streams_interleave_and_end_with_earnings(self):
+        client = FakeClient(
+            get_all_teams=teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        leagues = [{'league_key': '449.l.1', 'name': 'Office League', 'season': 2024},
+                   {'league_key': '423.l.1', 'name': 'Office League', 'season': 2023}]
+        events = [event async for event in
+                  FantasyFootballTreasurer(client).stream_all_league_earnings(leagues, (20, 10, 5), range(1, 3))]
+        for league in leagues:
+            own = [event for event in events if event.league_key == league['league_key']]
+            self.assertEqual([type(event) for event in own], [WeekScored, WeekScored, LeagueEarnings])
+            self.assertEqual(own[-1].earnings['449.l.1.t.4'], 40.0)
+
+    async def test_merged_stream_raises_and_cancels_the_rest(self):
+        cancelled = asyncio.Event()
+
+        async def failing():
+            yield 1
+            raise ValueError("boom")
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+                yield 2
+            finally:
+                cancelled.set()
+
+        with self.assertRaises(ValueError):
+            async for _ in merge_streams(failing(), slow()):
+                pass
+        self.assertTrue(cancelled.is_set())
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from agent.agent import FantasyFootballTreasurer
+from models.team import TeamInfo
+from storage.warehouse import Warehouse, ingest_leagues
+from tests.test_treasurer import FakeClient, scoreboard_payload, standings_payload, teams_payload
+
+LEAGUES = [{'league_key': '449.l.1', 'name': 'Office League', 'season': 2024, 'current_week': 5},
+           {'league_key': '423.l.1', 'name': 'Office League', 'season': 2023, 'current_week': 17}]
+
+
+class TestWarehouse(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client = FakeClient(
+            get_all_teams=lambda league_key: teams_payload('Alpha', 'Bravo', 'Charlie', 'Delta'),
+            get_league_standings=standings_payload(),
+            get_league_scoreboards=lambda league_key, weeks: scoreboard_payload(weeks),
+        )
+        self.agent = FantasyFootballTreasurer(self.client)
+        self.warehouse = Warehouse(':memory:')
+        self.addCleanup(self.warehouse.close)
+        # Both fixture leagues share team keys, so store one league per test
+        await ingest_leagues(self.agent, self.warehouse, LEAGUES[:1])
+
+    async def test_earnings_match_the_agent(self):
+        expected = await self.agent.get_all_league_earnings(LEAGUES[:1], (20, 10, 5), range(1, 5))
+        stored = self.warehouse.league_earnings(LEAGUES[:1], (20, 10, 5), range(1, 5))
+
+        self.assertEqual(stored[0].earnings, expected[0].earnings)
+        self.assertEqual(stored[0].team_owners, expected[0].team_owners)
+        self.assertEqual(stored[0].scored_weeks, [1, 2, 3, 4])
+
+    async def test_owner_totals_by_season(self):
+        totals = self.warehouse.owner_earnings(LEAGUES[:1], (20, 10, 5), range(1, 6))
+        self.assertEqual(totals['owner4'], {'total': 100.0, 'years': {2024: 100.0}})
+        self.assertEqual(totals['owner1']['total'], 0)
+
+    async def test_only_stored_weeks_are_ingested(self):
+        stored = self.warehouse.league_earnings(LEAGUES[:1], (20, 10, 5), range(1, 8))
+        self.assertEqual(stored[0].scored_weeks, [1, 2, 3, 4, 5])
+
+    async def test_leagues_and_standings(self):
+        self.assertEqual([league['league_key'] for league in self.warehouse.leagues(seasons=(2024, 2024))],
+                         ['449.l.1'])
+        self.assertEqual(self.warehouse.leagues(name='nope'), [])
+        standings = self.warehouse.standings('449.l.1')
+        self.assertEqual([team.name for team in standings], ['Alpha', 'Bravo'])
+        self.assertEqual(standings[0].manager, 'owner2')
+
+    def test_nickname_keyed_warehouse_is_upgraded(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / 'warehouse.sqlite3'
+        with sqlite3.connect(path) as conn:
+            conn.executescript("CREATE TABLE owners (owner TEXT PRIMARY KEY);"
+                               "CREATE TABLE teams (team_key TEXT PRIMARY KEY, league_key TEXT, season INTEGER,"
+                               " name TEXT, owner TEXT);")
+        conn.close()
+        warehouse = Warehouse(path)
+        self.addCleanup(warehouse.close)
+        warehouse.add_league(LEAGUES[0])
+        warehouse.add_teams(LEAGUES[0], [TeamInfo('Alpha', '449.l.1.t.1', manager='owner1', manager_guid='GUID1')])
+        self.assertEqual(warehouse.owner_earnings(LEAGUES[:1], (20, 10, 5), range(1, 2)),
+                         {'owner1': {'total': 0, 'years': {2024: 0}}})
+
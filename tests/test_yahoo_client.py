@@ -0,0 +1,284 @@
+import asyncio
+import time
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from api.cache import ResponseCache
+from api.decoding import available_decoders, get_decoder
+from api.errors import AuthenticationError, ServerError
+from api.rate_limiter import TokenBucket
+from api.retry import RetryBudget, RetryPolicy, parse_retry_after
+from api.singleflight import SingleFlight
+from api.yahoo_client import YahooFantasyClient
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+class TestYahooFantasyClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def handler(request):
+            self.requests.append(request.path_qs)
+            return web.json_response({'fantasy_content': {'path': request.path}})
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.base_url = str(self.server.make_url(''))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_context_manager_reuses_one_session(self):
+        async with YahooFantasyClient('token', base_url=self.base_url) as client:
+            session = client._get_session()
+            await client.get_league_info('449.l.1')
+            await client.get_league_standings('449.l.1')
+            self.assertIs(client._get_session(), session)
+        self.assertTrue(session.closed)
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_request_returns_decoded_json(self):
+        async with YahooFantasyClient('token', base_url=self.base_url) as client:
+            data = await client.get_league_info('449.l.1')
+        self.assertEqual(data['fantasy_content']['path'], '/league/449.l.1')
+
+    async def test_cache_serves_repeat_requests(self):
+        cache = ResponseCache(':memory:')
+        async with YahooFantasyClient('token', base_url=self.base_url, cache=cache) as client:
+            first = await client.get_league_standings('449.l.1')
+            second = await client.get_league_standings('449.l.1')
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 1)
+        cache.close()
+
+    async def test_logged_in_users_leagues_are_not_shared_through_the_cache(self):
+        cache = ResponseCache(':memory:')
+        for token in ('alice', 'bob'):
+            async with YahooFantasyClient(token, base_url=self.base_url, cache=cache) as client:
+                await client.get_leagues_by_game_keys(['449'])
+        self.assertEqual(len(self.requests), 2)
+        cache.close()
+
+    async def test_concurrent_identical_requests_share_one_call(self):
+        async with YahooFantasyClient('token', base_url=self.base_url) as client:
+            results = await asyncio.gather(
+                *[client.get_matchups('449.l.1', 3) for _ in range(5)],
+                client.get_matchups('449.l.1', 4)
+            )
+            self.assertEqual(client.metrics.counter_total('coalesced_requests'), 4)
+            self.assertEqual(len(client._in_flight), 0)
+        self.assertEqual(len(self.requests), 2)
+        self.assertTrue(all(result is results[0] for result in results[:5]))
+        self.assertEqual(results[5]['fantasy_content']['path'], '/league/449.l.1/scoreboard;week=4')
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(':memory:')
+        self.client = YahooFantasyClient('token', requests_per_second=None)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_expired_entries_are_ignored(self):
+        self.cache.put('league/1?format=json', b'{"a": 1}', ttl=-1)
+        self.assertIsNone(self.cache.get('league/1?format=json'))
+        self.cache.put('league/1?format=json', b'{"a": 2}', ttl=None)
+        self.assertEqual(self.cache.get('league/1?format=json'), b'{"a": 2}')
+
+    def test_invalidate_by_prefix(self):
+        self.cache.put('league/1/standings', b'{}', ttl=None)
+        self.cache.put('team/1/roster', b'{}', ttl=None)
+        self.cache.invalidate('league/')
+        self.assertIsNone(self.cache.get('league/1/standings'))
+        self.assertIsNotNone(self.cache.get('team/1/roster'))
+
+    def test_ttl_closed_weeks_are_immutable(self):
+        payload = {'fantasy_content': {'league': [{'current_week': '5', 'is_finished': 0}]}}
+        self.assertIsNone(self.client._cache_ttl('league/k/scoreboard;week=4?format=json', payload))
+        self.assertEqual(
+            self.client._cache_ttl('league/k/scoreboard;week=5?format=json', payload),
+            YahooFantasyClient.LIVE_CACHE_TTL
+        )
+
+    def test_ttl_finished_season_is_immutable(self):
+        payload = {'fantasy_content': {'league': [{'current_week': '17', 'is_finished': 1}]}}
+        self.assertIsNone(self.client._cache_ttl('league/k/teams?format=json', payload))
+
+
+class TestDecoders(unittest.TestCase):
+
+    def test_all_decoders_agree_on_fixture(self):
+        with open(FIXTURES / 'scoreboard_week1.json', 'rb') as f:
+            body = f.read()
+        decoded = [decode(body) for decode in available_decoders().values()]
+        self.assertTrue(all(result == decoded[-1] for result in decoded))
+
+    def test_unknown_decoder(self):
+        self.assertIs(get_decoder('json'), available_decoders()['json'])
+        with self.assertRaises(ValueError):
+            get_decoder('simdjson')
+
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+
+    async def test_burst_is_immediate_then_paced_at_rate(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        elapsed = time.monotonic() - start
+        # Two tokens are available up front; the remaining four refill at 20/s
+        self.assertGreaterEqual(elapsed, 0.18)
+        self.assertLess(elapsed, 0.5)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_errors_reach_every_caller_and_clear_the_key(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ServerError("boom", status=500)
+
+        results = await asyncio.gather(flight.do('key', fail), flight.do('key', fail), return_exceptions=True)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result, ServerError) for result in results))
+        self.assertNotIn('key', flight)
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        flight = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', slow))
+        second = asyncio.ensure_future(flight.do('key', slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 'done')
+        self.assertTrue(first.cancelled())
+
+
+class TestRetries(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # Each test queues the statuses the server answers with before succeeding
+        self.statuses = []
+        self.requests = 0
+
+        async def handler(request):
+            self.requests += 1
+            if self.statuses:
+                status, headers = self.statuses.pop(0)
+                return web.json_response({'error': {'description': 'nope'}}, status=status, headers=headers)
+            return web.json_response({'fantasy_content': {}})
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+
+    def client(self, **kwargs):
+        kwargs.setdefault('retry_policy', RetryPolicy(base_delay=0.001))
+        return YahooFantasyClient('token', base_url=str(self.server.make_url('')), **kwargs)
+
+    async def test_transient_errors_are_retried(self):
+        self.statuses = [(503, {}), (999, {})]
+        async with self.client() as client:
+            data = await client.get_league_info('449.l.1')
+        self.assertEqual(data, {'fantasy_content': {}})
+        self.assertEqual(self.requests, 3)
+        self.assertEqual(client.metrics.counter_total('retries'), 2)
+
+    async def test_retry_after_pauses_the_rate_limiter(self):
+        self.statuses = [(429, {'Retry-After': '0.2'})]
+        async with self.client(requests_per_second=100) as client:
+            start = time.monotonic()
+            await client.get_league_info('449.l.1')
+            elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.2)
+
+    async def test_client_errors_are_not_retried(self):
+        self.statuses = [(401, {})]
+        async with self.client() as client:
+            with self.assertRaises(AuthenticationError) as raised:
+                await client.get_league_info('449.l.1')
+        self.assertEqual(raised.exception.status, 401)
+        self.assertIn('nope', str(raised.exception))
+        self.assertEqual(self.requests, 1)
+
+    async def test_attempts_and_budget_are_bounded(self):
+        self.statuses = [(500, {})] * 10
+        async with self.client(retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001)) as client:
+            with self.assertRaises(ServerError):
+                await client.get_league_info('449.l.1')
+        self.assertEqual(self.requests, 3)
+
+        self.requests = 0
+        async with self.client(retry_budget=RetryBudget(1)) as client:
+            with self.assertRaises(ServerError):
+                await client.get_league_info('449.l.1')
+        self.assertEqual(self.requests, 2)
+
+    async def test_budget_refills_so_a_long_running_client_keeps_retrying(self):
+        now = [0.0]
+        budget = RetryBudget(100, refill_per_second=1.0, clock=lambda: now[0])
+        async with self.client(retry_budget=budget, requests_per_second=None) as client:
+            for _ in range(150):
+                self.statuses = [(503, {})]
+                await client.get_league_info('449.l.1')
+                now[0] += 1.0
+            self.assertEqual(client.metrics.counter_total('retries'), 150)
+
+            # Spend the whole budget at once; the next failure is not retried...
+            self.statuses = [(503, {})] * 1000
+            for _ in range(25):
+                with self.assertRaises(ServerError):
+                    await client.get_league_info('449.l.1')
+            self.requests = 0
+            with self.assertRaises(ServerError):
+                await client.get_league_info('449.l.1')
+            self.assertEqual(self.requests, 1)
+
+            # ...until the budget has had time to refill
+            now[0] += 1.0
+            self.statuses = [(503, {})]
+            self.assertEqual(await client.get_league_info('449.l.1'), {'fantasy_content': {}})
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        delays = [policy.delay(attempt) for attempt in range(10) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 4.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_retry_after_is_honoured_up_to_a_limit(self):
+        policy = RetryPolicy(base_delay=0.001, max_retry_after=60)
+        self.assertGreaterEqual(policy.delay(0, retry_after=5), 5)
+        self.assertEqual(policy.delay(0, retry_after=600), 60)
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()